@@ -2,6 +2,7 @@ from django.contrib import admin
 
 from .models import (
     Audit,
+    AuditDefinition,
     CategoryScores,
     FieldMetrics,
     LabMetrics,
@@ -48,9 +49,17 @@ export_links_csv.short_description = "Export selected links as CSV"
 
 
 class LinkAdmin(admin.ModelAdmin):
-    list_display = ("title", "url", "description", "created_at", "updated_at")
+    list_display = (
+        "title",
+        "url",
+        "description",
+        "probe_interval",
+        "created_at",
+        "updated_at",
+    )
     search_fields = ("title", "url", "description")
     list_filter = ("created_at", "updated_at")
+    list_editable = ("probe_interval",)
     actions = [clear_links, export_links_csv]
 
 
@@ -75,4 +84,5 @@ admin.site.register(FieldMetrics)
 admin.site.register(LabMetrics)
 admin.site.register(CategoryScores)
 admin.site.register(Audit)
+admin.site.register(AuditDefinition)
 admin.site.register(UserAPIKey)
@@ -0,0 +1,114 @@
+"""Vectorized uptime analytics over NumPy arrays.
+
+UptimeRobot logs are state changes: a Down (1) or Up (2) event starts a
+period that lasts until the next event, or until the end of the window for
+the last one. Started (98) and Paused (99) periods count as neither up nor
+down. Everything here works on whole arrays (run-length encoding with
+``np.diff``, durations with ``np.cumsum``), so years of minute-level data cost
+a few array passes instead of Python loops.
+"""
+
+import numpy as np
+
+DOWN = 1
+UP = 2
+PERCENTILES = (50, 95, 99)
+HISTOGRAM_BINS = 20
+
+
+def _runs(mask):
+    """Start and end (exclusive) indices of the runs of True in ``mask``."""
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8), prepend=0, append=0))
+    return edges[::2], edges[1::2]
+
+
+def event_stats(times, statuses, end=None):
+    """
+    Availability figures for log events at ``times`` (Unix seconds, sorted)
+    with ``statuses`` (log types). ``end`` closes the last period and defaults
+    to the last event. Durations are in seconds.
+    """
+    times = np.asarray(times, dtype=np.int64)
+    statuses = np.asarray(statuses, dtype=np.int16)
+    n = len(times)
+    down = statuses == DOWN
+    up = statuses == UP
+    stats = {
+        "total_checks": n,
+        "up_events": int(up.sum()),
+        "downtime_events": int(down.sum()),
+        "longest_downtime": 0,
+        "uptime_percent": 0,
+        "up_seconds": 0,
+        "down_seconds": 0,
+        "incidents": 0,
+        "longest_down_seconds": 0,
+        "mttr": None,
+        "mtbf": None,
+    }
+    if not n:
+        return stats
+    close = max(int(end), int(times[-1])) if end is not None else int(times[-1])
+    durations = np.diff(times, append=close)
+    up_seconds = int(durations[up].sum())
+    down_seconds = int(durations[down].sum())
+    # Consecutive Down events are one incident
+    starts, ends = _runs(down)
+    elapsed = np.concatenate(([0], np.cumsum(durations)))
+    incident_seconds = elapsed[ends] - elapsed[starts]
+    incidents = len(starts)
+    observed = up_seconds + down_seconds
+    stats.update(
+        {
+            "longest_downtime": int((ends - starts).max()) if incidents else 0,
+            "uptime_percent": (
+                up_seconds / observed * 100
+                if observed
+                else stats["up_events"] / n * 100
+            ),
+            "up_seconds": up_seconds,
+            "down_seconds": down_seconds,
+            "incidents": incidents,
+            "longest_down_seconds": (int(incident_seconds.max()) if incidents else 0),
+            "mttr": float(incident_seconds.mean()) if incidents else None,
+            "mtbf": up_seconds / incidents if incidents else None,
+        }
+    )
+    return stats
+
+
+def latency_stats(values, bins=HISTOGRAM_BINS):
+    """Min/avg/max, percentiles and a histogram of response times (ms)."""
+    values = np.asarray(values)
+    stats = {
+        "samples": len(values),
+        "min_response": None,
+        "avg_response": None,
+        "max_response": None,
+        "histogram": {"edges": [], "counts": []},
+    }
+    for q in PERCENTILES:
+        stats[f"p{q}"] = None
+    if not len(values):
+        return stats
+    percentiles = np.percentile(values, PERCENTILES)
+    counts, edges = np.histogram(values, bins=bins)
+    stats.update(
+        {
+            "min_response": int(values.min()),
+            "avg_response": float(values.mean()),
+            "max_response": int(values.max()),
+            "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+        }
+    )
+    for q, value in zip(PERCENTILES, percentiles):
+        stats[f"p{q}"] = float(value)
+    return stats
+
+
+def summarize(times, statuses, response_times, end=None, bins=HISTOGRAM_BINS):
+    """event_stats and latency_stats of one window, merged into one dict."""
+    return {
+        **event_stats(times, statuses, end),
+        **latency_stats(response_times, bins),
+    }
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class LinksConfig(AppConfig):
+    name = "links"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,34 @@
+"""Per-user cache of the dashboard's site data.
+
+The dashboard only changes when a check completes, so its rows are built once
+and kept in the ``DASHBOARD_CACHE`` backend until ``links.signals`` drops them.
+That happens when a PSI report, SSL check, SSL Labs scan, link or uptime status
+of the user changes. Entries also expire after ``DASHBOARD_CACHE_SECONDS``,
+which bounds how stale the live uptime status shown on the page can get.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def _cache():
+    return caches[settings.DASHBOARD_CACHE]
+
+
+def _key(user_id):
+    return f"dashboard:{user_id}"
+
+
+def get_sites(user_id):
+    """The cached dashboard rows of a user, or None."""
+    return _cache().get(_key(user_id))
+
+
+def store_sites(user_id, sites_data):
+    _cache().set(_key(user_id), sites_data, settings.DASHBOARD_CACHE_SECONDS)
+
+
+def invalidate(user_ids):
+    keys = [_key(user_id) for user_id in set(user_ids) if user_id]
+    if keys:
+        _cache().delete_many(keys)
@@ -0,0 +1,115 @@
+"""Shape-preserving downsampling of chart series.
+
+Uses Largest-Triangle-Three-Buckets (LTTB). The first and last points are
+always kept. The points between them are split into ``target - 2`` buckets of
+equal size. From each bucket, LTTB keeps the point that forms the largest
+triangle with the previously kept point and the average of the next bucket.
+Peaks, dips and status flips survive even when thousands of points become a
+few hundred. The area computation within each bucket is vectorized with NumPy.
+"""
+
+import numpy as np
+from django.conf import settings
+
+GRADE_SCORES = {"A+": 7, "A": 6, "A-": 5, "B": 4, "C": 3, "D": 2, "E": 1, "F": 0}
+
+
+def target_points(value=None):
+    """
+    The number of points to send for a chart. ``value`` is the requested count,
+    e.g. a ``points`` query parameter. The result always stays within
+    CHART_MAX_POINTS.
+    """
+    try:
+        target = int(value)
+    except (TypeError, ValueError):
+        target = settings.CHART_DEFAULT_POINTS
+    return max(3, min(target, settings.CHART_MAX_POINTS))
+
+
+def timestamps(values):
+    """Seconds since the epoch for ISO strings, dates or datetimes (UTC)."""
+    return np.array(
+        [str(value)[:19].replace(" ", "T") for value in values],
+        dtype="datetime64[s]",
+    ).astype(np.int64)
+
+
+def numeric(values, score=None):
+    """Values as floats, with None (or values ``score`` rejects) as NaN."""
+    if score:
+        values = [score(value) for value in values]
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def lttb_indices(x, y, target):
+    """Indices of the ``target`` points LTTB keeps from the series (x, y)."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if target >= n or target < 3:
+        return np.arange(n)
+    missing = np.isnan(y)
+    if missing.any():
+        # Missing values would poison every area; give them the series mean
+        y = np.where(missing, 0.0 if missing.all() else np.nanmean(y), y)
+
+    # target - 2 buckets of interior points; bucket i is [edges[i], edges[i+1])
+    edges = np.linspace(1, n - 1, target - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x[: n - 1], edges[:-1]) / sizes
+    avg_y = np.add.reduceat(y[: n - 1], edges[:-1]) / sizes
+    # The point a bucket is compared against: the next bucket's average,
+    # or the last point for the final bucket
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    kept = np.empty(target, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    a = 0
+    for i in range(target - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (next_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def downsample_columns(series, y_key, target, score=None, x_key="t"):
+    """
+    Reduce a columnar series (``{"t": [...], <metric>: [...]}``) to ``target``
+    points. Points are picked by the shape of ``y_key``, and every column is
+    thinned the same way.
+    """
+    n = len(series[x_key])
+    if n <= target:
+        return series
+    kept = lttb_indices(
+        timestamps(series[x_key]), numeric(series[y_key], score), target
+    )
+    return {
+        key: [values[i] for i in kept] if len(values) == n else values
+        for key, values in series.items()
+    }
+
+
+def downsample_rows(rows, y_key, target, score=None, x_key="date"):
+    """Reduce a list of point dicts to ``target`` points, picked by ``y_key``."""
+    if len(rows) <= target:
+        return rows
+    x = (
+        timestamps(row[x_key] for row in rows)
+        if x_key
+        else np.arange(len(rows), dtype=float)
+    )
+    kept = lttb_indices(x, numeric([row.get(y_key) for row in rows], score), target)
+    return [rows[i] for i in kept]
+
+
+def grade_score(grade):
+    """Numeric rank of an SSL Labs grade, so grade series can be downsampled."""
+    return GRADE_SCORES.get(grade) if grade else None
@@ -0,0 +1,105 @@
+"""Shared HTTP client used by every upstream service (PSI, UptimeRobot, SSL Labs).
+
+All calls go through one ``requests.Session`` per process, so TCP/TLS
+connections to each upstream host are kept alive and reused. Calls get default
+connect/read timeouts, gzip is requested, and idempotent calls are retried a
+bounded number of times with jittered exponential backoff.
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+_lock = threading.Lock()
+_session = None
+_session_pid = None
+
+
+def _build_session():
+    session = requests.Session()
+    # One connection pool per upstream host, each holding up to
+    # HTTP_POOL_MAXSIZE keep-alive connections. Retries are handled in request()
+    # so that only idempotent calls are repeated.
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": "webassist/1.0",
+        }
+    )
+    return session
+
+
+def get_session():
+    """Return the process-wide session, rebuilding it after a fork."""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def default_timeout():
+    return (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT)
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff for the given (zero-based) retry attempt."""
+    cap = settings.HTTP_BACKOFF_FACTOR * (2**attempt)
+    return random.uniform(0, cap)
+
+
+def request(method, url, idempotent=None, retries=None, **kwargs):
+    """
+    Send a request through the shared session.
+
+    ``timeout`` defaults to (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT). Calls
+    are retried on connection errors and 502/503/504 responses only when
+    ``idempotent`` is true, which defaults to true for GET/HEAD/OPTIONS/PUT/DELETE.
+    Read timeouts are never retried, since the upstream may still be working.
+    """
+    method = method.upper()
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    if retries is None:
+        retries = settings.HTTP_MAX_RETRIES if idempotent else 0
+    kwargs.setdefault("timeout", default_timeout())
+    session = get_session()
+    attempt = 0
+    while True:
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.exceptions.ConnectionError:
+            if attempt >= retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                return response
+            response.close()
+        time.sleep(backoff_delay(attempt))
+        attempt += 1
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
@@ -0,0 +1,129 @@
+"""Streaming, field-selective parsing of large upstream JSON responses.
+
+Lighthouse and SSL Labs bodies run to several megabytes, but ingestion reads a
+small part of them. ``StreamedBody.from_response`` reads the body in chunks and
+passes each chunk to two consumers. An ijson push parser builds Python objects
+only for the requested key prefixes. A zlib compressor produces the payload
+that gets stored. Neither the full body nor the full document is ever held in
+memory.
+"""
+
+import json
+import zlib
+
+import ijson
+from ijson.common import ObjectBuilder
+
+CHUNK_SIZE = 64 * 1024
+
+# Prefixes (in ijson notation) read by PSIService.parse_report
+PSI_FIELDS = (
+    "loadingExperience",
+    "lighthouseResult.lighthouseVersion",
+    "lighthouseResult.categories",
+    "lighthouseResult.audits",
+)
+
+# Prefixes read by SSLLabsService.run_scan. Client handshake simulations are
+# the bulk of an ``all=done`` endpoint and are never used.
+SSLLABS_FIELDS = ("status", "statusMessage", "endpoints")
+SSLLABS_SKIP = ("endpoints.item.details.sims",)
+
+_STARTS = ("start_map", "start_array")
+_ENDS = ("end_map", "end_array")
+
+
+def _skipped(prefix, skip):
+    return any(prefix == s or prefix.startswith(s + ".") for s in skip)
+
+
+def _assign(result, prefix, value):
+    """Place ``value`` at the dotted ``prefix`` inside ``result``."""
+    *parents, last = prefix.split(".")
+    for key in parents:
+        result = result.setdefault(key, {})
+    result[last] = value
+
+
+class FieldSelector:
+    """Consume ijson events, building values only for the wanted prefixes."""
+
+    def __init__(self, wanted, skip=()):
+        self.wanted = frozenset(wanted)
+        self.skip = tuple(skip)
+        self.result = {}
+        self._builder = None
+        self._target = None
+        self._depth = 0
+
+    def feed(self, events):
+        for prefix, event, value in events:
+            if self._builder is None:
+                if prefix not in self.wanted or event in _ENDS or event == "map_key":
+                    continue
+                if event in _STARTS:
+                    self._builder = ObjectBuilder()
+                    self._target = prefix
+                    self._depth = 1
+                    self._builder.event(event, value)
+                else:
+                    _assign(self.result, prefix, value)
+                continue
+            if self.skip and _skipped(prefix, self.skip):
+                continue
+            self._builder.event(event, value)
+            if event in _STARTS:
+                self._depth += 1
+            elif event in _ENDS:
+                self._depth -= 1
+                if self._depth == 0:
+                    _assign(self.result, self._target, self._builder.value)
+                    self._builder = None
+
+
+class StreamedBody:
+    """Selected fields of a JSON body plus the zlib-compressed body itself."""
+
+    def __init__(self, data, compressed, size):
+        self.data = data
+        self.compressed = compressed
+        self.size = size
+
+    @classmethod
+    def from_chunks(cls, chunks, wanted, skip=(), keep_payload=True):
+        selector = FieldSelector(wanted, skip)
+        events = ijson.sendable_list()
+        parser = ijson.parse_coro(events, use_float=True)
+        compressor = zlib.compressobj(6) if keep_payload else None
+        compressed = []
+        size = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            size += len(chunk)
+            if compressor:
+                compressed.append(compressor.compress(chunk))
+            parser.send(chunk)
+            selector.feed(events)
+            del events[:]
+        parser.close()
+        selector.feed(events)
+        if compressor:
+            compressed.append(compressor.flush())
+        return cls(selector.result, b"".join(compressed), size)
+
+    @classmethod
+    def from_response(cls, response, wanted, skip=(), keep_payload=True):
+        """Stream a ``requests`` response opened with ``stream=True``."""
+        with response:
+            return cls.from_chunks(
+                response.iter_content(CHUNK_SIZE), wanted, skip, keep_payload
+            )
+
+    @classmethod
+    def from_dict(cls, data, wanted=None, skip=()):
+        """Wrap an already-decoded document (used for stored or test data)."""
+        body = json.dumps(data).encode("utf-8")
+        if wanted is None:
+            return cls(data, zlib.compress(body, 6), len(body))
+        return cls.from_chunks([body], wanted, skip)
@@ -0,0 +1,62 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from links.services import CertificateExpiryService
+
+
+class Command(BaseCommand):
+    help = (
+        "List certificates expiring soon across every link (or one user's), "
+        "soonest first, from the latest SSL check and SSL Labs scan of each link."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.CERT_EXPIRY_DAYS,
+            help="Report certificates expiring within this many days "
+            f"(default {settings.CERT_EXPIRY_DAYS}); expired ones are included.",
+        )
+        parser.add_argument("--user", help="Only links owned by this username.")
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON."
+        )
+        parser.add_argument(
+            "--fail-if-any",
+            action="store_true",
+            help="Exit with an error when any certificate is in the report, so "
+            "cron can alert on it.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        snapshots = CertificateExpiryService.expiring(days=options["days"])
+        if options["user"]:
+            snapshots = snapshots.filter(link__user__username=options["user"])
+        now = timezone.now()
+        rows = [
+            CertificateExpiryService.as_dict(snapshot, now)
+            for snapshot in snapshots.iterator()
+        ]
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+        elif not rows:
+            self.stdout.write(
+                f"No certificates expire within {options['days']} day(s)."
+            )
+        else:
+            for row in rows:
+                self.stdout.write(
+                    f"{row['days_left']:>5}d  {row['expires_at'][:16]}  "
+                    f"{row['user']}\t{row['url']}"
+                )
+            self.stdout.write(
+                f"{len(rows)} certificate(s) expire within {options['days']} day(s)."
+            )
+        if rows and options["fail_if_any"]:
+            raise CommandError(f"{len(rows)} certificate(s) expiring soon.")
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from links.services import PSIService, SSLService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete stored audit details blobs and certificates that no PSI report "
+        "or SSL check references any more, e.g. after links, pages or accounts "
+        "were deleted."
+    )
+
+    def handle(self, *args, **options):
+        details = PSIService.prune_audit_details()
+        self.stdout.write(f"Deleted {details} unreferenced audit details blob(s).")
+        certificates = SSLService.prune_certificates()
+        self.stdout.write(f"Deleted {certificates} unreferenced certificate(s).")
@@ -0,0 +1,206 @@
+import json
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import OuterRef, Q, Subquery
+from django.utils import timezone
+
+from links import quota
+from links.models import Link, PSIReportGroup
+from links.services import PSIService
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch PSI reports for every link (or a filtered subset) with bounded "
+        "concurrency, checkpointing progress so an interrupted run can be "
+        "resumed with --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only links owned by this username.")
+        parser.add_argument(
+            "--older-than",
+            type=float,
+            metavar="HOURS",
+            help="Only links whose last PSI report is older than this many hours "
+            "(links never scanned are always included).",
+        )
+        parser.add_argument(
+            "--url-contains", help="Only links whose URL contains this text."
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Maximum links fetched at once across all users (default 4).",
+        )
+        parser.add_argument(
+            "--per-user-concurrency",
+            type=int,
+            default=2,
+            help="Maximum links fetched at once with the same user's API key "
+            "(default 2).",
+        )
+        parser.add_argument(
+            "--max-per-user",
+            type=int,
+            help="Stop scheduling a user's links after this many fetches, to stay "
+            "inside their daily key quota.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default="run_psi_batch.checkpoint.json",
+            help="File recording successfully fetched link ids. Removed once every "
+            "link has succeeded.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the links recorded in the checkpoint by an earlier, "
+            "unfinished run. Without it the checkpoint is ignored and replaced.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the links that would be fetched and exit.",
+        )
+
+    def get_links(self, options):
+        links = Link.objects.select_related("user").order_by("id")
+        if options["user"]:
+            links = links.filter(user__username=options["user"])
+        if options["url_contains"]:
+            links = links.filter(url__icontains=options["url_contains"])
+        if options["older_than"] is not None:
+            cutoff = timezone.now() - timedelta(hours=options["older_than"])
+            last_fetch = (
+                PSIReportGroup.objects.filter(
+                    page__url=OuterRef("url"), page__user=OuterRef("user")
+                )
+                .order_by("-fetch_time")
+                .values("fetch_time")[:1]
+            )
+            links = links.annotate(last_psi=Subquery(last_fetch)).filter(
+                Q(last_psi__isnull=True) | Q(last_psi__lt=cutoff)
+            )
+        return list(links)
+
+    def load_checkpoint(self, path):
+        if not os.path.exists(path):
+            return set()
+        try:
+            with open(path) as f:
+                return set(json.load(f).get("done", []))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read checkpoint {path}: {e}")
+
+    def save_checkpoint(self, path, done):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"done": sorted(done)}, f)
+        os.replace(tmp_path, path)
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["per_user_concurrency"] < 1:
+            raise CommandError("Concurrency limits must be at least 1.")
+        checkpoint = options["checkpoint"]
+        done = self.load_checkpoint(checkpoint) if options["resume"] else set()
+        links = [link for link in self.get_links(options) if link.id not in done]
+        if options["max_per_user"] is not None:
+            per_user = {}
+            selected = []
+            for link in links:
+                count = per_user.get(link.user_id, 0)
+                if count < options["max_per_user"]:
+                    per_user[link.user_id] = count + 1
+                    selected.append(link)
+            links = selected
+        if done:
+            self.stdout.write(f"Resuming: {len(done)} link(s) already done.")
+        if options["dry_run"]:
+            for link in links:
+                self.stdout.write(f"{link.id}\t{link.user.username}\t{link.url}")
+            self.stdout.write(f"{len(links)} link(s) would be fetched.")
+            return
+        if not options["resume"] and os.path.exists(checkpoint):
+            # A fresh run must not leave an older run's progress to resume
+            os.remove(checkpoint)
+        if not links:
+            self.stdout.write("Nothing to fetch.")
+            return
+
+        user_slots = {}
+        for link in links:
+            user_slots.setdefault(
+                link.user_id, threading.Semaphore(options["per_user_concurrency"])
+            )
+        latencies = []
+        failures = []
+
+        def run(link):
+            with user_slots[link.user_id]:
+                started = time.monotonic()
+                try:
+                    PSIService.fetch_and_store_report_group(link.url, link.user)
+                    return link, time.monotonic() - started, None
+                except Exception as e:
+                    return link, time.monotonic() - started, str(e)
+                finally:
+                    connections.close_all()
+
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=options["concurrency"])
+        try:
+            futures = [executor.submit(run, link) for link in links]
+            for future in as_completed(futures):
+                link, elapsed, error = future.result()
+                latencies.append(elapsed)
+                if error:
+                    failures.append((link, error))
+                    self.stderr.write(f"FAIL {link.url}: {error}")
+                else:
+                    self.stdout.write(f"OK   {link.url} ({elapsed:.1f}s)")
+                    done.add(link.id)
+                    self.save_checkpoint(checkpoint, done)
+        except KeyboardInterrupt:
+            executor.shutdown(wait=True, cancel_futures=True)
+            quota.flush_usage(force=True)
+            raise CommandError(
+                f"Interrupted after {len(done)} link(s); rerun with --resume to "
+                f"continue from {checkpoint}."
+            )
+        executor.shutdown()
+        quota.flush_usage(force=True)
+        wall = time.monotonic() - started
+
+        succeeded = len(latencies) - len(failures)
+        self.stdout.write("")
+        self.stdout.write(
+            f"Fetched {succeeded}/{len(latencies)} link(s) in {wall:.1f}s "
+            f"({len(latencies) / wall * 60:.1f} links/min)."
+        )
+        ordered = sorted(latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        self.stdout.write(
+            f"Latency: mean {statistics.mean(ordered):.1f}s, "
+            f"p50 {statistics.median(ordered):.1f}s, p95 {p95:.1f}s, "
+            f"max {ordered[-1]:.1f}s."
+        )
+        if failures:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{len(failures)} link(s) failed; run again with --resume to "
+                    "retry them."
+                )
+            )
+        else:
+            if os.path.exists(checkpoint):
+                os.remove(checkpoint)
+            self.stdout.write(self.style.SUCCESS("All links fetched."))
@@ -0,0 +1,145 @@
+import asyncio
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from links.models import Link
+from links.probe import MIN_INTERVAL, ProbeEngine, ProbeTarget
+from links.services import UptimeProbeService
+
+KNOWN_STATES = {
+    UptimeProbeService.STATUS_UP: True,
+    "8": False,  # UptimeRobot "seems down"
+    UptimeProbeService.STATUS_DOWN: False,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Check links over HTTP(S) from a local asyncio probe engine, on each "
+        "link's probe_interval, storing results in the local uptime history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only links owned by this username.")
+        parser.add_argument(
+            "--url-contains", help="Only links whose URL contains this text."
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            metavar="SECONDS",
+            help="Probe every selected link at this interval, overriding "
+            "Link.probe_interval. By default only links with a probe_interval "
+            "are probed.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=500,
+            help="Maximum checks in flight at once (default 500).",
+        )
+        parser.add_argument(
+            "--per-host",
+            type=int,
+            default=4,
+            help="Maximum checks in flight against one hostname (default 4).",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10.0,
+            help="Seconds before a check counts as down (default 10).",
+        )
+        parser.add_argument(
+            "--flush-seconds",
+            type=float,
+            default=5.0,
+            help="Write buffered results at least this often (default 5).",
+        )
+        parser.add_argument(
+            "--reload",
+            type=float,
+            default=300.0,
+            metavar="SECONDS",
+            help="Re-read the probed links this often (default 300).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Check every selected link once and exit.",
+        )
+
+    def get_targets(self, options):
+        links = Link.objects.order_by("id")
+        if options["user"]:
+            links = links.filter(user__username=options["user"])
+        if options["url_contains"]:
+            links = links.filter(url__icontains=options["url_contains"])
+        if not options["interval"]:
+            links = links.filter(probe_interval__isnull=False)
+        return [
+            ProbeTarget(
+                link_id,
+                url,
+                max(MIN_INTERVAL, options["interval"] or interval),
+                KNOWN_STATES.get(status),
+            )
+            for link_id, url, interval, status in links.values_list(
+                "id", "url", "probe_interval", "uptime_last_status"
+            )
+        ]
+
+    def store(self, results):
+        try:
+            UptimeProbeService.store_results(results)
+        except Exception as e:
+            self.stderr.write(f"Failed to store {len(results)} result(s): {e}")
+        finally:
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        if options["interval"] is not None and options["interval"] < MIN_INTERVAL:
+            raise CommandError(f"--interval must be at least {MIN_INTERVAL} seconds.")
+        if options["concurrency"] < 1 or options["per_host"] < 1:
+            raise CommandError("Concurrency limits must be at least 1.")
+        targets = self.get_targets(options)
+        if not targets:
+            self.stdout.write("Nothing to probe.")
+            return
+        engine = ProbeEngine(
+            targets,
+            self.store,
+            concurrency=options["concurrency"],
+            per_host=options["per_host"],
+            timeout=options["timeout"],
+            flush_seconds=options["flush_seconds"],
+        )
+        self.stdout.write(f"Probing {len(targets)} link(s).")
+        started = time.monotonic()
+        try:
+            if options["once"]:
+                asyncio.run(engine.run(once=True))
+            else:
+                while True:
+                    asyncio.run(engine.run(duration=options["reload"]))
+                    engine.set_targets(self.get_targets(options))
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+        wall = time.monotonic() - started
+        self.report(engine, wall)
+
+    def report(self, engine, wall):
+        self.stdout.write(
+            f"{engine.checks} check(s), {engine.failures} down, in {wall:.1f}s "
+            f"({engine.checks / max(wall, 1e-9) * 60:.0f} checks/min)."
+        )
+        if engine.latencies:
+            ordered = sorted(engine.latencies)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            self.stdout.write(
+                f"Response time: p50 {statistics.median(ordered):.0f} ms, "
+                f"p95 {p95} ms, max {ordered[-1]} ms."
+            )
@@ -0,0 +1,88 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from links import ssl_sweep
+from links.models import Link
+from links.services import SSLService
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the SSL certificate of every link (each distinct host once) "
+        "concurrently and bulk-insert the results into SSLCheck."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only links owned by this username.")
+        parser.add_argument(
+            "--url-contains", help="Only links whose URL contains this text."
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=200,
+            help="Maximum handshakes in flight at once (default 200).",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10.0,
+            help="Seconds allowed for connecting and the handshake (default 10).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Checks written per bulk insert (default 500).",
+        )
+        parser.add_argument(
+            "--cafile",
+            help="Verify certificates against this CA bundle instead of the "
+            "system trust store.",
+        )
+
+    def get_links(self, options):
+        links = Link.objects.select_related("user").order_by("id")
+        if options["user"]:
+            links = links.filter(user__username=options["user"])
+        if options["url_contains"]:
+            links = links.filter(url__icontains=options["url_contains"])
+        return list(links)
+
+    def store(self, checks):
+        try:
+            SSLService.store_checks(checks)
+        except Exception as e:
+            self.stderr.write(f"Failed to store {len(checks)} check(s): {e}")
+        finally:
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--concurrency and --batch-size must be at least 1.")
+        links = self.get_links(options)
+        if not links:
+            self.stdout.write("No links to check.")
+            return
+        sweep = ssl_sweep.Sweep(
+            links,
+            self.store,
+            concurrency=options["concurrency"],
+            timeout=options["timeout"],
+            batch_size=options["batch_size"],
+            cafile=options["cafile"],
+        )
+        self.stdout.write(
+            f"Checking {len(links)} link(s) on {len(sweep.endpoints)} host(s)."
+        )
+        started = time.monotonic()
+        ssl_sweep.run(sweep)
+        wall = time.monotonic() - started
+        for (host, port), error in sweep.failures:
+            self.stderr.write(f"FAIL {host}:{port}: {error}")
+        self.stdout.write(
+            f"Stored {sweep.checks} check(s) in {wall:.1f}s; "
+            f"{len(sweep.failures)} host(s) failed."
+        )
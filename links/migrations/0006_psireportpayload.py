@@ -0,0 +1,77 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:19
+
+import json
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_raw_json_to_payload(apps, schema_editor):
+    PSIReport = apps.get_model("links", "PSIReport")
+    PSIReportPayload = apps.get_model("links", "PSIReportPayload")
+    batch = []
+    reports = PSIReport.objects.exclude(raw_json=None).only("id", "raw_json")
+    for report in reports.iterator(chunk_size=100):
+        body = json.dumps(report.raw_json).encode("utf-8")
+        batch.append(
+            PSIReportPayload(
+                psi_report_id=report.id,
+                encoding="zlib",
+                size=len(body),
+                data=zlib.compress(body, 6),
+            )
+        )
+        if len(batch) >= 100:
+            PSIReportPayload.objects.bulk_create(batch)
+            batch = []
+    PSIReportPayload.objects.bulk_create(batch)
+
+
+def copy_payload_to_raw_json(apps, schema_editor):
+    PSIReport = apps.get_model("links", "PSIReport")
+    PSIReportPayload = apps.get_model("links", "PSIReportPayload")
+    for payload in PSIReportPayload.objects.iterator(chunk_size=100):
+        PSIReport.objects.filter(id=payload.psi_report_id).update(
+            raw_json=json.loads(zlib.decompress(bytes(payload.data)))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0005_alter_link_url_alter_page_url_alter_sslcheck_version_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PSIReportPayload",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("encoding", models.CharField(default="zlib", max_length=16)),
+                ("size", models.PositiveIntegerField(default=0)),
+                ("data", models.BinaryField()),
+                (
+                    "psi_report",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payload",
+                        to="links.psireport",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(copy_raw_json_to_payload, copy_payload_to_raw_json),
+        migrations.RemoveField(
+            model_name="psireport",
+            name="raw_json",
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_definitions(apps, schema_editor):
+    Audit = apps.get_model("links", "Audit")
+    AuditDefinition = apps.get_model("links", "AuditDefinition")
+    # The Lighthouse version was never recorded for existing audits, so they
+    # all share the blank-version definition of their audit key.
+    for audit_key in Audit.objects.values_list("audit_key", flat=True).distinct():
+        sample = Audit.objects.filter(audit_key=audit_key).first()
+        definition = AuditDefinition.objects.create(
+            audit_key=audit_key,
+            lighthouse_version="",
+            title=sample.title,
+            description=sample.description,
+        )
+        Audit.objects.filter(audit_key=audit_key).update(definition=definition)
+
+
+def restore_titles(apps, schema_editor):
+    Audit = apps.get_model("links", "Audit")
+    AuditDefinition = apps.get_model("links", "AuditDefinition")
+    for definition in AuditDefinition.objects.all():
+        Audit.objects.filter(definition=definition).update(
+            title=definition.title, description=definition.description
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0006_psireportpayload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditDefinition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("audit_key", models.CharField(max_length=64)),
+                ("lighthouse_version", models.CharField(blank=True, max_length=32)),
+                ("title", models.CharField(max_length=256)),
+                ("description", models.TextField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="auditdefinition",
+            constraint=models.UniqueConstraint(
+                fields=("audit_key", "lighthouse_version"),
+                name="audit_definition_key_version_unique",
+            ),
+        ),
+        migrations.AddField(
+            model_name="audit",
+            name="definition",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="audits",
+                to="links.auditdefinition",
+            ),
+        ),
+        migrations.RunPython(populate_definitions, restore_titles),
+        migrations.AlterField(
+            model_name="audit",
+            name="definition",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="audits",
+                to="links.auditdefinition",
+            ),
+        ),
+        migrations.RemoveField(
+            model_name="audit",
+            name="description",
+        ),
+        migrations.RemoveField(
+            model_name="audit",
+            name="title",
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:23
+
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def digest_for(data):
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def move_details_to_blobs(apps, schema_editor):
+    Audit = apps.get_model("links", "Audit")
+    AuditDetails = apps.get_model("links", "AuditDetails")
+    audits = Audit.objects.exclude(details=None).only("id", "details")
+    for audit in audits.iterator(chunk_size=500):
+        digest = digest_for(audit.details)
+        AuditDetails.objects.get_or_create(
+            digest=digest, defaults={"data": audit.details}
+        )
+        Audit.objects.filter(id=audit.id).update(details_blob_id=digest)
+
+
+def restore_details(apps, schema_editor):
+    Audit = apps.get_model("links", "Audit")
+    AuditDetails = apps.get_model("links", "AuditDetails")
+    for blob in AuditDetails.objects.iterator(chunk_size=100):
+        Audit.objects.filter(details_blob_id=blob.digest).update(details=blob.data)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0007_auditdefinition"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditDetails",
+            fields=[
+                (
+                    "digest",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("data", models.JSONField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="audit",
+            name="details_blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="audits",
+                to="links.auditdetails",
+            ),
+        ),
+        migrations.RunPython(move_details_to_blobs, restore_details),
+        migrations.RemoveField(
+            model_name="audit",
+            name="details",
+        ),
+    ]
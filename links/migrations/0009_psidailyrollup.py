@@ -0,0 +1,143 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+METRICS = (
+    ("performance", "category_scores__performance"),
+    ("accessibility", "category_scores__accessibility"),
+    ("best_practices", "category_scores__best_practices"),
+    ("seo", "category_scores__seo"),
+    ("fcp_ms", "field_metrics__fcp_ms"),
+    ("lcp_ms", "field_metrics__lcp_ms"),
+    ("cls", "field_metrics__cls"),
+    ("ttfb_ms", "field_metrics__ttfb_ms"),
+)
+
+
+def build_rollups(apps, schema_editor):
+    PSIReport = apps.get_model("links", "PSIReport")
+    PSIDailyRollup = apps.get_model("links", "PSIDailyRollup")
+    rows = (
+        PSIReport.objects.filter(
+            page__isnull=False, strategy__isnull=False, fetch_time__isnull=False
+        )
+        .order_by("fetch_time")
+        .values("page_id", "strategy", "fetch_time", *(c for _, c in METRICS))
+    )
+    rollups = {}
+    for row in rows.iterator(chunk_size=2000):
+        day = timezone.localdate(row["fetch_time"])
+        key = (row["page_id"], row["strategy"], day)
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = PSIDailyRollup(
+                page_id=row["page_id"], strategy=row["strategy"], day=day
+            )
+        rollup.count += 1
+        for metric, column in METRICS:
+            value = row[column]
+            setattr(rollup, f"{metric}_last", value)
+            if value is None:
+                continue
+            setattr(rollup, f"{metric}_n", getattr(rollup, f"{metric}_n") + 1)
+            setattr(rollup, f"{metric}_sum", getattr(rollup, f"{metric}_sum") + value)
+            low = getattr(rollup, f"{metric}_min")
+            high = getattr(rollup, f"{metric}_max")
+            setattr(rollup, f"{metric}_min", value if low is None else min(low, value))
+            setattr(
+                rollup, f"{metric}_max", value if high is None else max(high, value)
+            )
+        rollup.last_fetch_time = row["fetch_time"]
+    PSIDailyRollup.objects.bulk_create(rollups.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0008_auditdetails"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PSIDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "strategy",
+                    models.CharField(
+                        choices=[("mobile", "Mobile"), ("desktop", "Desktop")],
+                        max_length=16,
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("last_fetch_time", models.DateTimeField(null=True)),
+                ("performance_n", models.PositiveIntegerField(default=0)),
+                ("performance_sum", models.FloatField(default=0)),
+                ("performance_min", models.FloatField(null=True)),
+                ("performance_max", models.FloatField(null=True)),
+                ("performance_last", models.FloatField(null=True)),
+                ("accessibility_n", models.PositiveIntegerField(default=0)),
+                ("accessibility_sum", models.FloatField(default=0)),
+                ("accessibility_min", models.FloatField(null=True)),
+                ("accessibility_max", models.FloatField(null=True)),
+                ("accessibility_last", models.FloatField(null=True)),
+                ("best_practices_n", models.PositiveIntegerField(default=0)),
+                ("best_practices_sum", models.FloatField(default=0)),
+                ("best_practices_min", models.FloatField(null=True)),
+                ("best_practices_max", models.FloatField(null=True)),
+                ("best_practices_last", models.FloatField(null=True)),
+                ("seo_n", models.PositiveIntegerField(default=0)),
+                ("seo_sum", models.FloatField(default=0)),
+                ("seo_min", models.FloatField(null=True)),
+                ("seo_max", models.FloatField(null=True)),
+                ("seo_last", models.FloatField(null=True)),
+                ("fcp_ms_n", models.PositiveIntegerField(default=0)),
+                ("fcp_ms_sum", models.FloatField(default=0)),
+                ("fcp_ms_min", models.FloatField(null=True)),
+                ("fcp_ms_max", models.FloatField(null=True)),
+                ("fcp_ms_last", models.FloatField(null=True)),
+                ("lcp_ms_n", models.PositiveIntegerField(default=0)),
+                ("lcp_ms_sum", models.FloatField(default=0)),
+                ("lcp_ms_min", models.FloatField(null=True)),
+                ("lcp_ms_max", models.FloatField(null=True)),
+                ("lcp_ms_last", models.FloatField(null=True)),
+                ("cls_n", models.PositiveIntegerField(default=0)),
+                ("cls_sum", models.FloatField(default=0)),
+                ("cls_min", models.FloatField(null=True)),
+                ("cls_max", models.FloatField(null=True)),
+                ("cls_last", models.FloatField(null=True)),
+                ("ttfb_ms_n", models.PositiveIntegerField(default=0)),
+                ("ttfb_ms_sum", models.FloatField(default=0)),
+                ("ttfb_ms_min", models.FloatField(null=True)),
+                ("ttfb_ms_max", models.FloatField(null=True)),
+                ("ttfb_ms_last", models.FloatField(null=True)),
+                (
+                    "page",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="psi_rollups",
+                        to="links.page",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="psidailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("page", "strategy", "day"),
+                name="psi_rollup_page_strategy_day_unique",
+            ),
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
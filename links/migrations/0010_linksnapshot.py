@@ -0,0 +1,107 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_snapshots(apps, schema_editor):
+    Link = apps.get_model("links", "Link")
+    LinkSnapshot = apps.get_model("links", "LinkSnapshot")
+    PSIReportGroup = apps.get_model("links", "PSIReportGroup")
+    CategoryScores = apps.get_model("links", "CategoryScores")
+    SSLCheck = apps.get_model("links", "SSLCheck")
+    SSLLabsScan = apps.get_model("links", "SSLLabsScan")
+    snapshots = []
+    for link in Link.objects.iterator():
+        snapshot = LinkSnapshot(
+            link_id=link.id,
+            uptime_status=link.uptime_last_status,
+            uptime_checked_at=link.uptime_last_checked,
+        )
+        group = (
+            PSIReportGroup.objects.filter(
+                page__user_id=link.user_id, page__url=link.url
+            )
+            .order_by("-fetch_time")
+            .first()
+        )
+        if group:
+            snapshot.psi_fetched_at = group.fetch_time
+            for scores in CategoryScores.objects.filter(psi_report__group=group).values(
+                "psi_report__strategy",
+                "performance",
+                "accessibility",
+                "best_practices",
+                "seo",
+            ):
+                if scores["psi_report__strategy"] == "mobile":
+                    snapshot.psi_performance = scores["performance"]
+                    snapshot.psi_accessibility = scores["accessibility"]
+                    snapshot.psi_best_practices = scores["best_practices"]
+                    snapshot.psi_seo = scores["seo"]
+                elif scores["psi_report__strategy"] == "desktop":
+                    snapshot.psi_desktop_performance = scores["performance"]
+        check = SSLCheck.objects.filter(link_id=link.id).order_by("-checked_at").first()
+        if check:
+            snapshot.ssl_valid = not (
+                check.is_expired or check.is_self_signed or check.errors
+            )
+            snapshot.ssl_expiry = check.not_after
+            snapshot.ssl_warnings = check.warnings
+            snapshot.ssl_errors = check.errors
+            snapshot.ssl_checked_at = check.checked_at
+        scan = (
+            SSLLabsScan.objects.filter(link_id=link.id).order_by("-scanned_at").first()
+        )
+        if scan:
+            snapshot.ssl_labs_grade = scan.grade
+            snapshot.ssl_labs_status = scan.status
+            snapshot.ssl_labs_scanned_at = scan.scanned_at
+        snapshots.append(snapshot)
+    LinkSnapshot.objects.bulk_create(snapshots, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0009_psidailyrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LinkSnapshot",
+            fields=[
+                (
+                    "link",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="snapshot",
+                        serialize=False,
+                        to="links.link",
+                    ),
+                ),
+                ("psi_performance", models.FloatField(null=True)),
+                ("psi_accessibility", models.FloatField(null=True)),
+                ("psi_best_practices", models.FloatField(null=True)),
+                ("psi_seo", models.FloatField(null=True)),
+                ("psi_desktop_performance", models.FloatField(null=True)),
+                ("psi_fetched_at", models.DateTimeField(null=True)),
+                ("ssl_valid", models.BooleanField(null=True)),
+                ("ssl_expiry", models.DateTimeField(null=True)),
+                ("ssl_warnings", models.TextField(blank=True)),
+                ("ssl_errors", models.TextField(blank=True)),
+                ("ssl_checked_at", models.DateTimeField(null=True)),
+                ("ssl_labs_grade", models.CharField(blank=True, max_length=4)),
+                ("ssl_labs_status", models.CharField(blank=True, max_length=64)),
+                ("ssl_labs_scanned_at", models.DateTimeField(null=True)),
+                (
+                    "uptime_status",
+                    models.CharField(blank=True, max_length=32, null=True),
+                ),
+                ("uptime_checked_at", models.DateTimeField(null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(build_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0010_linksnapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="link",
+            name="uptime_synced_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="UptimeResponseTime",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("datetime", models.DateTimeField()),
+                ("value", models.PositiveIntegerField()),
+                (
+                    "link",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="uptime_response_times",
+                        to="links.link",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-datetime"],
+            },
+        ),
+        migrations.CreateModel(
+            name="UptimeLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("datetime", models.DateTimeField()),
+                (
+                    "type",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, "Down"),
+                            (2, "Up"),
+                            (98, "Started"),
+                            (99, "Paused"),
+                        ]
+                    ),
+                ),
+                ("duration", models.IntegerField(null=True)),
+                ("reason_code", models.CharField(blank=True, max_length=32)),
+                ("reason_detail", models.CharField(blank=True, max_length=255)),
+                (
+                    "link",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="uptime_logs",
+                        to="links.link",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-datetime"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="uptimeresponsetime",
+            constraint=models.UniqueConstraint(
+                fields=("link", "datetime"), name="uptime_response_time_unique"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="uptimelog",
+            index=models.Index(
+                fields=["link", "type", "datetime"], name="uptime_log_link_type_time"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="uptimelog",
+            constraint=models.UniqueConstraint(
+                fields=("link", "datetime", "type"), name="uptime_log_unique"
+            ),
+        ),
+    ]
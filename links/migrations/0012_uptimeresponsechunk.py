@@ -0,0 +1,97 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:47
+
+import django.db.models.deletion
+import numpy as np
+from django.db import migrations, models
+
+
+def pack_response_times(apps, schema_editor):
+    """Move row-per-sample response times into per-day int32 chunks."""
+    UptimeResponseTime = apps.get_model("links", "UptimeResponseTime")
+    UptimeResponseChunk = apps.get_model("links", "UptimeResponseChunk")
+    link_ids = (
+        UptimeResponseTime.objects.values_list("link_id", flat=True)
+        .order_by("link_id")
+        .distinct()
+    )
+    for link_id in link_ids:
+        rows = UptimeResponseTime.objects.filter(link_id=link_id).order_by("datetime")
+        times = np.array(
+            [
+                int(moment.timestamp())
+                for moment in rows.values_list("datetime", flat=True)
+            ],
+            dtype=np.int64,
+        )
+        values = np.array(rows.values_list("value", flat=True), dtype="<i4")
+        days = times // 86400
+        chunks = []
+        for day_number in np.unique(days):
+            mask = days == day_number
+            day_values = values[mask]
+            chunks.append(
+                UptimeResponseChunk(
+                    link_id=link_id,
+                    day=(np.datetime64("1970-01-01") + int(day_number)).item(),
+                    count=int(mask.sum()),
+                    offsets=(times[mask] - day_number * 86400).astype("<i4").tobytes(),
+                    values=day_values.tobytes(),
+                    min_value=int(day_values.min()),
+                    max_value=int(day_values.max()),
+                    total=int(day_values.sum(dtype=np.int64)),
+                )
+            )
+        UptimeResponseChunk.objects.bulk_create(chunks, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0011_uptimelog"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UptimeResponseChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("offsets", models.BinaryField(default=bytes)),
+                ("values", models.BinaryField(default=bytes)),
+                ("min_value", models.IntegerField(null=True)),
+                ("max_value", models.IntegerField(null=True)),
+                ("total", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "link",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="uptime_response_chunks",
+                        to="links.link",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["day"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="uptimeresponsechunk",
+            constraint=models.UniqueConstraint(
+                fields=("link", "day"), name="uptime_response_chunk_unique"
+            ),
+        ),
+        migrations.RunPython(pack_response_times, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name="UptimeResponseTime",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:51
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0012_uptimeresponsechunk"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="link",
+            name="probe_interval",
+            field=models.PositiveIntegerField(
+                blank=True,
+                null=True,
+                validators=[django.core.validators.MinValueValidator(30)],
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0013_link_probe_interval"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="sslcheck",
+            name="not_after",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="sslcheck",
+            name="not_before",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
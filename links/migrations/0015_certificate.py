@@ -0,0 +1,207 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:56
+
+import hashlib
+import ssl
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CERTIFICATE_FIELDS = (
+    "subject",
+    "issuer",
+    "serial_number",
+    "version",
+    "not_before",
+    "not_after",
+    "san",
+    "signature_algorithm",
+    "public_key_type",
+    "public_key_bits",
+    "ocsp_url",
+    "crl_url",
+    "is_self_signed",
+    "is_weak_signature",
+    "is_short_key",
+)
+
+
+def _fingerprint(check):
+    if check.raw_cert:
+        try:
+            der = ssl.PEM_cert_to_DER_cert(check.raw_cert)
+        except ValueError:
+            der = None
+        if der:
+            return hashlib.sha256(der).hexdigest()
+    if check.subject or check.serial_number:
+        # Parsed details without the certificate itself: key them on what is known
+        legacy = f"legacy:{check.subject}|{check.issuer}|{check.serial_number}"
+        return hashlib.sha256(legacy.encode("utf-8")).hexdigest()
+    return None
+
+
+def move_certificates(apps, schema_editor):
+    """Replace each check's copy of its certificate with a shared Certificate."""
+    SSLCheck = apps.get_model("links", "SSLCheck")
+    Certificate = apps.get_model("links", "Certificate")
+    known = dict(Certificate.objects.values_list("fingerprint", "id"))
+    for check in SSLCheck.objects.order_by("checked_at").iterator():
+        fingerprint = _fingerprint(check)
+        if not fingerprint:
+            continue
+        if fingerprint not in known:
+            certificate = Certificate.objects.create(
+                fingerprint=fingerprint,
+                pem=check.raw_cert if check.raw_cert.startswith("-----") else "",
+                **{field: getattr(check, field) for field in CERTIFICATE_FIELDS},
+            )
+            Certificate.objects.filter(id=certificate.id).update(
+                first_seen=check.checked_at
+            )
+            known[fingerprint] = certificate.id
+        SSLCheck.objects.filter(id=check.id).update(certificate_id=known[fingerprint])
+
+
+def restore_certificates(apps, schema_editor):
+    SSLCheck = apps.get_model("links", "SSLCheck")
+    for check in SSLCheck.objects.filter(certificate__isnull=False).select_related(
+        "certificate"
+    ):
+        certificate = check.certificate
+        SSLCheck.objects.filter(id=check.id).update(
+            raw_cert=certificate.pem,
+            **{field: getattr(certificate, field) for field in CERTIFICATE_FIELDS},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0014_sslcheck_nullable_validity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Certificate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("fingerprint", models.CharField(max_length=64, unique=True)),
+                ("first_seen", models.DateTimeField(auto_now_add=True)),
+                ("subject", models.TextField()),
+                ("issuer", models.TextField()),
+                ("serial_number", models.CharField(max_length=128)),
+                ("version", models.CharField(blank=True, max_length=32, null=True)),
+                ("not_before", models.DateTimeField(null=True)),
+                ("not_after", models.DateTimeField(null=True)),
+                ("san", models.TextField(blank=True)),
+                ("signature_algorithm", models.CharField(blank=True, max_length=128)),
+                ("public_key_type", models.CharField(blank=True, max_length=64)),
+                ("public_key_bits", models.IntegerField(null=True)),
+                ("ocsp_url", models.TextField(blank=True)),
+                ("crl_url", models.TextField(blank=True)),
+                ("is_self_signed", models.BooleanField(default=False)),
+                ("is_weak_signature", models.BooleanField(default=False)),
+                ("is_short_key", models.BooleanField(default=False)),
+                ("pem", models.TextField(blank=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="sslcheck",
+            name="certificate",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="checks",
+                to="links.certificate",
+            ),
+        ),
+        migrations.RunPython(move_certificates, restore_certificates),
+        # Defaults let a reverse migration re-add the columns to existing rows
+        migrations.AlterField(
+            model_name="sslcheck",
+            name="subject",
+            field=models.TextField(default=""),
+        ),
+        migrations.AlterField(
+            model_name="sslcheck",
+            name="issuer",
+            field=models.TextField(default=""),
+        ),
+        migrations.AlterField(
+            model_name="sslcheck",
+            name="serial_number",
+            field=models.CharField(default="", max_length=128),
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="crl_url",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="is_self_signed",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="is_short_key",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="is_weak_signature",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="issuer",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="not_after",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="not_before",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="ocsp_url",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="public_key_bits",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="public_key_type",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="raw_cert",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="san",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="serial_number",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="signature_algorithm",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="subject",
+        ),
+        migrations.RemoveField(
+            model_name="sslcheck",
+            name="version",
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:01
+
+from django.db import migrations, models
+from django.db.models import Case, F, OuterRef, Subquery, When
+
+
+def fill_cert_expiry(apps, schema_editor):
+    LinkSnapshot = apps.get_model("links", "LinkSnapshot")
+    SSLLabsScan = apps.get_model("links", "SSLLabsScan")
+    LinkSnapshot.objects.update(
+        ssl_labs_expiry=Subquery(
+            SSLLabsScan.objects.filter(link_id=OuterRef("link_id"))
+            .order_by("-scanned_at")
+            .values("not_after")[:1]
+        )
+    )
+    LinkSnapshot.objects.update(
+        cert_expiry=Case(
+            When(ssl_expiry__isnull=True, then=F("ssl_labs_expiry")),
+            When(ssl_labs_expiry__lt=F("ssl_expiry"), then=F("ssl_labs_expiry")),
+            default=F("ssl_expiry"),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0015_certificate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="linksnapshot",
+            name="cert_expiry",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="linksnapshot",
+            name="ssl_labs_expiry",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name="linksnapshot",
+            index=models.Index(fields=["cert_expiry"], name="snapshot_cert_expiry"),
+        ),
+        migrations.RunPython(fill_cert_expiry, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:09
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def copy_titles(apps, schema_editor):
+    """
+    Existing rows only have the catalog's (first seen) wording; keep it until
+    the next report of each page stores the real per-run title.
+    """
+    Audit = apps.get_model("links", "Audit")
+    AuditDefinition = apps.get_model("links", "AuditDefinition")
+    Audit.objects.update(
+        title=Subquery(
+            AuditDefinition.objects.filter(id=OuterRef("definition_id")).values(
+                "title"
+            )[:1]
+        )
+    )
+
+
+def restore_titles(apps, schema_editor):
+    Audit = apps.get_model("links", "Audit")
+    AuditDefinition = apps.get_model("links", "AuditDefinition")
+    AuditDefinition.objects.update(
+        title=Coalesce(
+            Subquery(
+                Audit.objects.filter(definition_id=OuterRef("id"))
+                .order_by("-id")
+                .values("title")[:1]
+            ),
+            Value(""),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("links", "0016_snapshot_cert_expiry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="audit",
+            name="title",
+            field=models.CharField(blank=True, max_length=256),
+        ),
+        # A default lets a reverse migration re-add the column to existing rows
+        migrations.AlterField(
+            model_name="auditdefinition",
+            name="title",
+            field=models.CharField(default="", max_length=256),
+        ),
+        migrations.RunPython(copy_titles, restore_titles),
+        migrations.RemoveField(
+            model_name="auditdefinition",
+            name="title",
+        ),
+    ]
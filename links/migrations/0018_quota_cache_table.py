@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_quota_cache_table(apps, schema_editor):
+    """
+    The API quota buckets default to a database cache; create its table so a
+    plain ``migrate`` is enough. Existing tables are left alone.
+    """
+    if "DatabaseCache" not in settings.CACHES[settings.API_QUOTA_CACHE]["BACKEND"]:
+        return
+    call_command(
+        "createcachetable",
+        settings.CACHES[settings.API_QUOTA_CACHE]["LOCATION"],
+        database=schema_editor.connection.alias,
+        verbosity=0,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("links", "0017_audit_title_per_row"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_quota_cache_table, migrations.RunPython.noop),
+    ]
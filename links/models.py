@@ -1,6 +1,10 @@
+import hashlib
+import json
+import zlib
 from typing import Optional
 
 from django.contrib.auth.models import User
+from django.core.validators import MinValueValidator
 from django.db import models
 from django_cryptography.fields import encrypt
 
@@ -10,7 +14,7 @@ class Link(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="links")
     title = models.CharField(max_length=255)
-    url = models.URLField(unique=True)
+    url = models.URLField()
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -18,6 +22,13 @@ class Link(models.Model):
     uptime_monitor_id = models.CharField(max_length=32, blank=True, null=True)
     uptime_last_status = models.CharField(max_length=32, blank=True, null=True)
     uptime_last_checked = models.DateTimeField(blank=True, null=True)
+    # Last incremental sync of the monitor's logs and response times
+    uptime_synced_at = models.DateTimeField(blank=True, null=True)
+    # Seconds between checks by the local probe engine (links/probe.py);
+    # empty leaves the link to UptimeRobot
+    probe_interval = models.PositiveIntegerField(
+        blank=True, null=True, validators=[MinValueValidator(30)]
+    )
 
     def __str__(self) -> str:
         """String representation of the link."""
@@ -25,19 +36,73 @@ class Link(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "url"], name="user_link_url_unique"
+            ),
+        ]
 
 
 class Page(models.Model):
     """A page for which PSI reports are tracked."""
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="pages")
-    url = models.URLField(unique=True)
+    url = models.URLField()
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self) -> str:
         """String representation of the page."""
         return self.url
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "url"], name="user_page_url_unique"
+            ),
+        ]
+
+
+class LinkSnapshot(models.Model):
+    """
+    The latest PSI, SSL, SSL Labs and uptime results of a link in one row, kept
+    current by the services as they store new results so the dashboard does not
+    have to search each history table.
+    """
+
+    link = models.OneToOneField(
+        Link, on_delete=models.CASCADE, primary_key=True, related_name="snapshot"
+    )
+    # Latest PSI report group (mobile scores, plus desktop performance)
+    psi_performance = models.FloatField(null=True)
+    psi_accessibility = models.FloatField(null=True)
+    psi_best_practices = models.FloatField(null=True)
+    psi_seo = models.FloatField(null=True)
+    psi_desktop_performance = models.FloatField(null=True)
+    psi_fetched_at = models.DateTimeField(null=True)
+    # Latest local SSL check
+    ssl_valid = models.BooleanField(null=True)
+    ssl_expiry = models.DateTimeField(null=True)
+    ssl_warnings = models.TextField(blank=True)
+    ssl_errors = models.TextField(blank=True)
+    ssl_checked_at = models.DateTimeField(null=True)
+    # Latest SSL Labs scan
+    ssl_labs_grade = models.CharField(max_length=4, blank=True)
+    ssl_labs_status = models.CharField(max_length=64, blank=True)
+    ssl_labs_expiry = models.DateTimeField(null=True)
+    ssl_labs_scanned_at = models.DateTimeField(null=True)
+    # The sooner of ssl_expiry and ssl_labs_expiry, for fleet expiry reports
+    cert_expiry = models.DateTimeField(null=True)
+    # Latest UptimeRobot monitor status
+    uptime_status = models.CharField(max_length=32, blank=True, null=True)
+    uptime_checked_at = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["cert_expiry"], name="snapshot_cert_expiry")]
+
+    def __str__(self) -> str:
+        return f"Snapshot of {self.link_id}"
+
 
 class PSIReportGroup(models.Model):
     """A group of PSI reports (mobile/desktop) for a page at a specific time."""
@@ -80,16 +145,41 @@ class PSIReport(models.Model):
         blank=True,
         null=True,
     )
-    raw_json = models.JSONField(blank=True, null=True)
 
     def __str__(self) -> str:
         """String representation of the PSI report."""
         return f"PSI Report for {self.page.url if self.page else 'Unknown'} - {self.fetch_time.strftime('%Y-%m-%d %H:%M') if self.fetch_time else 'No Date'}"
 
+    def load_raw_json(self) -> Optional[dict]:
+        """Load and decompress the full PSI response (one extra query)."""
+        payload = PSIReportPayload.objects.filter(psi_report=self).first()
+        return payload.load() if payload else None
+
     class Meta:
         ordering = ["-fetch_time"]
 
 
+class PSIReportPayload(models.Model):
+    """The raw PSI response for a report, compressed and kept off the report row."""
+
+    ENCODING_ZLIB = "zlib"
+
+    psi_report = models.OneToOneField(
+        PSIReport, on_delete=models.CASCADE, related_name="payload"
+    )
+    encoding = models.CharField(max_length=16, default=ENCODING_ZLIB)
+    size = models.PositiveIntegerField(default=0)  # uncompressed bytes
+    data = models.BinaryField()
+
+    @classmethod
+    def from_compressed(cls, data: bytes, size: int, **kwargs) -> "PSIReportPayload":
+        """Build an unsaved payload from an already zlib-compressed body."""
+        return cls(encoding=cls.ENCODING_ZLIB, size=size, data=data, **kwargs)
+
+    def load(self):
+        return json.loads(zlib.decompress(bytes(self.data)))
+
+
 class FieldMetrics(models.Model):
     """Field metrics from PSI (real user data)."""
 
@@ -133,20 +223,168 @@ class CategoryScores(models.Model):
     seo = models.FloatField(null=True)
 
 
+class PSIDailyRollup(models.Model):
+    """
+    Running totals of one page's PSI scores and Core Web Vitals for one strategy
+    and day, updated as reports are stored so trend charts never scan raw rows.
+
+    For each metric ``<metric>_n`` counts the reports that had a value, so
+    ``<metric>_sum / <metric>_n`` is the day's average; ``<metric>_last`` is the
+    value from the day's most recent report.
+    """
+
+    METRICS = (
+        "performance",
+        "accessibility",
+        "best_practices",
+        "seo",
+        "fcp_ms",
+        "lcp_ms",
+        "cls",
+        "ttfb_ms",
+    )
+
+    page = models.ForeignKey(Page, on_delete=models.CASCADE, related_name="psi_rollups")
+    strategy = models.CharField(
+        max_length=16, choices=[("mobile", "Mobile"), ("desktop", "Desktop")]
+    )
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    last_fetch_time = models.DateTimeField(null=True)
+    performance_n = models.PositiveIntegerField(default=0)
+    performance_sum = models.FloatField(default=0)
+    performance_min = models.FloatField(null=True)
+    performance_max = models.FloatField(null=True)
+    performance_last = models.FloatField(null=True)
+    accessibility_n = models.PositiveIntegerField(default=0)
+    accessibility_sum = models.FloatField(default=0)
+    accessibility_min = models.FloatField(null=True)
+    accessibility_max = models.FloatField(null=True)
+    accessibility_last = models.FloatField(null=True)
+    best_practices_n = models.PositiveIntegerField(default=0)
+    best_practices_sum = models.FloatField(default=0)
+    best_practices_min = models.FloatField(null=True)
+    best_practices_max = models.FloatField(null=True)
+    best_practices_last = models.FloatField(null=True)
+    seo_n = models.PositiveIntegerField(default=0)
+    seo_sum = models.FloatField(default=0)
+    seo_min = models.FloatField(null=True)
+    seo_max = models.FloatField(null=True)
+    seo_last = models.FloatField(null=True)
+    fcp_ms_n = models.PositiveIntegerField(default=0)
+    fcp_ms_sum = models.FloatField(default=0)
+    fcp_ms_min = models.FloatField(null=True)
+    fcp_ms_max = models.FloatField(null=True)
+    fcp_ms_last = models.FloatField(null=True)
+    lcp_ms_n = models.PositiveIntegerField(default=0)
+    lcp_ms_sum = models.FloatField(default=0)
+    lcp_ms_min = models.FloatField(null=True)
+    lcp_ms_max = models.FloatField(null=True)
+    lcp_ms_last = models.FloatField(null=True)
+    cls_n = models.PositiveIntegerField(default=0)
+    cls_sum = models.FloatField(default=0)
+    cls_min = models.FloatField(null=True)
+    cls_max = models.FloatField(null=True)
+    cls_last = models.FloatField(null=True)
+    ttfb_ms_n = models.PositiveIntegerField(default=0)
+    ttfb_ms_sum = models.FloatField(default=0)
+    ttfb_ms_min = models.FloatField(null=True)
+    ttfb_ms_max = models.FloatField(null=True)
+    ttfb_ms_last = models.FloatField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["page", "strategy", "day"],
+                name="psi_rollup_page_strategy_day_unique",
+            ),
+        ]
+
+    def add(self, fetch_time, values: dict) -> None:
+        """Fold one report's metric values ({metric: value or None}) into the row."""
+        self.count += 1
+        for metric in self.METRICS:
+            value = values.get(metric)
+            if value is None:
+                continue
+            setattr(self, f"{metric}_n", getattr(self, f"{metric}_n") + 1)
+            setattr(self, f"{metric}_sum", getattr(self, f"{metric}_sum") + value)
+            low = getattr(self, f"{metric}_min")
+            high = getattr(self, f"{metric}_max")
+            setattr(self, f"{metric}_min", value if low is None else min(low, value))
+            setattr(self, f"{metric}_max", value if high is None else max(high, value))
+        if self.last_fetch_time is None or fetch_time >= self.last_fetch_time:
+            self.last_fetch_time = fetch_time
+            for metric in self.METRICS:
+                setattr(self, f"{metric}_last", values.get(metric))
+
+
+class AuditDefinition(models.Model):
+    """
+    Description of a Lighthouse audit, shared by every Audit row. The title is
+    kept per row, since Lighthouse words it differently for passing and
+    failing results.
+    """
+
+    audit_key = models.CharField(max_length=64)
+    lighthouse_version = models.CharField(max_length=32, blank=True)
+    description = models.TextField()
+
+    def __str__(self) -> str:
+        return f"{self.audit_key} ({self.lighthouse_version or 'unknown'})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["audit_key", "lighthouse_version"],
+                name="audit_definition_key_version_unique",
+            ),
+        ]
+
+
+class AuditDetails(models.Model):
+    """An audit ``details`` blob, stored once and addressed by its SHA-256 digest."""
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    data = models.JSONField()
+
+    @staticmethod
+    def digest_for(data) -> str:
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 class Audit(models.Model):
     """Detailed audit results from PSI."""
 
     psi_report = models.ForeignKey(
         PSIReport, on_delete=models.CASCADE, related_name="audits"
     )
+    definition = models.ForeignKey(
+        AuditDefinition, on_delete=models.PROTECT, related_name="audits"
+    )
     category = models.CharField(max_length=32)
     audit_key = models.CharField(max_length=64)
-    title = models.CharField(max_length=256)
-    description = models.TextField()
+    title = models.CharField(max_length=256, blank=True)
     score = models.FloatField(null=True)
     score_display_mode = models.CharField(max_length=32, null=True)
     display_value = models.CharField(max_length=256, null=True)
-    details = models.JSONField(null=True)
+    details_blob = models.ForeignKey(
+        AuditDetails,
+        on_delete=models.PROTECT,
+        related_name="audits",
+        null=True,
+        blank=True,
+    )
+
+    @property
+    def details(self):
+        """The audit details (one query unless ``details_blob`` was prefetched)."""
+        return self.details_blob.data if self.details_blob_id else None
+
+    @property
+    def description(self) -> str:
+        return self.definition.description
 
 
 class UserAPIKey(models.Model):
@@ -169,36 +407,51 @@ class UserAPIKey(models.Model):
         return f"{self.user.username} - {self.get_service_display()}"
 
 
-class SSLCheck(models.Model):
-    """Result of a local SSL certificate check for a site."""
+class Certificate(models.Model):
+    """
+    An X.509 certificate seen by an SSL check, stored once however many checks
+    (or links) presented it.
+    """
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ssl_checks")
-    link = models.ForeignKey(Link, on_delete=models.CASCADE, related_name="ssl_checks")
-    checked_at = models.DateTimeField(auto_now_add=True)
-    # Certificate details
+    fingerprint = models.CharField(max_length=64, unique=True)  # SHA-256 of DER
+    first_seen = models.DateTimeField(auto_now_add=True)
     subject = models.TextField()
     issuer = models.TextField()
     serial_number = models.CharField(max_length=128)
-    version = models.IntegerField(null=True)
-    not_before = models.DateTimeField()
-    not_after = models.DateTimeField()
+    version = models.CharField(max_length=32, blank=True, null=True)
+    not_before = models.DateTimeField(null=True)
+    not_after = models.DateTimeField(null=True)
     san = models.TextField(blank=True)  # comma-separated
     signature_algorithm = models.CharField(max_length=128, blank=True)
     public_key_type = models.CharField(max_length=64, blank=True)
     public_key_bits = models.IntegerField(null=True)
     ocsp_url = models.TextField(blank=True)
     crl_url = models.TextField(blank=True)
-    # Chain info
-    chain_count = models.IntegerField(default=1)
     is_self_signed = models.BooleanField(default=False)
-    is_expired = models.BooleanField(default=False)
     is_weak_signature = models.BooleanField(default=False)
     is_short_key = models.BooleanField(default=False)
+    pem = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.subject} ({self.fingerprint[:16]})"
+
+
+class SSLCheck(models.Model):
+    """Result of a local SSL certificate check for a site."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ssl_checks")
+    link = models.ForeignKey(Link, on_delete=models.CASCADE, related_name="ssl_checks")
+    checked_at = models.DateTimeField(auto_now_add=True)
+    # Empty when the certificate could not be fetched (see errors)
+    certificate = models.ForeignKey(
+        Certificate, on_delete=models.PROTECT, null=True, related_name="checks"
+    )
+    # Chain info
+    chain_count = models.IntegerField(default=1)
+    is_expired = models.BooleanField(default=False)
     # Warnings and errors
     warnings = models.TextField(blank=True)
     errors = models.TextField(blank=True)
-    # Raw cert (PEM or DER, optional)
-    raw_cert = models.TextField(blank=True)
 
     class Meta:
         ordering = ["-checked_at"]
@@ -246,3 +499,58 @@ class SSLLabsScan(models.Model):
 
     class Meta:
         ordering = ["-scanned_at"]
+
+
+class UptimeLog(models.Model):
+    """A log event (down, up, paused, started) of a link's UptimeRobot monitor."""
+
+    TYPE_CHOICES = [(1, "Down"), (2, "Up"), (98, "Started"), (99, "Paused")]
+
+    link = models.ForeignKey(Link, on_delete=models.CASCADE, related_name="uptime_logs")
+    datetime = models.DateTimeField()
+    type = models.PositiveSmallIntegerField(choices=TYPE_CHOICES)
+    duration = models.IntegerField(null=True)  # seconds
+    reason_code = models.CharField(max_length=32, blank=True)
+    reason_detail = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ["-datetime"]
+        # The unique constraint also indexes (link, datetime)
+        indexes = [
+            models.Index(
+                fields=["link", "type", "datetime"], name="uptime_log_link_type_time"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["link", "datetime", "type"], name="uptime_log_unique"
+            ),
+        ]
+
+
+class UptimeResponseChunk(models.Model):
+    """
+    One UTC day of a link's UptimeRobot response times, packed as int32 arrays
+    (see links/timeseries.py).
+    """
+
+    link = models.ForeignKey(
+        Link, on_delete=models.CASCADE, related_name="uptime_response_chunks"
+    )
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+    # Seconds since midnight UTC, and milliseconds, little-endian int32
+    offsets = models.BinaryField(default=bytes)
+    values = models.BinaryField(default=bytes)
+    min_value = models.IntegerField(null=True)
+    max_value = models.IntegerField(null=True)
+    total = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["link", "day"], name="uptime_response_chunk_unique"
+            ),
+        ]
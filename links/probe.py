@@ -0,0 +1,239 @@
+"""Self-hosted HTTP(S) uptime probes.
+
+``ProbeEngine`` checks links on their own intervals from one asyncio event
+loop. Each check opens a connection with ``asyncio.open_connection`` (TLS for
+https), sends a GET and reads only the status line, so thousands of checks a
+minute stay cheap on one core. Concurrency is bounded overall and per host.
+Results are buffered and handed to a ``store`` callable in a worker thread
+every few seconds (``UptimeProbeService.store_results`` in production), so the
+event loop never waits on the database.
+"""
+
+import asyncio
+import heapq
+import random
+import ssl
+import time
+from collections import deque, namedtuple
+from urllib.parse import urlsplit
+
+MIN_INTERVAL = 30
+USER_AGENT = "webassist-probe/1.0"
+# Response times kept for the report; older ones are dropped
+LATENCY_SAMPLES = 10000
+
+# ``up`` is the last known state (None if unknown)
+ProbeTarget = namedtuple("ProbeTarget", "link_id url interval up")
+# ``time`` is Unix seconds; ``changed`` marks a state flip (or a first result)
+ProbeResult = namedtuple(
+    "ProbeResult", "link_id time up status_code response_ms error changed"
+)
+
+
+async def _status(parts, ssl_context):
+    secure = parts.scheme == "https"
+    host = parts.hostname
+    port = parts.port or (443 if secure else 80)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    reader, writer = await asyncio.open_connection(
+        host,
+        port,
+        ssl=ssl_context if secure else None,
+        server_hostname=host if secure else None,
+    )
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {parts.netloc.rpartition('@')[2]}\r\n"
+            f"User-Agent: {USER_AGENT}\r\nAccept: */*\r\nConnection: close\r\n\r\n".encode(
+                "latin-1"
+            )
+        )
+        await writer.drain()
+        line = await reader.readline()
+    finally:
+        writer.close()
+    fields = line.split(None, 2)
+    if len(fields) < 2 or not fields[0].startswith(b"HTTP/"):
+        raise ValueError(f"Malformed status line: {line[:80]!r}")
+    return int(fields[1])
+
+
+async def check(url, timeout, ssl_context=None):
+    """
+    GET ``url`` and return ``(status_code, elapsed_ms, error)``. Connection
+    failures, TLS errors and timeouts give a None status and the error.
+    """
+    started = time.monotonic()
+    try:
+        status = await asyncio.wait_for(
+            _status(urlsplit(url), ssl_context or ssl.create_default_context()),
+            timeout,
+        )
+    except asyncio.TimeoutError:
+        return None, None, f"Timed out after {timeout:g}s"
+    except (OSError, ValueError, ssl.SSLError) as e:
+        return None, None, str(e) or e.__class__.__name__
+    return status, int((time.monotonic() - started) * 1000), None
+
+
+class ProbeEngine:
+    def __init__(
+        self,
+        targets,
+        store,
+        concurrency=500,
+        per_host=4,
+        timeout=10.0,
+        flush_every=1000,
+        flush_seconds=5.0,
+    ):
+        self.targets = {}
+        self.state = {}
+        # Heap of (due, link_id) on the monotonic clock (what loop.time()
+        # uses), kept across runs so a reload does not reshuffle the schedule.
+        # ``_due`` holds each link's current entry; others are stale.
+        self._queue = []
+        self._due = {}
+        self.set_targets(targets)
+        self.store = store
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.results = []
+        self.checks = 0
+        self.failures = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._hosts = {}
+        self._ssl = ssl.create_default_context()
+        self._flush_lock = None
+
+    def set_targets(self, targets):
+        """
+        Replace the probed links, keeping the known state and next check time
+        of existing ones.
+        """
+        self.targets = {target.link_id: target for target in targets}
+        now = time.monotonic()
+        for link_id in set(self._due) - set(self.targets):
+            del self._due[link_id]
+            self.state.pop(link_id, None)
+        for target in targets:
+            self.state.setdefault(target.link_id, target.up)
+            due = self._due.get(target.link_id)
+            # New links, and links whose interval was shortened, are spread
+            # over their first interval
+            if due is None or due > now + target.interval:
+                self._schedule(target.link_id, now + random.uniform(0, target.interval))
+        if len(self._queue) > 2 * len(self._due) + 64:
+            # Drop the stale entries of removed and rescheduled links
+            self._queue = [(due, link_id) for link_id, due in self._due.items()]
+            heapq.heapify(self._queue)
+
+    def _schedule(self, link_id, due):
+        self._due[link_id] = due
+        heapq.heappush(self._queue, (due, link_id))
+
+    def _host_slot(self, url):
+        host = urlsplit(url).hostname
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def _probe(self, target, slots):
+        try:
+            async with self._host_slot(target.url):
+                moment = int(time.time())
+                status, elapsed, error = await check(
+                    target.url, self.timeout, self._ssl
+                )
+        finally:
+            slots.release()
+        up = status is not None and status < 400
+        if status is not None and not up:
+            error = f"HTTP {status}"
+        changed = self.state.get(target.link_id) is not up
+        self.state[target.link_id] = up
+        self.checks += 1
+        if up:
+            self.latencies.append(elapsed)
+        else:
+            self.failures += 1
+        self.results.append(
+            ProbeResult(
+                target.link_id,
+                moment,
+                up,
+                status,
+                elapsed if up else None,
+                error,
+                changed,
+            )
+        )
+        if len(self.results) >= self.flush_every:
+            await self.flush()
+
+    async def flush(self):
+        async with self._flush_lock:
+            batch, self.results = self.results, []
+            if batch:
+                await asyncio.to_thread(self.store, batch)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    async def run(self, once=False, duration=None):
+        """
+        Probe every target on its interval. With ``once`` each target is
+        checked a single time; otherwise the engine runs for ``duration``
+        seconds (forever when None).
+        """
+        loop = asyncio.get_running_loop()
+        # Semaphores and locks belong to the loop that first waits on them
+        self._hosts = {}
+        self._flush_lock = asyncio.Lock()
+        slots = asyncio.Semaphore(self.concurrency)
+        stop = loop.time() + duration if duration is not None else None
+        if once:
+            queue = [(loop.time(), link_id) for link_id in self.targets]
+        else:
+            queue = self._queue
+        tasks = set()
+        flusher = asyncio.create_task(self._flush_periodically())
+        try:
+            while queue:
+                due, link_id = queue[0]
+                if not once and self._due.get(link_id) != due:
+                    heapq.heappop(queue)
+                    continue
+                if stop is not None and due >= stop:
+                    await asyncio.sleep(max(0, stop - loop.time()))
+                    break
+                if due > loop.time():
+                    await asyncio.sleep(due - loop.time())
+                    continue
+                heapq.heappop(queue)
+                target = self.targets[link_id]
+                # Wait for a free slot here, so a slow round delays the
+                # schedule instead of piling up tasks
+                await slots.acquire()
+                task = asyncio.create_task(self._probe(target, slots))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                if not once:
+                    self._schedule(link_id, max(due + target.interval, loop.time()))
+            else:
+                # Nothing left to probe: still honour the run's duration, so a
+                # caller reloading targets on each run does not spin
+                if not once and stop is not None:
+                    await asyncio.sleep(max(0, stop - loop.time()))
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            flusher.cancel()
+            for task in tasks:
+                task.cancel()
+            await self.flush()
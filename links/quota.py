@@ -0,0 +1,207 @@
+"""Per-key API quota management for PSI and UptimeRobot calls.
+
+Each ``UserAPIKey`` gets a rate bucket (``per_second`` or ``per_minute``,
+holding up to ``burst`` tokens) and a per-day token bucket. The buckets live
+in the API_QUOTA_CACHE cache alias, which must be shared by every worker
+process (the database cache by default; Redis or Memcached also work).
+Callers block in ``acquire`` until both buckets have a token. After a 429 the
+key enters an exponentially growing cooldown that ``acquire`` also waits out.
+Calls are counted in memory and written to ``UserAPIKey.usage``/
+``last_checked`` in batches.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import UserAPIKey
+
+LOCK_TIMEOUT = 5  # seconds a bucket lock may be held before it expires
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class Throttled(QuotaExceeded):
+    """The API answered 429; the caller should report it with ``throttled``."""
+
+
+def get_limits(service):
+    return settings.API_QUOTAS.get(service, {})
+
+
+def _cache():
+    return caches[settings.API_QUOTA_CACHE]
+
+
+def rate_limit(limits):
+    """
+    ``(tokens per second, bucket capacity)`` of a service's limits, or None.
+    The capacity is ``burst`` when set, otherwise one second's (or one
+    minute's) worth of calls, so short bursts do not wait between calls.
+    """
+    if limits.get("per_second"):
+        rate = limits["per_second"]
+        capacity = max(1, rate)
+    elif limits.get("per_minute"):
+        rate = limits["per_minute"] / 60
+        capacity = max(1, limits["per_minute"])
+    else:
+        return None
+    return rate, limits.get("burst", capacity)
+
+
+def _bucket_key(key_obj, name):
+    return f"quota:{key_obj.pk}:{name}"
+
+
+@contextmanager
+def _locked(key_obj):
+    """Cross-process lock around a key's buckets, built on atomic cache.add."""
+    name = f"quota:{key_obj.pk}:lock"
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while not _cache().add(name, 1, LOCK_TIMEOUT):
+        if time.monotonic() > deadline:
+            # A holder died without releasing; take the lock over.
+            _cache().set(name, 1, LOCK_TIMEOUT)
+            break
+        time.sleep(0.005)
+    try:
+        yield
+    finally:
+        _cache().delete(name)
+
+
+def _take(key_obj, name, rate, capacity, now):
+    """
+    Refill the named bucket and take one token. Returns 0 on success, otherwise
+    the number of seconds until a token is available. Must hold the key lock.
+    """
+    cache_key = _bucket_key(key_obj, name)
+    tokens, updated = _cache().get(cache_key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        _cache().set(cache_key, (tokens - 1, now), None)
+        return 0
+    _cache().set(cache_key, (tokens, now), None)
+    return (1 - tokens) / rate
+
+
+def _give_back(key_obj, name, capacity):
+    cache_key = _bucket_key(key_obj, name)
+    state = _cache().get(cache_key)
+    if state:
+        tokens, updated = state
+        _cache().set(cache_key, (min(capacity, tokens + 1), updated), None)
+
+
+def acquire(key_obj, max_wait=None):
+    """
+    Block until the key may make one call. Raises QuotaExceeded when the daily
+    bucket is empty or the wait would exceed ``max_wait`` seconds.
+    """
+    limits = get_limits(key_obj.service)
+    if not limits:
+        return
+    if max_wait is None:
+        max_wait = settings.API_QUOTA_MAX_WAIT
+    rate = rate_limit(limits)
+    per_day = limits.get("per_day")
+    deadline = time.monotonic() + max_wait
+    while True:
+        now = time.time()
+        with _locked(key_obj):
+            wait = max(0.0, _cache().get(f"quota:{key_obj.pk}:cooldown", 0) - now)
+            if not wait and per_day:
+                day_wait = _take(key_obj, "day", per_day / 86400, per_day, now)
+                if day_wait:
+                    raise QuotaExceeded(
+                        f"Daily {key_obj.get_service_display()} quota of {per_day} "
+                        "requests used up. Please try again later."
+                    )
+            if not wait and rate:
+                wait = _take(key_obj, "rate", *rate, now)
+                if wait and per_day:
+                    _give_back(key_obj, "day", per_day)
+            if not wait:
+                return
+        if time.monotonic() + wait > deadline:
+            raise QuotaExceeded(
+                f"{key_obj.get_service_display()} is rate limiting this API key. "
+                "Please try again later."
+            )
+        time.sleep(wait)
+
+
+def release(key_obj):
+    """Return a token taken by ``acquire`` for a call that was never made."""
+    limits = get_limits(key_obj.service)
+    rate = rate_limit(limits)
+    per_day = limits.get("per_day")
+    if not (rate or per_day):
+        return
+    with _locked(key_obj):
+        if rate:
+            _give_back(key_obj, "rate", rate[1])
+        if per_day:
+            _give_back(key_obj, "day", per_day)
+
+
+def throttled(key_obj):
+    """Record a 429: start or extend the key's cooldown with jittered backoff."""
+    strikes_key = f"quota:{key_obj.pk}:strikes"
+    strikes = _cache().get(strikes_key, 0) + 1
+    _cache().set(strikes_key, strikes, 3600)
+    delay = min(
+        settings.API_QUOTA_MAX_BACKOFF,
+        settings.API_QUOTA_BASE_BACKOFF * (2 ** (strikes - 1)),
+    )
+    delay *= random.uniform(0.75, 1.25)
+    _cache().set(f"quota:{key_obj.pk}:cooldown", time.time() + delay, int(delay) + 1)
+
+
+def succeeded(key_obj):
+    """Reset the key's backoff after a successful call."""
+    _cache().delete(f"quota:{key_obj.pk}:strikes")
+
+
+_usage_lock = threading.Lock()
+_pending_usage: dict[int, int] = {}
+_last_flush = time.monotonic()
+
+
+def record_usage(key_obj):
+    """Count one call against the key; see flush_usage."""
+    with _usage_lock:
+        _pending_usage[key_obj.pk] = _pending_usage.get(key_obj.pk, 0) + 1
+
+
+def flush_usage(force=False):
+    """
+    Write pending usage counts to UserAPIKey.usage and last_checked once enough
+    calls have accumulated or enough time has passed (always when ``force``).
+    """
+    global _last_flush
+    with _usage_lock:
+        due = (
+            sum(_pending_usage.values()) >= settings.API_USAGE_FLUSH_EVERY
+            or time.monotonic() - _last_flush >= settings.API_USAGE_FLUSH_SECONDS
+        )
+        if not _pending_usage or not (due or force):
+            return
+        pending = dict(_pending_usage)
+        _pending_usage.clear()
+        _last_flush = time.monotonic()
+    now = timezone.now()
+    for pk, count in pending.items():
+        UserAPIKey.objects.filter(pk=pk).update(
+            usage=Coalesce(F("usage"), Value(0)) + count, last_checked=now
+        )
@@ -0,0 +1,220 @@
+"""Columnar chart data for the PSI, uptime, SSL and SSL Labs history pages.
+
+Each ``*_series`` function returns ``{"t": [ISO timestamps], <metric>: [...]}``
+with one array per metric, all aligned with ``t``, downsampled to at most
+``target`` points. The matching ``*_version``
+functions return a cheap ``(tag, last_modified)`` validator for a window, so an
+unchanged series can be answered with a 304 without being rebuilt. Uptime
+series are read from the logs and response times synced from UptimeRobot.
+"""
+
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from . import analytics, downsample
+from .services import PSIRollupService, UptimeLogService
+
+PSI_COLUMNS = (
+    "performance",
+    "accessibility",
+    "best_practices",
+    "seo",
+    "fcp",
+    "lcp",
+    "cls",
+    "ttfb",
+    "count",
+)
+
+
+def parse_date(value):
+    """Parse a ``YYYY-MM-DD`` query parameter; empty values mean unbounded."""
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def columns(rows, keys, time_key="date"):
+    """Turn a list of dicts into ``{"t": [...], key: [...]}`` arrays."""
+    series = {"t": [row[time_key] for row in rows]}
+    for key in keys:
+        series[key] = [row.get(key) for row in rows]
+    return series
+
+
+def window_bounds(start, end):
+    """
+    The ``start``..``end`` days as aware datetimes ``[start, end)``; either may
+    be None for an open end.
+    """
+    if start:
+        start = timezone.make_aware(datetime.combine(start, time.min))
+    if end:
+        end = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+    return start, end
+
+
+def filter_window(qs, field, start, end):
+    """Limit ``qs`` to rows whose ``field`` falls on the ``start``..``end`` days."""
+    start, end = window_bounds(start, end)
+    if start:
+        qs = qs.filter(**{f"{field}__gte": start})
+    if end:
+        qs = qs.filter(**{f"{field}__lt": end})
+    return qs
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+# --- PSI ---
+
+
+def psi_version(page, start, end):
+    state = PSIRollupService.rollups(page, start, end).aggregate(
+        days=Count("id"), reports=Sum("count"), latest=Max("last_fetch_time")
+    )
+    latest = state["latest"]
+    tag = (
+        f"{state['days']}-{state['reports'] or 0}-{latest.timestamp() if latest else 0}"
+    )
+    return tag, latest
+
+
+def psi_series(page, start, end, granularity="day", target=None):
+    points = PSIRollupService.points(page, start, end, granularity)
+    target = target or downsample.target_points()
+    return {
+        strategy: downsample.downsample_columns(
+            columns(rows, PSI_COLUMNS), "performance", target
+        )
+        for strategy, rows in points.items()
+    }
+
+
+# --- SSL ---
+
+
+def ssl_version(link, start, end):
+    checks = filter_window(link.ssl_checks.order_by(), "checked_at", start, end)
+    state = checks.aggregate(count=Count("id"), latest=Max("checked_at"))
+    latest = state["latest"]
+    return f"{state['count']}-{latest.timestamp() if latest else 0}", latest
+
+
+def ssl_series(link, start, end, target=None):
+    checks = filter_window(link.ssl_checks.all(), "checked_at", start, end)
+    rows = checks.order_by("checked_at").values_list(
+        "checked_at", "certificate__not_after", "is_expired"
+    )
+    series = {"t": [], "expiry": [], "days_left": [], "is_expired": []}
+    for checked_at, not_after, is_expired in rows:
+        series["t"].append(checked_at.isoformat())
+        series["expiry"].append(_isoformat(not_after))
+        series["days_left"].append((not_after - checked_at).days if not_after else None)
+        series["is_expired"].append(is_expired)
+    return downsample.downsample_columns(
+        series, "days_left", target or downsample.target_points()
+    )
+
+
+# --- SSL Labs ---
+
+
+def ssl_labs_version(link, start, end):
+    scans = filter_window(link.ssllabs_scans.order_by(), "scanned_at", start, end)
+    state = scans.aggregate(count=Count("id"), latest=Max("scanned_at"))
+    latest = state["latest"]
+    return f"{state['count']}-{latest.timestamp() if latest else 0}", latest
+
+
+def ssl_labs_series(link, start, end, target=None):
+    scans = filter_window(link.ssllabs_scans.all(), "scanned_at", start, end)
+    rows = scans.order_by("scanned_at").values_list(
+        "scanned_at", "grade", "status", "endpoint"
+    )
+    series = {"t": [], "grade": [], "status": [], "endpoint": []}
+    for scanned_at, grade, status, endpoint in rows:
+        series["t"].append(scanned_at.isoformat())
+        series["grade"].append(grade or None)
+        series["status"].append(status)
+        series["endpoint"].append(endpoint)
+    return downsample.downsample_columns(
+        series,
+        "grade",
+        target or downsample.target_points(),
+        score=downsample.grade_score,
+    )
+
+
+# --- Uptime ---
+
+
+def uptime_version(link, start, end):
+    logs = filter_window(link.uptime_logs.order_by(), "datetime", start, end)
+    log_state = logs.aggregate(
+        count=Count("id"), latest=Max("datetime"), durations=Sum("duration")
+    )
+    # Chunks of the window's days, widened by one day for timezone offsets
+    chunks = link.uptime_response_chunks.order_by()
+    if start:
+        chunks = chunks.filter(day__gte=start - timedelta(days=1))
+    if end:
+        chunks = chunks.filter(day__lte=end + timedelta(days=1))
+    chunk_state = chunks.aggregate(samples=Sum("count"), updated=Max("updated_at"))
+    latest = max(
+        filter(None, (log_state["latest"], chunk_state["updated"])), default=None
+    )
+    # Durations of stored logs change without adding rows
+    tag = (
+        f"{log_state['count']}-{chunk_state['samples'] or 0}-"
+        f"{log_state['durations'] or 0}-{latest.timestamp() if latest else 0}"
+    )
+    return tag, latest
+
+
+def uptime_series(link, start, end, target=None):
+    """
+    Stored log events and response times of a link's monitor as columns,
+    plus the window's ``analytics.summarize`` figures under ``stats``.
+    """
+    start, end = window_bounds(start, end)
+    logs = link.uptime_logs.order_by("datetime")
+    if start:
+        logs = logs.filter(datetime__gte=start)
+    if end:
+        logs = logs.filter(datetime__lt=end)
+    rows = list(logs.values_list("datetime", "type", "duration"))
+    times, values = UptimeLogService.response_times(link, start, end)
+    close = min(end, timezone.now()) if end else timezone.now()
+    stats = analytics.summarize(
+        [moment.timestamp() for moment, _, _ in rows],
+        [status for _, status, _ in rows],
+        values,
+        close.timestamp(),
+    )
+    target = target or downsample.target_points()
+    log_series = {
+        "t": [moment.isoformat() for moment, _, _ in rows],
+        "status": [status for _, status, _ in rows],
+        "duration": [duration for _, _, duration in rows],
+    }
+    if len(times) > target:
+        kept = downsample.lttb_indices(times, values, target)
+        times, values = times[kept], values[kept]
+    sample_series = {
+        "t": [
+            datetime.fromtimestamp(t, tz=dt_timezone.utc).isoformat()
+            for t in times.tolist()
+        ],
+        "value": values.tolist(),
+    }
+    return {
+        "logs": downsample.downsample_columns(log_series, "status", target),
+        "response_times": sample_series,
+        "stats": stats,
+    }
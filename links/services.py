@@ -1,63 +1,367 @@
+import hashlib
 import socket
 import ssl
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from urllib.parse import urlsplit
 
+import ijson
+import numpy as np
 import requests
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, Min, ProtectedError, Q, Sum, When
+from django.db.models.functions import TruncMonth, TruncWeek
 from django.utils import timezone
 
+from . import certificates, http_client, quota, timeseries
+from .json_stream import PSI_FIELDS, SSLLABS_FIELDS, SSLLABS_SKIP, StreamedBody
 from .models import (
     Audit,
+    AuditDefinition,
+    AuditDetails,
     CategoryScores,
+    Certificate,
     FieldMetrics,
     LabMetrics,
+    Link,
+    LinkSnapshot,
     Page,
+    PSIDailyRollup,
     PSIReport,
     PSIReportGroup,
+    PSIReportPayload,
     SSLCheck,
     SSLLabsScan,
+    UptimeLog,
+    UptimeResponseChunk,
     UserAPIKey,
 )
+from .signals import ssl_checks_stored, uptime_status_changed
+
+
+class AuditCatalog:
+    """
+    Resolve audit keys to shared AuditDefinition rows, creating missing ones on
+    first sight. Ids are cached per process once the creating transaction
+    commits, so a rolled-back ingest never leaves stale ids behind.
+    """
+
+    _ids: dict[tuple[str, str], int] = {}
+
+    @classmethod
+    def resolve(cls, lighthouse_version, definitions):
+        """Return {audit_key: definition_id} for the given {audit_key: text} map."""
+        ids = {}
+        missing = {}
+        for audit_key, text in definitions.items():
+            cached = cls._ids.get((audit_key, lighthouse_version))
+            if cached is None:
+                missing[audit_key] = text
+            else:
+                ids[audit_key] = cached
+        if missing:
+            AuditDefinition.objects.bulk_create(
+                [
+                    AuditDefinition(
+                        audit_key=audit_key,
+                        lighthouse_version=lighthouse_version,
+                        **text,
+                    )
+                    for audit_key, text in missing.items()
+                ],
+                ignore_conflicts=True,
+            )
+            found = dict(
+                AuditDefinition.objects.filter(
+                    lighthouse_version=lighthouse_version, audit_key__in=missing
+                ).values_list("audit_key", "id")
+            )
+            ids.update(found)
+            transaction.on_commit(
+                lambda: cls._ids.update(
+                    {(key, lighthouse_version): pk for key, pk in found.items()}
+                )
+            )
+        return ids
+
+    @classmethod
+    def clear(cls):
+        cls._ids.clear()
+
+
+class LinkSnapshotService:
+    """Keep each link's LinkSnapshot current as new results are stored."""
+
+    @staticmethod
+    def record(link_ids, time_field, moment, **fields):
+        """
+        Write ``fields`` into the snapshots of ``link_ids`` as the result from
+        ``moment`` (kept in ``time_field``). Snapshots already holding a newer
+        result are left alone.
+        """
+        fields[time_field] = moment
+        fields["updated_at"] = timezone.now()
+        newer = Q(**{f"{time_field}__gt": moment})
+        for link_id in link_ids:
+            snapshots = LinkSnapshot.objects.filter(link_id=link_id).exclude(newer)
+            if not snapshots.update(**fields):
+                LinkSnapshot.objects.get_or_create(link_id=link_id, defaults=fields)
+
+    @classmethod
+    def record_psi(cls, user, url, fetch_time, scores):
+        """``scores`` maps strategy to its parsed category scores."""
+        mobile = scores.get("mobile", {})
+        cls.record(
+            Link.objects.filter(user=user, url=url).values_list("id", flat=True),
+            "psi_fetched_at",
+            fetch_time,
+            psi_performance=mobile.get("performance"),
+            psi_accessibility=mobile.get("accessibility"),
+            psi_best_practices=mobile.get("best_practices"),
+            psi_seo=mobile.get("seo"),
+            psi_desktop_performance=scores.get("desktop", {}).get("performance"),
+        )
+
+    # The sooner of the two expiries; a NULL side never wins
+    CERT_EXPIRY = Case(
+        When(ssl_expiry__isnull=True, then=F("ssl_labs_expiry")),
+        When(ssl_labs_expiry__lt=F("ssl_expiry"), then=F("ssl_labs_expiry")),
+        default=F("ssl_expiry"),
+    )
+
+    @classmethod
+    def refresh_cert_expiry(cls, link_ids):
+        """Recompute ``cert_expiry`` after either expiry of ``link_ids`` changed."""
+        LinkSnapshot.objects.filter(link_id__in=link_ids).update(
+            cert_expiry=cls.CERT_EXPIRY
+        )
+
+    @staticmethod
+    def _ssl_fields(check):
+        """
+        The snapshot fields of ``check``. A check without a certificate (a
+        failed handshake) leaves ``ssl_expiry`` out, so the expiry of the last
+        certificate seen is kept.
+        """
+        certificate = check.certificate
+        self_signed = certificate.is_self_signed if certificate else False
+        fields = {
+            "ssl_valid": not (check.is_expired or self_signed or check.errors),
+            "ssl_warnings": check.warnings,
+            "ssl_errors": check.errors,
+        }
+        if certificate:
+            fields["ssl_expiry"] = certificate.not_after
+        return fields
+
+    @classmethod
+    def record_ssl_check(cls, check):
+        cls.record(
+            [check.link_id],
+            "ssl_checked_at",
+            check.checked_at,
+            **cls._ssl_fields(check),
+        )
+        cls.refresh_cert_expiry([check.link_id])
+
+    @classmethod
+    def record_ssl_checks(cls, checks):
+        """
+        Upsert the snapshots of many fresh checks (e.g. a sweep) in at most two
+        queries. Unlike ``record``, this assumes the checks are the newest results.
+        """
+        now = timezone.now()
+        fields = [
+            "ssl_valid",
+            "ssl_warnings",
+            "ssl_errors",
+            "ssl_checked_at",
+            "updated_at",
+        ]
+        # Failed checks keep the stored expiry, so they are upserted without it
+        for with_expiry in (True, False):
+            snapshots = [
+                LinkSnapshot(
+                    link_id=check.link_id,
+                    ssl_checked_at=check.checked_at,
+                    updated_at=now,
+                    **cls._ssl_fields(check),
+                )
+                for check in checks
+                if (check.certificate_id is not None) is with_expiry
+            ]
+            if snapshots:
+                LinkSnapshot.objects.bulk_create(
+                    snapshots,
+                    update_conflicts=True,
+                    unique_fields=["link"],
+                    update_fields=(fields + ["ssl_expiry"]) if with_expiry else fields,
+                )
+        cls.refresh_cert_expiry([check.link_id for check in checks])
+        ssl_checks_stored.send(
+            sender=SSLCheck, user_ids=[check.user_id for check in checks]
+        )
+
+    @classmethod
+    def record_ssl_labs_scan(cls, scan):
+        expiry = scan.not_after
+        if expiry and timezone.is_naive(expiry):
+            expiry = timezone.make_aware(expiry, dt_timezone.utc)
+        cls.record(
+            [scan.link_id],
+            "ssl_labs_scanned_at",
+            scan.scanned_at,
+            ssl_labs_grade=scan.grade,
+            ssl_labs_status=scan.status,
+            ssl_labs_expiry=expiry,
+        )
+        cls.refresh_cert_expiry([scan.link_id])
+
+    @staticmethod
+    def record_uptime(links):
+        """Upsert the uptime status of many links in one query."""
+        now = timezone.now()
+        LinkSnapshot.objects.bulk_create(
+            [
+                LinkSnapshot(
+                    link_id=link.id,
+                    uptime_status=link.uptime_last_status,
+                    uptime_checked_at=link.uptime_last_checked,
+                    updated_at=now,
+                )
+                for link in links
+            ],
+            update_conflicts=True,
+            unique_fields=["link"],
+            update_fields=["uptime_status", "uptime_checked_at", "updated_at"],
+        )
+        uptime_status_changed.send(
+            sender=LinkSnapshot, user_ids=[link.user_id for link in links]
+        )
+
+    @classmethod
+    def rebuild(cls, link):
+        """Recompute a link's snapshot from its history, e.g. after deletions."""
+        LinkSnapshot.objects.filter(link=link).delete()
+        snapshot = LinkSnapshot(
+            link=link,
+            uptime_status=link.uptime_last_status,
+            uptime_checked_at=link.uptime_last_checked,
+        )
+        group = (
+            PSIReportGroup.objects.filter(page__user=link.user, page__url=link.url)
+            .order_by("-fetch_time")
+            .first()
+        )
+        if group:
+            scores = {
+                report.strategy: report.category_scores
+                for report in group.reports.select_related("category_scores")
+                if hasattr(report, "category_scores")
+            }
+            mobile = scores.get("mobile")
+            desktop = scores.get("desktop")
+            snapshot.psi_fetched_at = group.fetch_time
+            if mobile:
+                snapshot.psi_performance = mobile.performance
+                snapshot.psi_accessibility = mobile.accessibility
+                snapshot.psi_best_practices = mobile.best_practices
+                snapshot.psi_seo = mobile.seo
+            if desktop:
+                snapshot.psi_desktop_performance = desktop.performance
+        check = (
+            link.ssl_checks.select_related("certificate")
+            .order_by("-checked_at")
+            .first()
+        )
+        if check:
+            for field, value in cls._ssl_fields(check).items():
+                setattr(snapshot, field, value)
+            snapshot.ssl_checked_at = check.checked_at
+            if not check.certificate:
+                snapshot.ssl_expiry = (
+                    link.ssl_checks.filter(certificate__isnull=False)
+                    .order_by("-checked_at")
+                    .values_list("certificate__not_after", flat=True)
+                    .first()
+                )
+        scan = link.ssllabs_scans.order_by("-scanned_at").first()
+        if scan:
+            snapshot.ssl_labs_grade = scan.grade
+            snapshot.ssl_labs_status = scan.status
+            snapshot.ssl_labs_expiry = scan.not_after
+            snapshot.ssl_labs_scanned_at = scan.scanned_at
+        expiries = [e for e in (snapshot.ssl_expiry, snapshot.ssl_labs_expiry) if e]
+        snapshot.cert_expiry = min(expiries, default=None)
+        snapshot.save()
+        return snapshot
 
 
 class PSIService:
     BASE_URL = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+    STRATEGIES = ("mobile", "desktop")
 
     @staticmethod
-    def get_user_api_key(user):
+    def get_user_api_key_obj(user):
         try:
             key_obj = UserAPIKey.objects.get(user=user, service="psi")
             if not key_obj.key:
                 raise Exception(
                     "No Google PSI API key set for your account. Please add it in Settings."
                 )
-            return key_obj.key
+            return key_obj
         except UserAPIKey.DoesNotExist:
             raise Exception(
                 "No Google PSI API key set for your account. Please add it in Settings."
             )
 
     @classmethod
-    def fetch_report(cls, url, user, strategy="mobile"):
+    def get_user_api_key(cls, user):
+        return cls.get_user_api_key_obj(user).key
+
+    @classmethod
+    def fetch_report(cls, url, user, strategy="mobile", key_obj=None, timeout=None):
         """
         Fetch PageSpeed Insights report for a given URL and strategy (mobile/desktop)
+
+        The body is streamed: only the fields ingestion needs are decoded, and
+        the compressed raw body is kept for payload storage. The caller takes
+        the quota token and records the outcome (see fetch_strategies), so this
+        can run in a worker thread without touching the quota cache.
         """
-        api_key = cls.get_user_api_key(user)
+        if key_obj is None:
+            key_obj = cls.get_user_api_key_obj(user)
+        if timeout is None:
+            timeout = settings.PSI_REQUEST_TIMEOUT
         params = {
             "url": url,
-            "key": api_key,
+            "key": key_obj.key,
             "strategy": strategy,
             "category": ["performance", "accessibility", "best-practices", "seo"],
         }
 
         try:
-            response = requests.get(cls.BASE_URL, params=params)
+            response = http_client.get(
+                cls.BASE_URL,
+                params=params,
+                timeout=(settings.HTTP_CONNECT_TIMEOUT, timeout),
+                stream=True,
+            )
+            quota.record_usage(key_obj)
             response.raise_for_status()
-            return response.json()
+            return StreamedBody.from_response(response, PSI_FIELDS)
+        except ijson.JSONError as e:
+            raise Exception(f"Invalid response from Google API ({strategy}): {e}")
+        except requests.exceptions.Timeout:
+            raise Exception(
+                f"Google API did not respond within {timeout} seconds ({strategy}). Please try again later."
+            )
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
-                raise Exception(
+                raise quota.Throttled(
                     "Google API quota exceeded. Please try again later or check your API usage in the Google Cloud Console."
                 )
             elif e.response.status_code == 400:
@@ -76,100 +380,309 @@ class PSIService:
             raise Exception(f"Network error while fetching PSI report: {str(e)}")
 
     @classmethod
-    def fetch_and_store_report_group(cls, url, user):
+    def fetch_strategies(cls, url, user, timeout=None):
+        """
+        Fetch the mobile and desktop reports in parallel.
+
+        Returns a dict mapping strategy to its StreamedBody. Raises if either
+        fetch fails, naming every strategy that failed.
+        """
+        key_obj = cls.get_user_api_key_obj(user)
+        # Quota bookkeeping stays in this thread: the quota cache may be the
+        # database, and the workers must not open connections of their own
+        acquired = 0
+        try:
+            for _ in cls.STRATEGIES:
+                quota.acquire(key_obj)
+                acquired += 1
+        except quota.QuotaExceeded:
+            for _ in range(acquired):
+                quota.release(key_obj)
+            raise
+        with ThreadPoolExecutor(max_workers=len(cls.STRATEGIES)) as executor:
+            futures = {
+                strategy: executor.submit(
+                    cls.fetch_report, url, user, strategy, key_obj, timeout
+                )
+                for strategy in cls.STRATEGIES
+            }
+        quota.flush_usage()
+        results = {}
+        errors = []
+        for strategy, future in futures.items():
+            try:
+                results[strategy] = future.result()
+            except Exception as e:
+                if isinstance(e, quota.Throttled):
+                    quota.throttled(key_obj)
+                errors.append(f"{strategy}: {e}")
+            else:
+                quota.succeeded(key_obj)
+        if errors:
+            raise Exception("PSI fetch failed, nothing was stored. " + " ".join(errors))
+        return results
+
+    @classmethod
+    def get_fresh_report_group(cls, url, user, max_age):
+        """
+        Return the newest complete (mobile and desktop) report group for the
+        page fetched within the last ``max_age`` seconds, or None.
+        """
+        if not max_age or max_age <= 0:
+            return None
+        cutoff = timezone.now() - timedelta(seconds=max_age)
+        group = (
+            PSIReportGroup.objects.filter(
+                page__url=url, page__user=user, user=user, fetch_time__gte=cutoff
+            )
+            .annotate(
+                strategies=Count(
+                    "reports__strategy",
+                    filter=Q(reports__strategy__in=cls.STRATEGIES),
+                    distinct=True,
+                )
+            )
+            .filter(strategies=len(cls.STRATEGIES))
+            .order_by("-fetch_time")
+            .first()
+        )
+        if group is None:
+            return None
+        reports = {r.strategy: r for r in group.reports.all()}
+        return group, reports["mobile"], reports["desktop"]
+
+    @classmethod
+    def fetch_and_store_report_group(cls, url, user, timeout=None, max_age=None):
         """
         Fetch both mobile and desktop PSI reports, create a group, and store all relevant data.
+
+        Both strategies are fetched concurrently; the group is only stored when
+        both succeed. If a complete group for the page was fetched within
+        ``max_age`` seconds (default PSI_FRESHNESS_WINDOW, 0 disables), it is
+        returned instead of calling Google. ``group.from_cache`` tells which
+        happened.
         """
-        fetch_time = timezone.now()
-        # Get or create Page
-        page, _ = Page.objects.get_or_create(url=url, user=user)
-        # Create group
-        group = PSIReportGroup.objects.create(
-            page=page, fetch_time=fetch_time, user=user
+        if max_age is None:
+            max_age = settings.PSI_FRESHNESS_WINDOW
+        fresh = cls.get_fresh_report_group(url, user, max_age)
+        if fresh:
+            fresh[0].from_cache = True
+            return fresh
+        results = cls.fetch_strategies(url, user, timeout=timeout)
+        group, mobile_report, desktop_report = cls.store_report_group(
+            url, user, results
         )
-        # Fetch and store mobile
-        mobile_data = cls.fetch_report(url, user, "mobile")
-        mobile_report = PSIReport.objects.create(
-            group=group,
-            page=page,
-            fetch_time=fetch_time,
-            strategy="mobile",
-            raw_json=mobile_data,
-            user=user,
+        group.from_cache = False
+        return group, mobile_report, desktop_report
+
+    @staticmethod
+    def parse_report(data):
+        """
+        Extract the field metrics, lab metrics, category scores and audits from a
+        PSI response into plain dicts of model field values.
+        """
+        # --- Field Metrics ---
+        field = data.get("loadingExperience", {})
+        metrics = field.get("metrics", {})
+        field_metrics = {
+            "fcp_ms": metrics.get("FIRST_CONTENTFUL_PAINT_MS", {}).get("percentile"),
+            "lcp_ms": metrics.get("LARGEST_CONTENTFUL_PAINT_MS", {}).get("percentile"),
+            "fid_ms": metrics.get("FIRST_INPUT_DELAY_MS", {}).get("percentile"),
+            "inp_ms": metrics.get("INTERACTION_TO_NEXT_PAINT", {}).get("percentile"),
+            "cls": metrics.get("CUMULATIVE_LAYOUT_SHIFT_SCORE", {}).get("percentile"),
+            "ttfb_ms": metrics.get("EXPERIMENTAL_TIME_TO_FIRST_BYTE", {}).get(
+                "percentile"
+            ),
+            "overall_category": field.get("overall_category"),
+            "has_data": bool(metrics),
+        }
+        # --- Lab Metrics ---
+        lhr = data.get("lighthouseResult", {})
+        audits = lhr.get("audits", {})
+        categories = lhr.get("categories", {})
+        lab_metrics = {
+            "fcp_s": audits.get("first-contentful-paint", {}).get("numericValue"),
+            "lcp_s": audits.get("largest-contentful-paint", {}).get("numericValue"),
+            "speed_index_s": audits.get("speed-index", {}).get("numericValue"),
+            "tti_s": audits.get("interactive", {}).get("numericValue"),
+            "tbt_ms": audits.get("total-blocking-time", {}).get("numericValue"),
+            "cls": audits.get("cumulative-layout-shift", {}).get("numericValue"),
+            "performance_score": categories.get("performance", {}).get("score"),
+        }
+        # --- Category Scores ---
+        category_scores = {
+            "performance": categories.get("performance", {}).get("score"),
+            "accessibility": categories.get("accessibility", {}).get("score"),
+            "best_practices": categories.get("best-practices", {}).get("score"),
+            "seo": categories.get("seo", {}).get("score"),
+        }
+        # --- Audits ---
+        audit_rows = []
+        definitions = {}
+        for cat_key, cat in categories.items():
+            for ref in cat.get("auditRefs", []):
+                audit_key = ref.get("id")
+                audit = audits.get(audit_key, {})
+                definitions[audit_key] = {
+                    "description": audit.get("description", ""),
+                }
+                audit_rows.append(
+                    {
+                        "category": cat_key,
+                        "audit_key": audit_key,
+                        "title": audit.get("title", ""),
+                        "score": audit.get("score"),
+                        "score_display_mode": audit.get("scoreDisplayMode"),
+                        "display_value": audit.get("displayValue"),
+                        "details": audit.get("details"),
+                    }
+                )
+        return {
+            "lighthouse_version": lhr.get("lighthouseVersion", ""),
+            "field_metrics": field_metrics,
+            "lab_metrics": lab_metrics,
+            "category_scores": category_scores,
+            "audit_definitions": definitions,
+            "audits": audit_rows,
+        }
+
+    @classmethod
+    def store_report_group(cls, url, user, results, fetch_time=None):
+        """
+        Parse the mobile and desktop responses and write the group, reports,
+        metrics and audits in a single transaction using bulk inserts.
+
+        ``results`` maps strategy to a StreamedBody or an already-decoded dict.
+        """
+        bodies = {
+            strategy: (
+                result
+                if isinstance(result, StreamedBody)
+                else StreamedBody.from_dict(result)
+            )
+            for strategy, result in results.items()
+        }
+        parsed = {
+            strategy: cls.parse_report(bodies[strategy].data) for strategy in bodies
+        }
+        # Content-address audit details so identical blobs are stored once
+        blobs = {}
+        for s in cls.STRATEGIES:
+            for row in parsed[s]["audits"]:
+                details = row.pop("details")
+                if details is not None:
+                    digest = AuditDetails.digest_for(details)
+                    row["details_blob_id"] = digest
+                    blobs.setdefault(digest, details)
+        fetch_time = fetch_time or timezone.now()
+        with transaction.atomic():
+            # Get or create Page
+            page, _ = Page.objects.get_or_create(url=url, user=user)
+            # Create group
+            group = PSIReportGroup.objects.create(
+                page=page, fetch_time=fetch_time, user=user
+            )
+            reports = {
+                strategy: PSIReport.objects.create(
+                    group=group,
+                    page=page,
+                    fetch_time=fetch_time,
+                    strategy=strategy,
+                    user=user,
+                )
+                for strategy in cls.STRATEGIES
+            }
+            PSIReportPayload.objects.bulk_create(
+                PSIReportPayload.from_compressed(
+                    bodies[s].compressed, bodies[s].size, psi_report=reports[s]
+                )
+                for s in cls.STRATEGIES
+            )
+            FieldMetrics.objects.bulk_create(
+                FieldMetrics(psi_report=reports[s], **parsed[s]["field_metrics"])
+                for s in cls.STRATEGIES
+            )
+            LabMetrics.objects.bulk_create(
+                LabMetrics(psi_report=reports[s], **parsed[s]["lab_metrics"])
+                for s in cls.STRATEGIES
+            )
+            CategoryScores.objects.bulk_create(
+                CategoryScores(psi_report=reports[s], **parsed[s]["category_scores"])
+                for s in cls.STRATEGIES
+            )
+            LinkSnapshotService.record_psi(
+                user,
+                url,
+                fetch_time,
+                {s: parsed[s]["category_scores"] for s in cls.STRATEGIES},
+            )
+            for s in cls.STRATEGIES:
+                PSIRollupService.record(
+                    page,
+                    s,
+                    fetch_time,
+                    PSIRollupService.report_values(
+                        parsed[s]["category_scores"], parsed[s]["field_metrics"]
+                    ),
+                )
+            cls.store_audit_details(blobs)
+            definition_ids = {
+                s: AuditCatalog.resolve(
+                    parsed[s]["lighthouse_version"], parsed[s]["audit_definitions"]
+                )
+                for s in cls.STRATEGIES
+            }
+            Audit.objects.bulk_create(
+                (
+                    Audit(
+                        psi_report=reports[s],
+                        definition_id=definition_ids[s][row["audit_key"]],
+                        **row,
+                    )
+                    for s in cls.STRATEGIES
+                    for row in parsed[s]["audits"]
+                ),
+                batch_size=500,
+            )
+        return group, reports["mobile"], reports["desktop"]
+
+    @staticmethod
+    def store_audit_details(blobs):
+        """
+        Store audit details blobs ({digest: data}) that are not already stored.
+        Identical details from earlier runs or the other strategy cost nothing.
+        """
+        if not blobs:
+            return
+        existing = set(
+            AuditDetails.objects.filter(digest__in=blobs).values_list(
+                "digest", flat=True
+            )
         )
-        # Fetch and store desktop
-        desktop_data = cls.fetch_report(url, user, "desktop")
-        desktop_report = PSIReport.objects.create(
-            group=group,
-            page=page,
-            fetch_time=fetch_time,
-            strategy="desktop",
-            raw_json=desktop_data,
-            user=user,
+        AuditDetails.objects.bulk_create(
+            [
+                AuditDetails(digest=digest, data=data)
+                for digest, data in blobs.items()
+                if digest not in existing
+            ],
+            ignore_conflicts=True,
         )
-        # Store metrics and audits for both
-        for psi_report, data in [
-            (mobile_report, mobile_data),
-            (desktop_report, desktop_data),
-        ]:
-            # --- Field Metrics ---
-            field = data.get("loadingExperience", {})
-            metrics = field.get("metrics", {})
-            has_data = bool(metrics)
-            FieldMetrics.objects.create(
-                psi_report=psi_report,
-                fcp_ms=metrics.get("FIRST_CONTENTFUL_PAINT_MS", {}).get("percentile"),
-                lcp_ms=metrics.get("LARGEST_CONTENTFUL_PAINT_MS", {}).get("percentile"),
-                fid_ms=metrics.get("FIRST_INPUT_DELAY_MS", {}).get("percentile"),
-                inp_ms=metrics.get("INTERACTION_TO_NEXT_PAINT", {}).get("percentile"),
-                cls=metrics.get("CUMULATIVE_LAYOUT_SHIFT_SCORE", {}).get("percentile"),
-                ttfb_ms=metrics.get("EXPERIMENTAL_TIME_TO_FIRST_BYTE", {}).get(
-                    "percentile"
-                ),
-                overall_category=field.get("overall_category"),
-                has_data=has_data,
-            )
-            # --- Lab Metrics ---
-            lhr = data.get("lighthouseResult", {})
-            audits = lhr.get("audits", {})
-            LabMetrics.objects.create(
-                psi_report=psi_report,
-                fcp_s=audits.get("first-contentful-paint", {}).get("numericValue"),
-                lcp_s=audits.get("largest-contentful-paint", {}).get("numericValue"),
-                speed_index_s=audits.get("speed-index", {}).get("numericValue"),
-                tti_s=audits.get("interactive", {}).get("numericValue"),
-                tbt_ms=audits.get("total-blocking-time", {}).get("numericValue"),
-                cls=audits.get("cumulative-layout-shift", {}).get("numericValue"),
-                performance_score=lhr.get("categories", {})
-                .get("performance", {})
-                .get("score"),
-            )
-            # --- Category Scores ---
-            categories = lhr.get("categories", {})
-            CategoryScores.objects.create(
-                psi_report=psi_report,
-                performance=categories.get("performance", {}).get("score"),
-                accessibility=categories.get("accessibility", {}).get("score"),
-                best_practices=categories.get("best-practices", {}).get("score"),
-                seo=categories.get("seo", {}).get("score"),
-            )
-            # --- Audits ---
-            for cat_key, cat in categories.items():
-                for ref in cat.get("auditRefs", []):
-                    audit_key = ref.get("id")
-                    audit = audits.get(audit_key, {})
-                    Audit.objects.create(
-                        psi_report=psi_report,
-                        category=cat_key,
-                        audit_key=audit_key,
-                        title=audit.get("title", ""),
-                        description=audit.get("description", ""),
-                        score=audit.get("score"),
-                        score_display_mode=audit.get("scoreDisplayMode"),
-                        display_value=audit.get("displayValue"),
-                        details=audit.get("details"),
-                    )
-        return group, mobile_report, desktop_report
+
+    @staticmethod
+    def prune_audit_details(digests=None):
+        """
+        Delete details blobs no audit references any more, e.g. after reports
+        were deleted; ``digests`` limits the check to those blobs. Blobs an
+        ingest starts using meanwhile are kept. Returns the number deleted.
+        """
+        orphans = AuditDetails.objects.filter(audits__isnull=True)
+        if digests is not None:
+            orphans = orphans.filter(digest__in=list(digests))
+        try:
+            deleted, _ = orphans.delete()
+        except ProtectedError:
+            return 0
+        return deleted
 
     @classmethod
     def fetch_both_reports(cls, url, user):
@@ -177,47 +690,230 @@ class PSIService:
         Fetch both mobile and desktop reports for a URL
         """
         try:
-            mobile_report = cls.fetch_report(url, user, "mobile")
-            desktop_report = cls.fetch_report(url, user, "desktop")
-            return mobile_report, desktop_report
+            results = cls.fetch_strategies(url, user)
+            return results["mobile"].data, results["desktop"].data
         except Exception as e:
             raise Exception(f"Error fetching reports: {str(e)}")
 
 
+class PSIRollupService:
+    """Maintain PSIDailyRollup rows and read trend statistics from them."""
+
+    SCORE_FIELDS = ("performance", "accessibility", "best_practices", "seo")
+    # Chart point key -> rollup metric
+    POINT_METRICS = (
+        ("performance", "performance"),
+        ("accessibility", "accessibility"),
+        ("best_practices", "best_practices"),
+        ("seo", "seo"),
+        ("fcp", "fcp_ms"),
+        ("lcp", "lcp_ms"),
+        ("cls", "cls"),
+        ("ttfb", "ttfb_ms"),
+    )
+    GRANULARITIES = ("day", "week", "month")
+
+    @staticmethod
+    def report_values(category_scores, field_metrics):
+        """Rollup metric values from parsed ``category_scores``/``field_metrics``."""
+        values = dict(category_scores)
+        values.update(
+            {m: field_metrics.get(m) for m in ("fcp_ms", "lcp_ms", "cls", "ttfb_ms")}
+        )
+        return values
+
+    @staticmethod
+    def record(page, strategy, fetch_time, values):
+        """Add one report to its day's rollup row. Call inside a transaction."""
+        rollup, _ = PSIDailyRollup.objects.select_for_update().get_or_create(
+            page=page, strategy=strategy, day=timezone.localdate(fetch_time)
+        )
+        rollup.add(fetch_time, values)
+        rollup.save()
+
+    @classmethod
+    def rebuild(cls, page, fetch_times):
+        """
+        Recompute a page's rollups for the days containing ``fetch_times`` from
+        the stored reports, e.g. after reports were deleted.
+        """
+        days = {timezone.localdate(t) for t in fetch_times if t}
+        if page is None or not days:
+            return
+        columns = [f"category_scores__{f}" for f in cls.SCORE_FIELDS]
+        columns += [
+            f"field_metrics__{m}" for m in ("fcp_ms", "lcp_ms", "cls", "ttfb_ms")
+        ]
+        with transaction.atomic():
+            PSIDailyRollup.objects.filter(page=page, day__in=days).delete()
+            rows = (
+                PSIReport.objects.filter(
+                    page=page,
+                    strategy__isnull=False,
+                    fetch_time__date__gte=min(days),
+                    fetch_time__date__lte=max(days),
+                )
+                .order_by("fetch_time")
+                .values("fetch_time", "strategy", *columns)
+            )
+            rollups = {}
+            for row in rows:
+                day = timezone.localdate(row["fetch_time"])
+                if day not in days:
+                    continue
+                key = (row["strategy"], day)
+                if key not in rollups:
+                    rollups[key] = PSIDailyRollup(
+                        page=page, strategy=row["strategy"], day=day
+                    )
+                values = {column.split("__", 1)[1]: row[column] for column in columns}
+                rollups[key].add(row["fetch_time"], values)
+            PSIDailyRollup.objects.bulk_create(rollups.values())
+
+    @classmethod
+    def window_stats(cls, page, start, end, granularity="day"):
+        """
+        Avg/min/max category scores and per-day, -week or -month average points
+        for both strategies between the ``start`` and ``end`` dates (inclusive).
+        Runs two queries over at most one row per strategy and day.
+        """
+        empty = {field: None for field in cls.SCORE_FIELDS}
+        stats = {
+            strategy: {
+                "avg": dict(empty),
+                "min": dict(empty),
+                "max": dict(empty),
+                "points": [],
+            }
+            for strategy in PSIService.STRATEGIES
+        }
+        totals = {}
+        for field in cls.SCORE_FIELDS:
+            totals[f"{field}_n"] = Sum(f"{field}_n")
+            totals[f"{field}_sum"] = Sum(f"{field}_sum")
+            totals[f"{field}_min"] = Min(f"{field}_min")
+            totals[f"{field}_max"] = Max(f"{field}_max")
+        rollups = cls.rollups(page, start, end)
+        for row in rollups.values("strategy").annotate(**totals):
+            entry = stats.get(row["strategy"])
+            if entry is None:
+                continue
+            for field in cls.SCORE_FIELDS:
+                entry["avg"][field] = cls._average(row, field)
+                entry["min"][field] = row[f"{field}_min"]
+                entry["max"][field] = row[f"{field}_max"]
+
+        points = cls.points(page, start, end, granularity)
+        for strategy, entry in stats.items():
+            entry["points"] = points[strategy]
+        return stats
+
+    @staticmethod
+    def rollups(page, start=None, end=None):
+        """A page's rollup rows, optionally limited to a range of days."""
+        rollups = PSIDailyRollup.objects.filter(page=page).order_by()
+        if start:
+            rollups = rollups.filter(day__gte=start)
+        if end:
+            rollups = rollups.filter(day__lte=end)
+        return rollups
+
+    @classmethod
+    def points(cls, page, start=None, end=None, granularity="day"):
+        """Per-day, -week or -month average points of each strategy (one query)."""
+        buckets = {
+            "day": F("day"),
+            "week": TruncWeek("day"),
+            "month": TruncMonth("day"),
+        }
+        sums = {"reports": Sum("count")}
+        for _, metric in cls.POINT_METRICS:
+            sums[f"{metric}_n"] = Sum(f"{metric}_n")
+            sums[f"{metric}_sum"] = Sum(f"{metric}_sum")
+        rows = (
+            cls.rollups(page, start, end)
+            .annotate(bucket=buckets[granularity])
+            .values("bucket", "strategy")
+            .annotate(**sums)
+            .order_by("bucket")
+        )
+        points = {strategy: [] for strategy in PSIService.STRATEGIES}
+        for row in rows:
+            if row["strategy"] not in points:
+                continue
+            point = {"date": row["bucket"].strftime("%Y-%m-%d")}
+            for key, metric in cls.POINT_METRICS:
+                point[key] = cls._average(row, metric)
+            point["strategy"] = row["strategy"]
+            point["count"] = row["reports"]
+            points[row["strategy"]].append(point)
+        return points
+
+    @staticmethod
+    def _average(row, metric):
+        n = row[f"{metric}_n"]
+        return row[f"{metric}_sum"] / n if n else None
+
+
 class UptimeRobotService:
     BASE_URL = "https://api.uptimerobot.com/v2/"
+    # getMonitors returns at most 50 monitors per call
+    MONITORS_PER_CALL = 50
 
     @staticmethod
-    def get_user_api_key(user):
+    def get_user_api_key_obj(user):
         try:
             key_obj = UserAPIKey.objects.get(user=user, service="uptimerobot")
             if not key_obj.key:
                 raise Exception(
                     "No UptimeRobot API key set for your account. Please add it in Settings."
                 )
-            return key_obj.key
+            return key_obj
         except UserAPIKey.DoesNotExist:
             raise Exception(
                 "No UptimeRobot API key set for your account. Please add it in Settings."
             )
 
+    @classmethod
+    def get_user_api_key(cls, user):
+        return cls.get_user_api_key_obj(user).key
+
+    @classmethod
+    def call(cls, key_obj, method, payload, idempotent=False):
+        """
+        POST an API method on behalf of the key, honouring its quota, and
+        return the decoded response.
+        """
+        quota.acquire(key_obj)
+        response = http_client.post(
+            cls.BASE_URL + method,
+            data={"api_key": key_obj.key, **payload},
+            idempotent=idempotent,
+        )
+        quota.record_usage(key_obj)
+        quota.flush_usage()
+        if response.status_code == 429:
+            quota.throttled(key_obj)
+            raise Exception(
+                "UptimeRobot rate limit reached. Please try again in a minute."
+            )
+        quota.succeeded(key_obj)
+        return response.json()
+
     @classmethod
     def ensure_monitor(cls, link, user):
         """
         Ensure a monitor exists for the given link. If not, create it and store the monitor ID.
         """
-        api_key = cls.get_user_api_key(user)
+        key_obj = cls.get_user_api_key_obj(user)
         if link.uptime_monitor_id:
             return link.uptime_monitor_id
-        url = cls.BASE_URL + "newMonitor"
         payload = {
-            "api_key": api_key,
             "type": 1,  # HTTP(s) monitor
             "url": link.url,
             "friendly_name": link.title,
         }
-        response = requests.post(url, data=payload)
-        data = response.json()
+        data = cls.call(key_obj, "newMonitor", payload)
         if data.get("stat") == "ok":
             monitor_id = str(data["monitor"]["id"])
             link.uptime_monitor_id = monitor_id
@@ -227,15 +923,21 @@ class UptimeRobotService:
             raise Exception(f"Failed to create monitor: {data}")
 
     @classmethod
-    def get_monitor_status(cls, link, user):
+    def get_monitor_status(cls, link, user, **options):
         """
         Fetch the current status for the monitor associated with the link, requesting all possible fields.
+        ``options`` are extra getMonitors parameters, such as the start dates
+        sync_history sends. Log events and response times in the response are
+        stored locally. Links with a ``probe_interval`` are checked by the
+        local probe engine and have no UptimeRobot monitor.
         """
-        api_key = cls.get_user_api_key(user)
+        if link.probe_interval:
+            raise Exception(
+                "This link is checked by the local probe engine, not UptimeRobot."
+            )
+        key_obj = cls.get_user_api_key_obj(user)
         monitor_id = cls.ensure_monitor(link, user)
-        url = cls.BASE_URL + "getMonitors"
         payload = {
-            "api_key": api_key,
             "monitors": monitor_id,
             "format": "json",
             "logs": 1,
@@ -247,19 +949,128 @@ class UptimeRobotService:
             "all_time_uptime_ratio": 1,
             "maintenance_windows": 1,
             # Add more fields if supported by the API
+            **options,
         }
-        response = requests.post(url, data=payload)
-        data = response.json()
+        # getMonitors is read-only, so it is safe to retry despite being a POST
+        data = cls.call(key_obj, "getMonitors", payload, idempotent=True)
         if data.get("stat") == "ok" and data.get("monitors"):
             monitor = data["monitors"][0]
             # Update link with latest status
             link.uptime_last_status = str(monitor.get("status"))
             link.uptime_last_checked = timezone.now()
             link.save(update_fields=["uptime_last_status", "uptime_last_checked"])
+            LinkSnapshotService.record_uptime([link])
+            UptimeLogService.store(link, monitor)
             return monitor
         else:
             raise Exception(f"Failed to fetch monitor status: {data}")
 
+    @classmethod
+    def sync_history(cls, link, user, force=False):
+        """
+        Fetch only the log events and response times newer than the latest
+        ones stored for the link. The latest log itself is fetched again, so
+        the growing duration of the ongoing event is refreshed. Links synced
+        less than UPTIME_SYNC_INTERVAL seconds ago are skipped unless
+        ``force``, and links with a ``probe_interval`` always are: their
+        history comes from the local probe engine. Returns whether a sync ran.
+        """
+        if link.probe_interval:
+            return False
+        now = timezone.now()
+        if (
+            not force
+            and link.uptime_synced_at
+            and now - link.uptime_synced_at
+            < timedelta(seconds=settings.UPTIME_SYNC_INTERVAL)
+        ):
+            return False
+        end = int(now.timestamp())
+        options = {}
+        last_log = link.uptime_logs.aggregate(last=Max("datetime"))["last"]
+        if last_log:
+            options["logs_start_date"] = int(last_log.timestamp())
+            options["logs_end_date"] = end
+        # Response times can be requested for at most 7 days at a time
+        start = now - timedelta(days=7)
+        last_sample = UptimeLogService.last_response_time(link)
+        if last_sample:
+            start = max(start, last_sample + timedelta(seconds=1))
+        options["response_times_start_date"] = int(start.timestamp())
+        options["response_times_end_date"] = end
+        cls.get_monitor_status(link, user, **options)
+        link.uptime_synced_at = now
+        Link.objects.filter(pk=link.pk).update(uptime_synced_at=now)
+        return True
+
+    @classmethod
+    def refresh_statuses(cls, user, links):
+        """
+        Refresh ``uptime_last_status`` for many links with as few getMonitors
+        calls as possible: monitor IDs are sent dash-separated, MONITORS_PER_CALL
+        at a time, without logs or response times. Links in a successful
+        response get its status, or "error" when their monitor is missing from
+        it. Links whose call failed (or that have no key or monitor) keep their
+        previous status and check time; only links never checked are marked
+        "error". All links are saved with one bulk_update. Links with a
+        ``probe_interval`` are left to the local probe engine.
+        """
+        links = list(links)
+        # Links checked by the local probe engine keep the status it wrote
+        remote = [link for link in links if not link.probe_interval]
+        if not remote:
+            return links
+        now = timezone.now()
+        try:
+            key_obj = cls.get_user_api_key_obj(user)
+        except Exception:
+            key_obj = None
+        by_monitor = {}
+        for link in remote:
+            if key_obj is None:
+                continue
+            try:
+                monitor_id = cls.ensure_monitor(link, user)
+            except Exception:
+                continue
+            by_monitor.setdefault(str(monitor_id), []).append(link)
+        checked = []
+        monitor_ids = list(by_monitor)
+        for i in range(0, len(monitor_ids), cls.MONITORS_PER_CALL):
+            chunk = monitor_ids[i : i + cls.MONITORS_PER_CALL]
+            payload = {
+                "monitors": "-".join(chunk),
+                "format": "json",
+                "limit": len(chunk),
+            }
+            try:
+                data = cls.call(key_obj, "getMonitors", payload, idempotent=True)
+            except Exception:
+                continue
+            if data.get("stat") != "ok":
+                continue
+            statuses = {
+                str(monitor.get("id")): str(monitor.get("status"))
+                for monitor in data.get("monitors", [])
+            }
+            for monitor_id in chunk:
+                for link in by_monitor[monitor_id]:
+                    link.uptime_last_status = statuses.get(monitor_id, "error")
+                    link.uptime_last_checked = now
+                    checked.append(link)
+        changed = list(checked)
+        seen = {link.id for link in checked}
+        for link in remote:
+            if link.id not in seen and link.uptime_last_status is None:
+                link.uptime_last_status = "error"
+                changed.append(link)
+        if changed:
+            Link.objects.bulk_update(
+                changed, ["uptime_last_status", "uptime_last_checked"]
+            )
+            LinkSnapshotService.record_uptime(changed)
+        return links
+
     @classmethod
     def get_monitor_details(cls, link, user):
         """
@@ -268,117 +1079,370 @@ class UptimeRobotService:
         return cls.get_monitor_status(link, user)
 
 
+class UptimeLogService:
+    """Local copies of UptimeRobot log events and response time samples."""
+
+    @staticmethod
+    def parse_time(value):
+        """
+        Timestamp of an UptimeRobot log or response time entry, which the API
+        gives as Unix seconds (older code paths stored ISO strings).
+        """
+        if value in (None, ""):
+            return None
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+        parsed = datetime.fromisoformat(str(value))
+        return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+    @classmethod
+    def store(cls, link, monitor):
+        """
+        Upsert the ``logs`` and ``response_times`` of a getMonitors monitor.
+        A log already stored only has its duration and reason refreshed, since
+        the duration of the current event keeps growing.
+        """
+        logs = {}
+        for entry in monitor.get("logs") or []:
+            moment = cls.parse_time(entry.get("datetime"))
+            if moment is None or entry.get("type") is None:
+                continue
+            reason = entry.get("reason") or {}
+            logs[(moment, int(entry["type"]))] = UptimeLog(
+                link=link,
+                datetime=moment,
+                type=int(entry["type"]),
+                duration=entry.get("duration"),
+                reason_code=str(reason.get("code") or "")[:32],
+                reason_detail=str(reason.get("detail") or "")[:255],
+            )
+        if logs:
+            UptimeLog.objects.bulk_create(
+                logs.values(),
+                update_conflicts=True,
+                unique_fields=["link", "datetime", "type"],
+                update_fields=["duration", "reason_code", "reason_detail"],
+            )
+        samples = {}
+        for entry in monitor.get("response_times") or []:
+            moment = cls.parse_time(entry.get("datetime"))
+            if moment is not None and entry.get("value") is not None:
+                samples[timeseries.epoch(moment)] = int(entry["value"])
+        if samples:
+            cls.store_response_times(link, list(samples), list(samples.values()))
+
+    @classmethod
+    def store_response_times(cls, link, times, values):
+        """Merge samples (Unix seconds, milliseconds) into the link's day chunks."""
+        cls.store_samples({link.id: (times, values)})
+
+    @staticmethod
+    def store_samples(samples):
+        """
+        Merge the samples of many links, ``{link_id: (times, values)}``, into
+        their day chunks with one read and one bulk write of each kind.
+        """
+        by_link = {
+            link_id: timeseries.split_by_day(times, values)
+            for link_id, (times, values) in samples.items()
+            if len(times)
+        }
+        days = {day for by_day in by_link.values() for day in by_day}
+        if not days:
+            return
+        with transaction.atomic():
+            chunks = {
+                (chunk.link_id, chunk.day): chunk
+                for chunk in UptimeResponseChunk.objects.select_for_update().filter(
+                    link_id__in=list(by_link), day__gte=min(days), day__lte=max(days)
+                )
+            }
+            new = []
+            updated = []
+            now = timezone.now()
+            for link_id, by_day in by_link.items():
+                for day, (offsets, day_values) in by_day.items():
+                    chunk = chunks.get((link_id, day))
+                    if chunk is None:
+                        chunk = UptimeResponseChunk(link_id=link_id, day=day)
+                        new.append(timeseries.merge(chunk, offsets, day_values))
+                    else:
+                        timeseries.merge(chunk, offsets, day_values)
+                        chunk.updated_at = now
+                        updated.append(chunk)
+            UptimeResponseChunk.objects.bulk_create(new)
+            UptimeResponseChunk.objects.bulk_update(
+                updated,
+                [
+                    "offsets",
+                    "values",
+                    "count",
+                    "min_value",
+                    "max_value",
+                    "total",
+                    "updated_at",
+                ],
+            )
+
+    @staticmethod
+    def last_response_time(link):
+        chunk = link.uptime_response_chunks.order_by("-day").first()
+        if chunk is None or not chunk.count:
+            return None
+        offset = int(timeseries.unpack(chunk.offsets)[-1])
+        return datetime.fromtimestamp(
+            timeseries.day_start(chunk.day) + offset, tz=dt_timezone.utc
+        )
+
+    @staticmethod
+    def log_events(link, start=None, end=None):
+        """
+        Times (Unix seconds) and types of the link's log events between the
+        aware datetimes ``start`` and ``end`` (exclusive) as NumPy arrays,
+        oldest first.
+        """
+        logs = link.uptime_logs.order_by("datetime")
+        if start:
+            logs = logs.filter(datetime__gte=start)
+        if end:
+            logs = logs.filter(datetime__lt=end)
+        rows = list(logs.values_list("datetime", "type"))
+        times = np.fromiter(
+            (timeseries.epoch(moment) for moment, _ in rows), np.int64, len(rows)
+        )
+        types = np.fromiter((log_type for _, log_type in rows), np.int16, len(rows))
+        return times, types
+
+    @staticmethod
+    def response_times(link, start=None, end=None):
+        """
+        The link's response times between the aware datetimes ``start`` and
+        ``end`` (exclusive) as NumPy arrays of Unix seconds and milliseconds.
+        """
+        chunks = link.uptime_response_chunks.all()
+        if start:
+            chunks = chunks.filter(day__gte=start.astimezone(dt_timezone.utc).date())
+        if end:
+            chunks = chunks.filter(day__lte=end.astimezone(dt_timezone.utc).date())
+        return timeseries.decode(
+            chunks,
+            timeseries.epoch(start) if start else None,
+            timeseries.epoch(end) if end else None,
+        )
+
+
+class UptimeProbeService:
+    """Store results of the local probe engine (links/probe.py) in batches."""
+
+    # UptimeRobot monitor statuses, so the dashboard shows probes the same way
+    STATUS_UP = "2"
+    STATUS_DOWN = "9"
+
+    @classmethod
+    def store_results(cls, results):
+        """
+        Write a batch of ProbeResults: response times of successful checks go
+        into the day chunks, and state changes become UptimeLog events. Each
+        link's latest result is saved as its uptime status; only links whose
+        status changed update their snapshot (and the cached dashboard).
+        """
+        if not results:
+            return
+        samples = {}
+        logs = []
+        latest = {}
+        for result in results:
+            if result.up and result.response_ms is not None:
+                times, values = samples.setdefault(result.link_id, ([], []))
+                times.append(result.time)
+                values.append(result.response_ms)
+            if result.changed:
+                logs.append(
+                    UptimeLog(
+                        link_id=result.link_id,
+                        datetime=datetime.fromtimestamp(
+                            result.time, tz=dt_timezone.utc
+                        ),
+                        type=2 if result.up else 1,
+                        reason_code=str(result.status_code or ""),
+                        reason_detail=(result.error or "")[:255],
+                    )
+                )
+            previous = latest.get(result.link_id)
+            if previous is None or result.time >= previous.time:
+                latest[result.link_id] = result
+        UptimeLogService.store_samples(samples)
+        UptimeLog.objects.bulk_create(logs, ignore_conflicts=True)
+        links = list(
+            Link.objects.filter(id__in=list(latest)).only(
+                "id", "user_id", "uptime_last_status"
+            )
+        )
+        changed = []
+        for link in links:
+            result = latest[link.id]
+            status = cls.STATUS_UP if result.up else cls.STATUS_DOWN
+            if link.uptime_last_status != status:
+                changed.append(link)
+            link.uptime_last_status = status
+            link.uptime_last_checked = datetime.fromtimestamp(
+                result.time, tz=dt_timezone.utc
+            )
+        Link.objects.bulk_update(links, ["uptime_last_status", "uptime_last_checked"])
+        if changed:
+            LinkSnapshotService.record_uptime(changed)
+
+
 class SSLService:
+    PORT = 443
+    HANDSHAKE_TIMEOUT = 10
+
+    @classmethod
+    def endpoint(cls, url):
+        """The ``(hostname, port)`` whose certificate is checked for ``url``."""
+        parts = urlsplit(url if "//" in url else f"//{url}")
+        return parts.hostname, parts.port or cls.PORT
+
     @staticmethod
-    def check_certificate(link, user):
+    def fingerprint(der_cert):
+        """SHA-256 of a DER certificate, the key of its Certificate row."""
+        return hashlib.sha256(der_cert).hexdigest()
+
+    @staticmethod
+    def prune_certificates(ids=None):
         """
-        Perform a live SSL certificate inspection for the given link, extract all possible details, and store in SSLCheck.
+        Delete certificates no SSL check references any more, e.g. after links
+        were deleted; ``ids`` limits the check to those certificates. Returns
+        the number deleted.
         """
-        import idna
+        orphans = Certificate.objects.filter(checks__isnull=True)
+        if ids is not None:
+            orphans = orphans.filter(id__in=list(ids))
+        try:
+            deleted, _ = orphans.delete()
+        except ProtectedError:
+            return 0
+        return deleted
+
+    @classmethod
+    def parse_certificate(cls, der_cert):
+        """An unsaved Certificate parsed from its DER bytes."""
+        return Certificate(
+            fingerprint=cls.fingerprint(der_cert),
+            pem=ssl.DER_cert_to_PEM_cert(der_cert),
+            **certificates.parse(der_cert),
+        )
+
+    @classmethod
+    def certificates(cls, presented):
+        """
+        Return ``{fingerprint: Certificate}`` (without ``pem``) for the
+        ``{fingerprint: der_cert}`` certificates. Only fingerprints not stored
+        yet are parsed and inserted; malformed ones are left out.
+        """
+        known = {
+            certificate.fingerprint: certificate
+            for certificate in Certificate.objects.filter(
+                fingerprint__in=presented
+            ).defer("pem")
+        }
+        missing = []
+        for fingerprint, der_cert in presented.items():
+            if fingerprint not in known:
+                try:
+                    missing.append(cls.parse_certificate(der_cert))
+                except ValueError:
+                    pass  # left out of the result; the check records an error
+        if missing:
+            # Another worker may store the same certificate concurrently
+            Certificate.objects.bulk_create(
+                missing, batch_size=500, ignore_conflicts=True
+            )
+            known.update(
+                (certificate.fingerprint, certificate)
+                for certificate in Certificate.objects.filter(
+                    fingerprint__in=[c.fingerprint for c in missing]
+                ).defer("pem")
+            )
+        return known
 
-        url = link.url
-        hostname = url.split("//")[-1].split("/")[0].split(":")[0]
-        port = 443
+    @staticmethod
+    def build_check(link, user, certificate=None, chain_count=1, error=None):
+        """
+        An unsaved SSLCheck of ``certificate`` (with the ``error`` verifying it
+        gave, if any), or of the ``error`` alone when there is no certificate.
+        """
+        check = SSLCheck(user=user, link=link, checked_at=timezone.now())
+        if not certificate:
+            check.errors = error or "No certificate presented."
+            return check
+        check.certificate = certificate
+        check.errors = error or ""
+        check.chain_count = chain_count
         warnings = []
-        errors = []
-        cert = None
-        chain_count = 1
-        is_self_signed = False
-        is_expired = False
-        is_weak_signature = False
-        is_short_key = False
-        san = ""
-        ocsp_url = ""
-        crl_url = ""
-        raw_cert = ""
-        subject = ""
-        issuer = ""
-        serial_number = ""
-        version = None
-        not_before = None
-        not_after = None
-        signature_algorithm = ""
-        public_key_type = ""
-        public_key_bits = None
+        if certificate.not_after and certificate.not_after < check.checked_at:
+            check.is_expired = True
+            warnings.append("Certificate is expired.")
+        if certificate.is_weak_signature:
+            warnings.append(
+                f"Weak signature algorithm ({certificate.signature_algorithm})."
+            )
+        if certificate.is_short_key:
+            warnings.append(
+                f"Short {certificate.public_key_type} key "
+                f"({certificate.public_key_bits} bits)."
+            )
+        check.warnings = "; ".join(warnings)
+        return check
+
+    @classmethod
+    def check_certificate(cls, link, user):
+        """
+        Perform a live SSL certificate inspection for the given link, extract all possible details, and store in SSLCheck.
+        """
+        hostname, port = cls.endpoint(link.url)
         try:
-            ctx = ssl.create_default_context()
-            with socket.create_connection((hostname, port), timeout=10) as sock:
+            ctx = certificates.unverified_context()
+            with socket.create_connection(
+                (hostname, port), timeout=cls.HANDSHAKE_TIMEOUT
+            ) as sock:
                 with ctx.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    der_cert = ssock.getpeercert(binary_form=True)
-                    cert = ssl.DER_cert_to_PEM_cert(der_cert)
-                    x509 = ssl._ssl._test_decode_cert(cert)
-                    raw_cert = cert
-                    subject = str(x509.get("subject", ""))
-                    issuer = str(x509.get("issuer", ""))
-                    serial_number = str(x509.get("serialNumber", ""))
-                    version = x509.get("version")
-                    not_before = (
-                        datetime.strptime(x509["notBefore"], "%b %d %H:%M:%S %Y %Z")
-                        if "notBefore" in x509
-                        else None
-                    )
-                    not_after = (
-                        datetime.strptime(x509["notAfter"], "%b %d %H:%M:%S %Y %Z")
-                        if "notAfter" in x509
-                        else None
-                    )
-                    san = ",".join(x509.get("subjectAltName", []))
-                    signature_algorithm = x509.get("signatureAlgorithm", "")
-                    pubkey = x509.get("subjectPublicKeyInfo", {})
-                    public_key_type = pubkey.get("algorithm", "")
-                    public_key_bits = (
-                        pubkey.get("key_size") if "key_size" in pubkey else None
-                    )
-                    # OCSP/CRL URLs
-                    for ext in x509.get("extensions", []):
-                        if ext["name"] == "authorityInfoAccess":
-                            if "OCSP" in ext["value"]:
-                                ocsp_url = ext["value"]["OCSP"]
-                        if ext["name"] == "crlDistributionPoints":
-                            crl_url = ext["value"]
-                    # Chain info (not available via stdlib, so set to 1)
-                    # Self-signed check
-                    is_self_signed = subject == issuer
-                    # Expiry check
-                    if not_after and not_after < datetime.utcnow():
-                        is_expired = True
-                        warnings.append("Certificate is expired.")
-                    # Weak signature
-                    if "sha1" in signature_algorithm.lower():
-                        is_weak_signature = True
-                        warnings.append("Weak signature algorithm (SHA1)")
-                    # Short key
-                    if public_key_bits and public_key_bits < 2048:
-                        is_short_key = True
-                        warnings.append("Short public key (<2048 bits)")
+                    chain = certificates.presented_chain(ssock)
+            error = certificates.verify(chain, hostname) if chain else None
+            result = {"chain": chain, "error": error}
         except Exception as e:
-            errors.append(str(e))
-        ssl_check = SSLCheck.objects.create(
-            user=user,
-            link=link,
-            checked_at=datetime.utcnow(),
-            subject=subject,
-            issuer=issuer,
-            serial_number=serial_number,
-            version=version,
-            not_before=not_before,
-            not_after=not_after,
-            san=san,
-            signature_algorithm=signature_algorithm,
-            public_key_type=public_key_type,
-            public_key_bits=public_key_bits,
-            ocsp_url=ocsp_url,
-            crl_url=crl_url,
-            chain_count=chain_count,
-            is_self_signed=is_self_signed,
-            is_expired=is_expired,
-            is_weak_signature=is_weak_signature,
-            is_short_key=is_short_key,
-            warnings="; ".join(warnings),
-            errors="; ".join(errors),
-            raw_cert=raw_cert,
-        )
-        return ssl_check
+            result = {"error": str(e)}
+        return cls.store_checks([(link, user, result)])[0]
+
+    @classmethod
+    def store_checks(cls, observations):
+        """
+        Store one SSLCheck per ``(link, user, result)`` observation, where
+        ``result`` holds the DER ``chain`` a handshake presented (leaf first)
+        and/or an ``error`` (a failed handshake or verification), then refresh
+        the links' snapshots. Each leaf certificate is stored once, keyed by
+        fingerprint; a check only references it.
+        """
+        presented = {}
+        for _, _, result in observations:
+            if result.get("chain"):
+                result["fingerprint"] = cls.fingerprint(result["chain"][0])
+                presented[result["fingerprint"]] = result["chain"][0]
+        known = cls.certificates(presented) if presented else {}
+        checks = []
+        for link, user, result in observations:
+            certificate = known.get(result.get("fingerprint"))
+            error = result.get("error")
+            if result.get("chain") and not certificate:
+                error = "Certificate could not be parsed."
+            checks.append(
+                cls.build_check(
+                    link, user, certificate, len(result.get("chain") or ()) or 1, error
+                )
+            )
+        SSLCheck.objects.bulk_create(checks, batch_size=500)
+        LinkSnapshotService.record_ssl_checks(checks)
+        return checks
 
 
 class SSLLabsService:
@@ -402,8 +1466,12 @@ class SSLLabsService:
         error = None
         while poll_count < SSLLabsService.MAX_POLL:
             try:
-                resp = requests.get(SSLLabsService.API_URL, params=params, timeout=30)
-                data = resp.json()
+                resp = http_client.get(
+                    SSLLabsService.API_URL, params=params, stream=True
+                )
+                data = StreamedBody.from_response(
+                    resp, SSLLABS_FIELDS, SSLLABS_SKIP, keep_payload=False
+                ).data
                 status = data.get("status")
                 if status in ("READY", "ERROR"):
                     break
@@ -418,75 +1486,139 @@ class SSLLabsService:
                 error = str(e)
                 break
         if error:
-            scan = SSLLabsScan.objects.create(
-                user=user,
-                link=link,
-                scanned_at=datetime.utcnow(),
-                status="ERROR",
-                errors=error,
-                raw_json=None,
-            )
+            with transaction.atomic():
+                scan = SSLLabsScan.objects.create(
+                    user=user,
+                    link=link,
+                    scanned_at=datetime.utcnow(),
+                    status="ERROR",
+                    errors=error,
+                    raw_json=None,
+                )
+                LinkSnapshotService.record_ssl_labs_scan(scan)
             return scan
         if status == "ERROR":
-            scan = SSLLabsScan.objects.create(
-                user=user,
-                link=link,
-                scanned_at=datetime.utcnow(),
-                status="ERROR",
-                errors=data.get("statusMessage", "Unknown error"),
-                raw_json=data,
-            )
+            with transaction.atomic():
+                scan = SSLLabsScan.objects.create(
+                    user=user,
+                    link=link,
+                    scanned_at=datetime.utcnow(),
+                    status="ERROR",
+                    errors=data.get("statusMessage", "Unknown error"),
+                    raw_json=data,
+                )
+                LinkSnapshotService.record_ssl_labs_scan(scan)
             return scan
-        # Parse endpoints (may be multiple IPs)
+        # Parse endpoints (may be multiple IPs). The scans and the snapshot
+        # are committed together, so the dashboard cache is only dropped once
+        # the snapshot is current
         scans = []
-        for ep in data.get("endpoints", []):
-            details = ep.get("details", {})
-            cert = details.get("cert", {})
-            scan = SSLLabsScan.objects.create(
-                user=user,
-                link=link,
-                scanned_at=datetime.utcnow(),
-                endpoint=ep.get("ipAddress", ""),
-                grade=ep.get("grade", ""),
-                status=status,
-                subject=cert.get("subject", ""),
-                issuer=cert.get("issuerLabel", ""),
-                serial_number=cert.get("serialNumber", ""),
-                not_before=(
-                    datetime.utcfromtimestamp(cert["notBefore"] / 1000)
-                    if cert.get("notBefore")
-                    else None
-                ),
-                not_after=(
-                    datetime.utcfromtimestamp(cert["notAfter"] / 1000)
-                    if cert.get("notAfter")
-                    else None
-                ),
-                san=",".join(cert.get("altNames", [])),
-                signature_algorithm=cert.get("sigAlg", ""),
-                public_key_type=cert.get("keyAlg", ""),
-                public_key_bits=cert.get("keySize"),
-                ocsp_url=cert.get("ocspUris", [""])[0] if cert.get("ocspUris") else "",
-                crl_url=cert.get("crlURIs", [""])[0] if cert.get("crlURIs") else "",
-                chain_issues=details.get("chainIssues", ""),
-                hsts=details.get("hstsPolicy", {}).get("status", False) == 1,
-                hsts_max_age=details.get("hstsPolicy", {}).get("maxAge"),
-                hsts_preload=details.get("hstsPreload", False),
-                forward_secrecy=details.get("forwardSecrecy", 0) == 2,
-                protocols=",".join(
-                    [p.get("name", "") for p in details.get("protocols", [])]
-                ),
-                ciphers=",".join(
-                    [
-                        c.get("name", "")
-                        for c in details.get("suites", {}).get("list", [])
-                    ]
-                ),
-                vulnerabilities=",".join(
-                    [k for k, v in details.items() if k.startswith("vuln") and v]
-                ),
-                warnings="",
-                errors="",
-                raw_json=ep,
+        with transaction.atomic():
+            for ep in data.get("endpoints", []):
+                details = ep.get("details", {})
+                cert = details.get("cert", {})
+                scan = SSLLabsScan.objects.create(
+                    user=user,
+                    link=link,
+                    scanned_at=datetime.utcnow(),
+                    endpoint=ep.get("ipAddress", ""),
+                    grade=ep.get("grade", ""),
+                    status=status,
+                    subject=cert.get("subject", ""),
+                    issuer=cert.get("issuerLabel", ""),
+                    serial_number=cert.get("serialNumber", ""),
+                    not_before=(
+                        datetime.utcfromtimestamp(cert["notBefore"] / 1000)
+                        if cert.get("notBefore")
+                        else None
+                    ),
+                    not_after=(
+                        datetime.utcfromtimestamp(cert["notAfter"] / 1000)
+                        if cert.get("notAfter")
+                        else None
+                    ),
+                    san=",".join(cert.get("altNames", [])),
+                    signature_algorithm=cert.get("sigAlg", ""),
+                    public_key_type=cert.get("keyAlg", ""),
+                    public_key_bits=cert.get("keySize"),
+                    ocsp_url=(
+                        cert.get("ocspUris", [""])[0] if cert.get("ocspUris") else ""
+                    ),
+                    crl_url=cert.get("crlURIs", [""])[0] if cert.get("crlURIs") else "",
+                    chain_issues=details.get("chainIssues", ""),
+                    hsts=details.get("hstsPolicy", {}).get("status", False) == 1,
+                    hsts_max_age=details.get("hstsPolicy", {}).get("maxAge"),
+                    hsts_preload=details.get("hstsPreload", False),
+                    forward_secrecy=details.get("forwardSecrecy", 0) == 2,
+                    protocols=",".join(
+                        [p.get("name", "") for p in details.get("protocols", [])]
+                    ),
+                    ciphers=",".join(
+                        [
+                            c.get("name", "")
+                            for c in details.get("suites", {}).get("list", [])
+                        ]
+                    ),
+                    vulnerabilities=",".join(
+                        [k for k, v in details.items() if k.startswith("vuln") and v]
+                    ),
+                    warnings="",
+                    errors="",
+                    raw_json=ep,
+                )
+                scans.append(scan)
+            if scans:
+                LinkSnapshotService.record_ssl_labs_scan(scans[-1])
+
+
+class CertificateExpiryService:
+    """
+    Upcoming certificate expiries across a fleet, read from the indexed
+    ``LinkSnapshot.cert_expiry`` (the sooner of the latest local SSL check's
+    and SSL Labs scan's ``not_after``) rather than each link's history.
+    """
+
+    @staticmethod
+    def expiring(user=None, days=None):
+        """
+        Snapshots with a known expiry, soonest first; already expired ones are
+        included. ``days`` limits the report to expiries within that many days.
+        """
+        snapshots = LinkSnapshot.objects.filter(cert_expiry__isnull=False)
+        if user is not None:
+            snapshots = snapshots.filter(link__user=user)
+        if days is not None:
+            snapshots = snapshots.filter(
+                cert_expiry__lt=timezone.now() + timedelta(days=days)
             )
-            scans.append(scan)
+        return snapshots.select_related("link", "link__user").order_by(
+            "cert_expiry", "link_id"
+        )
+
+    @staticmethod
+    def page(snapshots, number, per_page):
+        """
+        One page of ``snapshots`` and whether another follows, in a single
+        query (one extra row is fetched instead of counting).
+        """
+        offset = (number - 1) * per_page
+        rows = list(snapshots[offset : offset + per_page + 1])
+        return rows[:per_page], len(rows) > per_page
+
+    @staticmethod
+    def as_dict(snapshot, now=None):
+        now = now or timezone.now()
+        expiry = snapshot.cert_expiry
+        return {
+            "link_id": snapshot.link_id,
+            "title": snapshot.link.title,
+            "url": snapshot.link.url,
+            "user": snapshot.link.user.username,
+            "expires_at": expiry.isoformat(),
+            "days_left": (expiry - now).days,
+            "source": ("ssl_check" if expiry == snapshot.ssl_expiry else "ssl_labs"),
+            "ssl_expiry": snapshot.ssl_expiry and snapshot.ssl_expiry.isoformat(),
+            "ssl_labs_expiry": (
+                snapshot.ssl_labs_expiry and snapshot.ssl_labs_expiry.isoformat()
+            ),
+        }
@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import dashboard_cache
+from .models import Link, PSIReport, SSLCheck, SSLLabsScan
+
+# Sent with ``user_ids`` after the uptime status of some links was stored
+uptime_status_changed = Signal()
+# Sent with ``user_ids`` after SSL checks were bulk-inserted, which skips
+# post_save
+ssl_checks_stored = Signal()
+
+
+def _invalidate_after_commit(user_ids):
+    # Dropping the entry before commit would let a concurrent request cache
+    # the old rows again
+    transaction.on_commit(lambda: dashboard_cache.invalidate(user_ids))
+
+
+@receiver(post_save, sender=Link)
+@receiver(post_delete, sender=Link)
+@receiver(post_save, sender=PSIReport)
+@receiver(post_delete, sender=PSIReport)
+@receiver(post_save, sender=SSLCheck)
+@receiver(post_delete, sender=SSLCheck)
+@receiver(post_save, sender=SSLLabsScan)
+@receiver(post_delete, sender=SSLLabsScan)
+def result_changed(sender, instance, **kwargs):
+    _invalidate_after_commit([instance.user_id])
+
+
+@receiver(uptime_status_changed)
+@receiver(ssl_checks_stored)
+def results_stored(sender, user_ids, **kwargs):
+    _invalidate_after_commit(user_ids)
@@ -0,0 +1,110 @@
+"""Concurrent certificate sweep over every link.
+
+Links are grouped by ``(hostname, port)`` so each endpoint gets one TLS
+handshake however many links point at it. The handshake accepts any
+certificate and the presented chain is verified in memory afterwards, so
+expired, self-signed and mismatched certificates are stored along with the
+verification error. A fixed pool of asyncio workers (the bounded parallelism)
+pulls endpoints from a queue. Each handshake runs under its own timeout, so
+unreachable hosts cost at most ``timeout`` seconds of one worker and never
+stall the sweep. Observations are handed to ``store`` in batches from a worker
+thread (``SSLService.store_checks`` bulk-inserts them, parsing only
+certificates it has not stored before).
+"""
+
+import asyncio
+import ssl
+from concurrent.futures import ThreadPoolExecutor
+
+from . import certificates
+from .services import SSLService
+
+
+async def fetch_certificate(host, port, timeout, context):
+    """DER bytes of the chain a handshake with the host presented."""
+    _, writer = await asyncio.wait_for(
+        asyncio.open_connection(
+            host,
+            port,
+            ssl=context,
+            server_hostname=host,
+            ssl_handshake_timeout=timeout,
+        ),
+        timeout,
+    )
+    try:
+        return certificates.presented_chain(writer.get_extra_info("ssl_object"))
+    finally:
+        writer.close()
+
+
+class Sweep:
+    def __init__(
+        self, links, store, concurrency=200, timeout=10.0, batch_size=500, cafile=None
+    ):
+        self.endpoints = {}
+        for link in links:
+            self.endpoints.setdefault(SSLService.endpoint(link.url), []).append(link)
+        self.store = store
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.context = certificates.unverified_context()
+        self.trust_store = certificates.trust_store(cafile)
+        self.checks = 0
+        self.failures = []
+        self._pending = []
+
+    async def _flush(self):
+        batch, self._pending = self._pending, []
+        if batch:
+            await asyncio.to_thread(self.store, batch)
+
+    async def _check(self, host, port):
+        try:
+            if not host:
+                raise ValueError("URL has no hostname.")
+            chain = await fetch_certificate(host, port, self.timeout, self.context)
+        except asyncio.TimeoutError:
+            return {"error": f"Timed out after {self.timeout:g}s"}
+        except (OSError, ValueError, ssl.SSLError) as e:
+            return {"error": str(e) or e.__class__.__name__}
+        error = certificates.verify(chain, host, self.trust_store) if chain else None
+        return {"chain": chain, "error": error}
+
+    async def _worker(self, queue, lock):
+        while not queue.empty():
+            endpoint = queue.get_nowait()
+            result = await self._check(*endpoint)
+            if result.get("error"):
+                self.failures.append((endpoint, result["error"]))
+            for link in self.endpoints[endpoint]:
+                self._pending.append((link, link.user, result))
+                self.checks += 1
+            if len(self._pending) >= self.batch_size:
+                async with lock:
+                    await self._flush()
+
+    async def run(self):
+        queue = asyncio.Queue()
+        for endpoint in self.endpoints:
+            queue.put_nowait(endpoint)
+        lock = asyncio.Lock()
+        workers = min(self.concurrency, len(self.endpoints))
+        await asyncio.gather(*(self._worker(queue, lock) for _ in range(workers)))
+        async with lock:
+            await self._flush()
+
+
+def run(sweep):
+    """
+    Run a Sweep to completion. Name resolution happens in the default
+    executor, so it is sized to the sweep's concurrency.
+    """
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=sweep.concurrency))
+        await sweep.run()
+
+    asyncio.run(main())
@@ -1,8 +1,68 @@
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import ssl
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+
+import numpy as np
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache, caches
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from .models import Link
+from . import (
+    analytics,
+    certificates,
+    dashboard_cache,
+    downsample,
+    http_client,
+    probe,
+    quota,
+    signals,
+    ssl_sweep,
+    timeseries,
+)
+from .json_stream import PSI_FIELDS, StreamedBody
+from .models import (
+    AuditDefinition,
+    AuditDetails,
+    Certificate,
+    Link,
+    LinkSnapshot,
+    PSIDailyRollup,
+    PSIReportGroup,
+    SSLCheck,
+    SSLLabsScan,
+    UptimeLog,
+    UptimeResponseChunk,
+    UserAPIKey,
+)
+from .services import (
+    AuditCatalog,
+    CertificateExpiryService,
+    LinkSnapshotService,
+    PSIRollupService,
+    PSIService,
+    SSLService,
+    UptimeLogService,
+    UptimeProbeService,
+    UptimeRobotService,
+)
 
 
 class LinkModelTest(TestCase):
@@ -17,8 +77,10 @@ class LinkModelTest(TestCase):
         self.assertEqual(str(self.link), "Test")
 
 
+@override_settings(DASHBOARD_CACHE="default")
 class LinkListViewTest(TestCase):
     def setUp(self):
+        cache.clear()
         User = get_user_model()
         self.user = User.objects.create_user(username="testuser2", password="testpass2")
         self.link = Link.objects.create(
@@ -32,3 +94,1494 @@ class LinkListViewTest(TestCase):
         self.client.force_login(self.user)
         response = self.client.get(reverse("dashboard"), follow=True)
         self.assertEqual(response.status_code, 200)
+
+
+def fake_psi_payload(strategy, performance=0.9):
+    return {
+        "loadingExperience": {"metrics": {}, "overall_category": None},
+        "lighthouseResult": {
+            "categories": {
+                "performance": {
+                    "score": performance,
+                    "auditRefs": [{"id": "speed-index"}],
+                }
+            },
+            "audits": {
+                "speed-index": {
+                    "title": "Speed Index",
+                    "description": "How quickly content is visibly populated.",
+                    "score": performance,
+                    "scoreDisplayMode": "numeric",
+                    "numericValue": 1200.0,
+                    "details": {"type": "opportunity", "items": []},
+                }
+            },
+        },
+    }
+
+
+class PSIServiceTest(TestCase):
+    def setUp(self):
+        AuditCatalog.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="psiuser", password="testpass")
+        UserAPIKey.objects.create(user=self.user, service="psi", key="k")
+
+    def test_group_stored_when_both_strategies_succeed(self):
+        def fetch(url, user, strategy="mobile", key_obj=None, timeout=None):
+            return fake_psi_payload(strategy)
+
+        with mock.patch.object(PSIService, "fetch_report", side_effect=fetch):
+            group, mobile, desktop = PSIService.fetch_and_store_report_group(
+                "https://example.com", self.user
+            )
+        self.assertEqual(group.reports.count(), 2)
+        self.assertEqual(mobile.strategy, "mobile")
+        self.assertEqual(desktop.strategy, "desktop")
+        self.assertEqual(mobile.audits.count(), 1)
+        self.assertEqual(desktop.category_scores.performance, 0.9)
+        self.assertEqual(mobile.load_raw_json(), fake_psi_payload("mobile"))
+
+    def test_nothing_stored_when_one_strategy_fails(self):
+        def fetch(url, user, strategy="mobile", key_obj=None, timeout=None):
+            if strategy == "desktop":
+                raise Exception("timed out")
+            return fake_psi_payload(strategy)
+
+        with mock.patch.object(PSIService, "fetch_report", side_effect=fetch):
+            with self.assertRaisesMessage(Exception, "desktop: timed out"):
+                PSIService.fetch_and_store_report_group(
+                    "https://example.com", self.user
+                )
+        self.assertFalse(PSIReportGroup.objects.exists())
+
+    def test_quota_is_tracked_in_the_calling_thread(self):
+        def fetch(url, user, strategy="mobile", key_obj=None, timeout=None):
+            if strategy == "desktop":
+                raise quota.Throttled("quota exceeded")
+            return fake_psi_payload(strategy)
+
+        calls = []
+
+        def record(name):
+            return lambda key_obj: calls.append((name, threading.get_ident()))
+
+        with mock.patch.object(PSIService, "fetch_report", side_effect=fetch):
+            with mock.patch.multiple(
+                quota,
+                acquire=mock.DEFAULT,
+                throttled=mock.DEFAULT,
+                succeeded=mock.DEFAULT,
+            ) as mocks:
+                for name, patched in mocks.items():
+                    patched.side_effect = record(name)
+                with self.assertRaisesMessage(Exception, "desktop: quota exceeded"):
+                    PSIService.fetch_strategies("https://example.com", self.user)
+        self.assertEqual(
+            sorted(name for name, _ in calls),
+            ["acquire", "acquire", "succeeded", "throttled"],
+        )
+        self.assertEqual({ident for _, ident in calls}, {threading.get_ident()})
+
+    def test_ingest_rolls_back_on_write_failure(self):
+        results = {s: fake_psi_payload(s) for s in PSIService.STRATEGIES}
+        with mock.patch(
+            "links.services.Audit.objects.bulk_create", side_effect=Exception("boom")
+        ):
+            with self.assertRaises(Exception):
+                PSIService.store_report_group("https://example.com", self.user, results)
+        self.assertFalse(PSIReportGroup.objects.exists())
+
+    def test_audit_definitions_shared_across_reports(self):
+        results = {s: fake_psi_payload(s) for s in PSIService.STRATEGIES}
+        with self.captureOnCommitCallbacks(execute=True):
+            PSIService.store_report_group("https://example.com", self.user, results)
+        group, mobile, _ = PSIService.store_report_group(
+            "https://example.com", self.user, results
+        )
+        self.assertEqual(AuditDefinition.objects.count(), 1)
+        self.assertEqual(AuditDetails.objects.count(), 1)
+        self.assertEqual(mobile.audits.get().title, "Speed Index")
+
+    def test_audit_title_kept_per_report(self):
+        results = {s: fake_psi_payload(s) for s in PSIService.STRATEGIES}
+        PSIService.store_report_group("https://example.com", self.user, results)
+        audit = results["mobile"]["lighthouseResult"]["audits"]["speed-index"]
+        audit["title"] = "Speed Index is slow"
+        _, mobile, _ = PSIService.store_report_group(
+            "https://example.com", self.user, results
+        )
+        self.assertEqual(AuditDefinition.objects.count(), 1)
+        self.assertEqual(mobile.audits.get().title, "Speed Index is slow")
+        self.assertEqual(
+            mobile.audits.get().description,
+            "How quickly content is visibly populated.",
+        )
+
+    def test_audit_details_loaded_on_demand(self):
+        results = {s: fake_psi_payload(s) for s in PSIService.STRATEGIES}
+        _, mobile, _ = PSIService.store_report_group(
+            "https://example.com", self.user, results
+        )
+        audit = mobile.audits.get()
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("psi_audit_details", args=[mobile.id, audit.id])
+        )
+        self.assertEqual(response.json()["details"]["type"], "opportunity")
+
+    def test_unreferenced_details_are_pruned(self):
+        results = {s: fake_psi_payload(s) for s in PSIService.STRATEGIES}
+        group, mobile, _ = PSIService.store_report_group(
+            "https://example.com", self.user, results
+        )
+        self.client.force_login(self.user)
+        self.client.post(reverse("delete_psi_report", args=[mobile.id]))
+        # Still used by the desktop report
+        self.assertEqual(AuditDetails.objects.count(), 1)
+        self.client.post(reverse("delete_psi_report_group", args=[group.id]))
+        self.assertFalse(AuditDetails.objects.exists())
+
+        AuditDetails.objects.create(digest="0" * 64, data={})
+        out = StringIO()
+        call_command("prune_orphans", stdout=out)
+        self.assertIn("Deleted 1 unreferenced audit details blob(s).", out.getvalue())
+        self.assertFalse(AuditDetails.objects.exists())
+
+    def test_export_returns_stored_payload(self):
+        results = {s: fake_psi_payload(s, 0.42) for s in PSIService.STRATEGIES}
+        _, mobile, _ = PSIService.store_report_group(
+            "https://example.com", self.user, results
+        )
+        url = reverse("export_psi_report_json", args=[mobile.id])
+        self.client.force_login(self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response["Content-Disposition"])
+        self.assertEqual(
+            json.loads(b"".join(response)), fake_psi_payload("mobile", 0.42)
+        )
+        other = get_user_model().objects.create_user(username="other", password="x")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_recent_group_served_from_cache(self):
+        results = {s: fake_psi_payload(s) for s in PSIService.STRATEGIES}
+        stored, _, _ = PSIService.store_report_group(
+            "https://example.com", self.user, results
+        )
+        with mock.patch.object(PSIService, "fetch_strategies") as fetch:
+            group, mobile, _ = PSIService.fetch_and_store_report_group(
+                "https://example.com", self.user, max_age=600
+            )
+            fetch.assert_not_called()
+            self.assertTrue(group.from_cache)
+            self.assertEqual(group.id, stored.id)
+            fetch.return_value = results
+            group, _, _ = PSIService.fetch_and_store_report_group(
+                "https://example.com", self.user, max_age=0
+            )
+        self.assertFalse(group.from_cache)
+        self.assertEqual(PSIReportGroup.objects.count(), 2)
+
+
+class PSIReportsListViewTest(TestCase):
+    def setUp(self):
+        AuditCatalog.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="trenduser", password="testpass")
+        self.link = Link.objects.create(
+            user=self.user, title="Trend", url="https://example.com"
+        )
+        self.client.force_login(self.user)
+
+    def add_groups(self, count):
+        now = timezone.now()
+        for i in range(count):
+            results = {
+                s: fake_psi_payload(s, performance=0.5 + i / 100)
+                for s in PSIService.STRATEGIES
+            }
+            PSIService.store_report_group(
+                self.link.url, self.user, results, fetch_time=now - timedelta(hours=i)
+            )
+
+    def get_analytics(self):
+        today = timezone.now().date()
+        start = (today - timedelta(days=2)).isoformat()
+        end = (today + timedelta(days=1)).isoformat()
+        return self.client.get(
+            reverse("psi_reports_list", args=[self.link.id]),
+            {
+                "trend_start": start,
+                "trend_end": end,
+                "compare_start1": start,
+                "compare_end1": end,
+                "compare_start2": start,
+                "compare_end2": end,
+            },
+        )
+
+    def test_trend_and_compare_query_count_is_constant(self):
+        self.add_groups(3)
+        with CaptureQueriesContext(connection) as few:
+            response = self.get_analytics()
+        points = response.context["trend_data"]["mobile"]["points"]
+        self.assertEqual(sum(p["count"] for p in points), 3)
+        self.add_groups(12)
+        with self.assertNumQueries(len(few)):
+            response = self.get_analytics()
+        trend = response.context["trend_data"]
+        self.assertEqual(sum(p["count"] for p in trend["desktop"]["points"]), 15)
+        self.assertAlmostEqual(trend["mobile"]["max"]["performance"], 0.61)
+        self.assertAlmostEqual(trend["mobile"]["min"]["performance"], 0.5)
+        self.assertEqual(
+            len(response.context["compare_data"]["period1"]["reports"]), 30
+        )
+
+    def test_rollups_track_ingest_and_deletes(self):
+        self.add_groups(3)
+        rollup = PSIDailyRollup.objects.get(
+            strategy="mobile",
+            day=timezone.localdate(PSIReportGroup.objects.first().fetch_time),
+        )
+        self.assertEqual(rollup.performance_last, 0.5)
+        today = timezone.localdate()
+        stats = PSIRollupService.window_stats(
+            rollup.page, today - timedelta(days=1), today, granularity="month"
+        )
+        self.assertLessEqual(len(stats["mobile"]["points"]), 2)
+        self.assertAlmostEqual(stats["mobile"]["avg"]["performance"], 0.51)
+        newest = PSIReportGroup.objects.order_by("-fetch_time").first()
+        self.client.post(reverse("delete_psi_report_group", args=[newest.id]))
+        stats = PSIRollupService.window_stats(
+            rollup.page, today - timedelta(days=1), today
+        )
+        self.assertEqual(sum(p["count"] for p in stats["mobile"]["points"]), 2)
+        self.assertAlmostEqual(stats["mobile"]["avg"]["performance"], 0.515)
+
+
+class SeriesEndpointTest(TestCase):
+    def setUp(self):
+        AuditCatalog.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="seriesuser", password="x")
+        self.link = Link.objects.create(
+            user=self.user, title="Series", url="https://example.com"
+        )
+        self.client.force_login(self.user)
+
+    def store_group(self, performance):
+        results = {
+            s: fake_psi_payload(s, performance=performance)
+            for s in PSIService.STRATEGIES
+        }
+        PSIService.store_report_group(self.link.url, self.user, results)
+
+    def test_psi_series_is_columnar_and_revalidates(self):
+        self.store_group(0.8)
+        url = reverse("psi_series", args=[self.link.id])
+        response = self.client.get(url, {"granularity": "day"})
+        mobile = response.json()["series"]["mobile"]
+        self.assertEqual(mobile["t"], [timezone.localdate().isoformat()])
+        self.assertEqual(mobile["performance"], [0.8])
+        self.assertEqual(mobile["count"], [1])
+        self.assertIn("Last-Modified", response)
+
+        etag = response["ETag"]
+        response = self.client.get(url, {"granularity": "day"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.store_group(0.6)
+        response = self.client.get(url, {"granularity": "day"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(
+            response.json()["series"]["mobile"]["performance"][0], 0.7
+        )
+
+    def test_ssl_series_columns(self):
+        now = timezone.now()
+        SSLCheck.objects.create(
+            user=self.user,
+            link=self.link,
+            certificate=Certificate.objects.create(
+                fingerprint="1" * 64,
+                subject="CN=example.com",
+                issuer="CN=Test CA",
+                serial_number="1",
+                not_before=now - timedelta(days=10),
+                not_after=now + timedelta(days=30),
+            ),
+        )
+        response = self.client.get(reverse("ssl_series", args=[self.link.id]))
+        series = response.json()["series"]
+        self.assertEqual(len(series["t"]), 1)
+        self.assertEqual(series["days_left"], [29])
+        response = self.client.get(
+            reverse("ssl_series", args=[self.link.id]), {"start": "not-a-date"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(CHART_MAX_POINTS=1000)
+    def test_history_page_passes_points_to_the_chart(self):
+        response = self.client.get(
+            reverse("ssl_history", args=[self.link.id]),
+            {"trend_start": "2024-01-01", "trend_end": "2024-01-31", "points": "40"},
+        )
+        self.assertNotIn("points", response.context["trend_data"])
+        self.assertContains(response, "points: '40'")
+
+
+class DownsampleTest(TestCase):
+    def test_lttb_keeps_ends_and_spikes(self):
+        x = np.arange(10000, dtype=float)
+        y = np.sin(x / 500)
+        y[4321] = 25.0
+        kept = downsample.lttb_indices(x, y, 200)
+        self.assertEqual(len(kept), 200)
+        self.assertEqual((kept[0], kept[-1]), (0, 9999))
+        self.assertIn(4321, kept)
+        self.assertTrue(np.all(np.diff(kept) > 0))
+
+    def test_short_series_untouched(self):
+        series = {"t": ["2024-01-01", "2024-01-02"], "value": [1, None]}
+        self.assertIs(downsample.downsample_columns(series, "value", 100), series)
+
+    @override_settings(CHART_DEFAULT_POINTS=50, CHART_MAX_POINTS=100)
+    def test_target_is_capped(self):
+        self.assertEqual(downsample.target_points(None), 50)
+        self.assertEqual(downsample.target_points("10"), 10)
+        self.assertEqual(downsample.target_points("100000"), 100)
+
+    def test_columns_thinned_together(self):
+        start = datetime(2024, 1, 1)
+        series = {
+            "t": [(start + timedelta(hours=i)).isoformat() for i in range(1000)],
+            "grade": ["A" if i % 97 else "F" for i in range(1000)],
+            "status": ["Ready"] * 1000,
+        }
+        thinned = downsample.downsample_columns(
+            series, "grade", 60, score=downsample.grade_score
+        )
+        self.assertEqual(len(thinned["t"]), 60)
+        self.assertEqual(len(thinned["status"]), 60)
+        self.assertIn("F", thinned["grade"])
+
+
+class UptimeRobotServiceTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="upuser", password="x")
+        UserAPIKey.objects.create(user=self.user, service="uptimerobot", key="k")
+        Link.objects.bulk_create(
+            Link(
+                user=self.user,
+                title=f"Site {i}",
+                url=f"https://site{i}.example.com",
+                uptime_monitor_id=str(1000 + i),
+            )
+            for i in range(60)
+        )
+
+    def test_statuses_refreshed_in_batches(self):
+        def get_monitors(key_obj, method, payload, idempotent=False):
+            ids = payload["monitors"].split("-")
+            self.assertNotIn("logs", payload)
+            # Monitor 1007 was deleted on the UptimeRobot side
+            return {
+                "stat": "ok",
+                "monitors": [{"id": int(i), "status": 2} for i in ids if i != "1007"],
+            }
+
+        links = Link.objects.filter(user=self.user)
+        with mock.patch.object(
+            UptimeRobotService, "call", side_effect=get_monitors
+        ) as call:
+            UptimeRobotService.refresh_statuses(self.user, links)
+        self.assertEqual(call.call_count, 2)
+        statuses = dict(
+            Link.objects.values_list("uptime_monitor_id", "uptime_last_status")
+        )
+        self.assertEqual(statuses["1007"], "error")
+        self.assertEqual(list(statuses.values()).count("2"), 59)
+        self.assertFalse(Link.objects.filter(uptime_last_checked=None).exists())
+
+    def test_failed_chunk_keeps_previous_statuses(self):
+        earlier = timezone.now() - timedelta(hours=1)
+        Link.objects.update(uptime_last_status="2", uptime_last_checked=earlier)
+        Link.objects.create(
+            user=self.user, title="New", url="https://new.test", uptime_monitor_id="9"
+        )
+
+        def get_monitors(key_obj, method, payload, idempotent=False):
+            ids = payload["monitors"].split("-")
+            if "1000" not in ids:
+                raise quota.QuotaExceeded("rate limited")
+            return {
+                "stat": "ok",
+                "monitors": [{"id": int(i), "status": 9} for i in ids],
+            }
+
+        with mock.patch.object(UptimeRobotService, "call", side_effect=get_monitors):
+            UptimeRobotService.refresh_statuses(
+                self.user, Link.objects.filter(user=self.user).order_by("id")
+            )
+        fresh = Link.objects.filter(uptime_last_status="9")
+        self.assertEqual(fresh.count(), 50)
+        self.assertFalse(fresh.filter(uptime_last_checked=earlier).exists())
+        stale = Link.objects.filter(uptime_last_status="2")
+        self.assertEqual(stale.count(), 10)
+        self.assertEqual(stale.filter(uptime_last_checked=earlier).count(), 10)
+        new = Link.objects.get(title="New")
+        self.assertEqual(new.uptime_last_status, "error")
+        self.assertIsNone(new.uptime_last_checked)
+
+
+class UptimeHistoryTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="histuser", password="x")
+        UserAPIKey.objects.create(user=self.user, service="uptimerobot", key="k")
+        self.link = Link.objects.create(
+            user=self.user,
+            title="Site",
+            url="https://history.example.com",
+            uptime_monitor_id="42",
+        )
+        self.client.force_login(self.user)
+        self.start = int(datetime(2026, 3, 1, tzinfo=dt_timezone.utc).timestamp())
+        self.logs = [
+            {
+                "type": 1 if i % 5 == 0 else 2,
+                "datetime": self.start + i * 3600,
+                "duration": 3600,
+                "reason": {"code": "200", "detail": "OK"},
+            }
+            for i in range(30)
+        ]
+        self.payloads = []
+
+    def get_monitors(self, key_obj, method, payload, idempotent=False):
+        self.payloads.append(payload)
+        since = payload.get("logs_start_date", 0)
+        logs = [log for log in self.logs if log["datetime"] >= since]
+        samples = [
+            {"datetime": log["datetime"], "value": 100 + i}
+            for i, log in enumerate(logs)
+        ]
+        return {
+            "stat": "ok",
+            "monitors": [
+                {"id": 42, "status": 2, "logs": logs, "response_times": samples}
+            ],
+        }
+
+    def sync(self, force=False):
+        with mock.patch.object(
+            UptimeRobotService, "call", side_effect=self.get_monitors
+        ):
+            return UptimeRobotService.sync_history(self.link, self.user, force=force)
+
+    def test_sync_fetches_only_newer_entries(self):
+        self.assertTrue(self.sync())
+        self.assertNotIn("logs_start_date", self.payloads[0])
+        self.assertEqual(self.link.uptime_logs.count(), 30)
+        self.assertFalse(self.sync())
+        self.assertEqual(len(self.payloads), 1)
+        self.logs.append(
+            {"type": 1, "datetime": self.start + 30 * 3600, "duration": 60}
+        )
+        self.assertTrue(self.sync(force=True))
+        self.assertEqual(self.payloads[1]["logs_start_date"], self.start + 29 * 3600)
+        self.assertEqual(self.link.uptime_logs.count(), 31)
+        times, values = UptimeLogService.response_times(self.link)
+        self.assertEqual(len(times), 31)
+        self.assertEqual(times[-1], self.start + 30 * 3600)
+        self.assertEqual(self.link.uptime_response_chunks.count(), 2)
+
+    def test_resync_refreshes_ongoing_event_duration(self):
+        self.sync()
+        self.logs[-1]["duration"] = 5400
+        self.sync(force=True)
+        ongoing = self.link.uptime_logs.get(
+            datetime=datetime.fromtimestamp(self.start + 29 * 3600, tz=dt_timezone.utc)
+        )
+        self.assertEqual(ongoing.duration, 5400)
+        self.assertEqual(self.link.uptime_logs.count(), 30)
+
+    def test_history_and_exports_read_local_data(self):
+        self.sync()
+        self.link.refresh_from_db()
+        with mock.patch.object(UptimeRobotService, "call") as call:
+            response = self.client.get(
+                reverse("uptime_history", args=[self.link.id]),
+                {
+                    "type": "1",
+                    "per_page": "4",
+                    "page": "2",
+                    "trend_start": "2026-03-01",
+                    "trend_end": "2026-03-01",
+                },
+            )
+            exported = self.client.get(
+                reverse("export_uptime_logs_json", args=[self.link.id])
+            ).json()
+        call.assert_not_called()
+        context = response.context
+        self.assertEqual(context["total"], 6)
+        self.assertEqual(list(context["page_range"]), [1, 2])
+        self.assertEqual([log.type for log in context["logs"]], [1, 1])
+        self.assertEqual(context["trend_data"]["total_checks"], 24)
+        self.assertEqual(context["trend_data"]["downtime_events"], 5)
+        self.assertEqual(context["trend_data"]["max_response"], 123)
+        self.assertEqual(context["trend_data"]["incidents"], 5)
+        self.assertEqual(context["trend_data"]["mttr"], 3600)
+        self.assertEqual(len(exported), 30)
+        self.assertEqual(exported[0]["datetime"], self.start + 29 * 3600)
+
+    def test_series_served_from_local_data(self):
+        self.sync()
+        url = reverse("uptime_series", args=[self.link.id])
+        with mock.patch.object(UptimeRobotService, "call") as call:
+            response = self.client.get(url)
+            again = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        call.assert_not_called()
+        series = response.json()["series"]
+        self.assertEqual(len(series["logs"]["t"]), 30)
+        self.assertEqual(series["response_times"]["value"][-1], 129)
+        self.assertEqual(series["stats"]["downtime_events"], 6)
+        self.assertEqual(again.status_code, 304)
+
+    def test_probed_links_are_not_synced(self):
+        self.link.uptime_monitor_id = None
+        self.link.probe_interval = 60
+        self.link.uptime_last_status = "2"
+        self.link.save()
+        with mock.patch.object(UptimeRobotService, "call") as call:
+            self.client.get(reverse("uptime_history", args=[self.link.id]))
+            self.client.get(reverse("uptime_series", args=[self.link.id]))
+            self.client.get(reverse("export_uptime_logs_json", args=[self.link.id]))
+        call.assert_not_called()
+        self.link.refresh_from_db()
+        self.assertIsNone(self.link.uptime_monitor_id)
+        self.assertEqual(self.link.uptime_last_status, "2")
+
+
+class ResponseTimeChunkTest(TestCase):
+    def test_merge_and_decode(self):
+        day = datetime(2026, 3, 1).date()
+        base = timeseries.day_start(day)
+        groups = timeseries.split_by_day(
+            [base + 120, base + 60, base + 86400 + 5], [300, 200, 400]
+        )
+        self.assertEqual(list(groups), [day, day + timedelta(days=1)])
+        chunk = timeseries.merge(UptimeResponseChunk(day=day), *groups[day])
+        # A repeated second keeps the stored sample
+        timeseries.merge(chunk, np.array([60, 180]), np.array([999, 250]))
+        self.assertEqual(chunk.count, 3)
+        self.assertEqual(len(chunk.values), 12)
+        self.assertEqual(
+            (chunk.min_value, chunk.max_value, chunk.total), (200, 300, 750)
+        )
+        times, values = timeseries.decode([chunk], start=base + 100)
+        self.assertEqual(times.tolist(), [base + 120, base + 180])
+        self.assertEqual(values.dtype, np.dtype("<i4"))
+        self.assertEqual(values.tolist(), [300, 250])
+
+
+class UptimeAnalyticsTest(TestCase):
+    def test_event_stats(self):
+        stats = analytics.event_stats(
+            [0, 100, 160, 200, 1000, 1030], [2, 1, 1, 2, 1, 2], end=1100
+        )
+        self.assertEqual((stats["up_seconds"], stats["down_seconds"]), (970, 130))
+        self.assertEqual(stats["incidents"], 2)
+        self.assertEqual(stats["longest_downtime"], 2)
+        self.assertEqual(stats["longest_down_seconds"], 100)
+        self.assertEqual(stats["mttr"], 65)
+        self.assertEqual(stats["mtbf"], 485)
+        self.assertAlmostEqual(stats["uptime_percent"], 970 / 1100 * 100)
+
+    def test_latency_stats(self):
+        stats = analytics.latency_stats(np.arange(1, 101, dtype="<i4"), bins=10)
+        self.assertEqual((stats["min_response"], stats["max_response"]), (1, 100))
+        self.assertEqual(stats["p50"], 50.5)
+        self.assertAlmostEqual(stats["p99"], 99.01)
+        self.assertEqual(stats["histogram"]["counts"], [10] * 10)
+
+    def test_empty_window(self):
+        stats = analytics.summarize([], [], [])
+        self.assertEqual(stats["total_checks"], 0)
+        self.assertIsNone(stats["mttr"])
+        self.assertIsNone(stats["p95"])
+
+
+@override_settings(DASHBOARD_CACHE="default")
+class LinkSnapshotTest(TestCase):
+    def setUp(self):
+        AuditCatalog.clear()
+        cache.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="snapuser", password="x")
+        self.client.force_login(self.user)
+
+    def add_link(self, i):
+        link = Link.objects.create(
+            user=self.user, title=f"Site {i}", url=f"https://site{i}.example.com"
+        )
+        results = {s: fake_psi_payload(s, 0.7) for s in PSIService.STRATEGIES}
+        PSIService.store_report_group(link.url, self.user, results)
+        now = timezone.now()
+        certificate, _ = Certificate.objects.get_or_create(
+            fingerprint="1" * 64,
+            defaults={
+                "subject": "CN=x",
+                "issuer": "CN=ca",
+                "serial_number": "1",
+                "not_before": now,
+                "not_after": now + timedelta(days=90),
+            },
+        )
+        check = SSLCheck.objects.create(
+            user=self.user, link=link, certificate=certificate
+        )
+        LinkSnapshotService.record_ssl_check(check)
+        return link
+
+    def test_snapshot_follows_latest_psi_group(self):
+        link = self.add_link(0)
+        older = {s: fake_psi_payload(s, 0.4) for s in PSIService.STRATEGIES}
+        PSIService.store_report_group(
+            link.url, self.user, older, fetch_time=timezone.now() - timedelta(days=1)
+        )
+        link.snapshot.refresh_from_db()
+        self.assertEqual(link.snapshot.psi_performance, 0.7)
+        self.assertTrue(link.snapshot.ssl_valid)
+        newest = PSIReportGroup.objects.order_by("-fetch_time").first()
+        self.client.post(reverse("delete_psi_report_group", args=[newest.id]))
+        link.snapshot.refresh_from_db()
+        self.assertEqual(link.snapshot.psi_performance, 0.4)
+        self.assertEqual(
+            link.snapshot.ssl_expiry.date(),
+            (timezone.now() + timedelta(days=90)).date(),
+        )
+
+    def test_dashboard_query_count_does_not_grow_with_links(self):
+        for i in range(2):
+            self.add_link(i)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(reverse("dashboard"))
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(2, 8):
+                self.add_link(i)
+        with self.assertNumQueries(len(few)):
+            response = self.client.get(reverse("dashboard"))
+        sites = response.context["sites_data"]
+        self.assertEqual(len(sites), 8)
+        self.assertEqual({site["psi_status"] for site in sites}, {0.7})
+        self.assertEqual({site["link"].uptime_last_status for site in sites}, {"error"})
+
+
+@override_settings(DASHBOARD_CACHE="default")
+class DashboardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="cacheuser", password="x")
+        self.link = Link.objects.create(
+            user=self.user, title="Site", url="https://cached.example.com"
+        )
+        self.client.force_login(self.user)
+
+    def load(self):
+        return self.client.get(reverse("dashboard")).context["sites_data"]
+
+    def test_repeat_load_does_no_data_queries(self):
+        self.load()
+        with CaptureQueriesContext(connection) as queries:
+            sites = self.load()
+        tables = " ".join(q["sql"] for q in queries.captured_queries)
+        self.assertNotIn("links_", tables)
+        self.assertEqual(sites[0]["link"].url, self.link.url)
+
+    def test_new_results_invalidate_only_their_owner(self):
+        other = get_user_model().objects.create_user(username="other", password="x")
+        self.load()
+        now = timezone.now()
+        certificate = Certificate.objects.create(
+            fingerprint="1" * 64, not_before=now, not_after=now + timedelta(days=30)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            SSLCheck.objects.create(
+                user=other,
+                link=Link.objects.create(user=other, title="O", url="https://o.com"),
+                certificate=certificate,
+            )
+        self.assertIsNotNone(dashboard_cache.get_sites(self.user.id))
+        with self.captureOnCommitCallbacks(execute=True):
+            check = SSLCheck.objects.create(
+                user=self.user, link=self.link, certificate=certificate
+            )
+            LinkSnapshotService.record_ssl_check(check)
+        self.assertIsNone(dashboard_cache.get_sites(self.user.id))
+        self.assertTrue(self.load()[0]["ssl_status"])
+
+    def test_uptime_status_change_invalidates(self):
+        self.load()
+        self.link.uptime_last_status = "down"
+        with self.captureOnCommitCallbacks(execute=True):
+            LinkSnapshotService.record_uptime([self.link])
+        self.assertIsNone(dashboard_cache.get_sites(self.user.id))
+
+
+class DashboardInvalidationOrderTest(TransactionTestCase):
+    def test_cache_dropped_after_snapshot_rebuild(self):
+        user = get_user_model().objects.create_user(username="order", password="x")
+        link = Link.objects.create(user=user, title="Site", url="https://o.example")
+        for performance, age in ((0.4, 1), (0.7, 0)):
+            results = {
+                s: fake_psi_payload(s, performance) for s in PSIService.STRATEGIES
+            }
+            PSIService.store_report_group(
+                link.url, user, results, fetch_time=timezone.now() - timedelta(days=age)
+            )
+        seen = []
+
+        def invalidate(user_ids):
+            seen.append(LinkSnapshot.objects.get(link=link).psi_performance)
+
+        self.client.force_login(user)
+        newest = PSIReportGroup.objects.order_by("-fetch_time").first()
+        with mock.patch.object(dashboard_cache, "invalidate", side_effect=invalidate):
+            self.client.post(reverse("delete_psi_report_group", args=[newest.id]))
+        self.assertTrue(seen)
+        self.assertEqual(set(seen), {0.4})
+
+
+class CertificateExpiryTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="expiry", password="x")
+        self.client.force_login(self.user)
+        self.add("checked", check_days=5)
+        self.add("labs", check_days=60, labs_days=3)
+        self.add("expired", check_days=-2)
+        self.add("later", check_days=90)
+        Link.objects.create(user=self.user, title="unchecked", url="https://u.test")
+        other = User.objects.create_user(username="other", password="x")
+        self.add("theirs", check_days=1, user=other)
+
+    def add(self, title, check_days, labs_days=None, user=None):
+        user = user or self.user
+        now = timezone.now()
+        link = Link.objects.create(user=user, title=title, url=f"https://{title}.test")
+        check = SSLCheck.objects.create(
+            user=user,
+            link=link,
+            certificate=Certificate.objects.create(
+                fingerprint=hashlib.sha256(title.encode()).hexdigest(),
+                not_after=now + timedelta(days=check_days, hours=1),
+            ),
+        )
+        LinkSnapshotService.record_ssl_check(check)
+        if labs_days is not None:
+            scan = SSLLabsScan.objects.create(
+                user=user,
+                link=link,
+                not_after=now + timedelta(days=labs_days, hours=1),
+            )
+            LinkSnapshotService.record_ssl_labs_scan(scan)
+        return link
+
+    def test_upcoming_expiries_are_sorted_paged_and_scoped(self):
+        response = self.client.get(reverse("certificate_expiry_json"))
+        report = response.json()
+        self.assertEqual(report["days"], 14)
+        self.assertEqual(
+            [row["title"] for row in report["results"]], ["expired", "labs", "checked"]
+        )
+        self.assertEqual([row["days_left"] for row in report["results"]], [-2, 3, 5])
+        self.assertEqual(report["results"][1]["source"], "ssl_labs")
+        self.assertFalse(report["has_next"])
+        report = self.client.get(
+            reverse("certificate_expiry_json"),
+            {"days": "", "page": 2, "per_page": 3},
+        ).json()
+        self.assertEqual([row["title"] for row in report["results"]], ["later"])
+        with self.assertNumQueries(1):
+            rows, has_next = CertificateExpiryService.page(
+                CertificateExpiryService.expiring(self.user, 14), 1, 2
+            )
+            self.assertEqual([r.link.title for r in rows], ["expired", "labs"])
+        self.assertTrue(has_next)
+        response = self.client.get(reverse("certificate_expiry_json"), {"days": "x"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse("certificate_expiry"))
+        self.assertContains(response, "https://labs.test")
+        self.assertNotContains(response, "theirs")
+
+    def test_certificates_of_deleted_links_are_pruned(self):
+        checked = Link.objects.get(title="checked")
+        later = Link.objects.get(title="later")
+        # "later" also presented the certificate of "checked"
+        SSLCheck.objects.create(
+            user=self.user, link=later, certificate=checked.ssl_checks.get().certificate
+        )
+        self.client.post(
+            reverse("bulk_delete_links"),
+            json.dumps({"ids": [checked.id]}),
+            content_type="application/json",
+        )
+        self.assertEqual(Certificate.objects.count(), 5)
+        self.client.post(
+            reverse("bulk_delete_links"),
+            json.dumps({"ids": [later.id]}),
+            content_type="application/json",
+        )
+        self.assertEqual(Certificate.objects.count(), 3)
+
+    def test_failed_check_keeps_the_last_certificate_expiry(self):
+        link = Link.objects.get(title="checked")
+        expected = link.snapshot.ssl_expiry
+        SSLService.store_checks([(link, self.user, {"error": "Timed out"})])
+        snapshot = LinkSnapshot.objects.get(link=link)
+        self.assertFalse(snapshot.ssl_valid)
+        self.assertEqual(snapshot.ssl_errors, "Timed out")
+        self.assertEqual(snapshot.ssl_expiry, expected)
+        self.assertEqual(snapshot.cert_expiry, expected)
+        check = SSLCheck.objects.create(user=self.user, link=link, errors="Refused")
+        LinkSnapshotService.record_ssl_check(check)
+        self.assertEqual(LinkSnapshot.objects.get(link=link).ssl_expiry, expected)
+        LinkSnapshotService.rebuild(link)
+        self.assertEqual(LinkSnapshot.objects.get(link=link).cert_expiry, expected)
+        titles = [
+            snapshot.link.title
+            for snapshot in CertificateExpiryService.expiring(self.user, 14)
+        ]
+        self.assertIn("checked", titles)
+
+    def test_history_renders_certificate_expiry(self):
+        link = Link.objects.get(title="checked")
+        SSLCheck.objects.create(user=self.user, link=link, errors="Timed out")
+        response = self.client.get(reverse("ssl_history", args=[link.id]))
+        expiry = link.ssl_checks.get(certificate__isnull=False).certificate.not_after
+        self.assertContains(response, f"<td>{expiry:%Y-%m-%d}</td>", html=True)
+        self.assertContains(response, "<td>-</td>", html=True)
+
+    def test_rebuild_takes_the_sooner_expiry(self):
+        link = Link.objects.get(title="labs")
+        expected = link.snapshot.cert_expiry
+        LinkSnapshotService.rebuild(link)
+        self.assertEqual(LinkSnapshot.objects.get(link=link).cert_expiry, expected)
+        self.assertEqual(expected, link.ssllabs_scans.get().not_after)
+
+    def test_report_command(self):
+        out = StringIO()
+        call_command("cert_expiry_report", "--days", "2", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn("expired.test", lines[0])
+        self.assertIn("theirs.test", lines[1])
+        self.assertIn("2 certificate(s)", lines[-1])
+        out = StringIO()
+        call_command("cert_expiry_report", "--json", "--user", "other", stdout=out)
+        self.assertEqual(
+            [row["title"] for row in json.loads(out.getvalue())], ["theirs"]
+        )
+        with self.assertRaises(CommandError):
+            call_command(
+                "cert_expiry_report", "--days", "2", "--fail-if-any", stdout=StringIO()
+            )
+
+
+@override_settings(HTTP_BACKOFF_FACTOR=0, HTTP_MAX_RETRIES=2)
+class HTTPClientTest(TestCase):
+    def _response(self, status):
+        return mock.Mock(status_code=status)
+
+    def test_idempotent_call_retried_on_gateway_error(self):
+        session = mock.Mock()
+        session.request.side_effect = [self._response(503), self._response(200)]
+        with mock.patch.object(http_client, "get_session", return_value=session):
+            response = http_client.get("https://example.com/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.request.call_count, 2)
+
+    def test_post_not_retried_by_default(self):
+        session = mock.Mock()
+        session.request.side_effect = [self._response(503), self._response(200)]
+        with mock.patch.object(http_client, "get_session", return_value=session):
+            response = http_client.post("https://example.com/", data={})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(session.request.call_count, 1)
+
+
+class RunPSIBatchCommandTest(TransactionTestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username="batch", password="testpass")
+        for i in range(3):
+            Link.objects.create(user=self.user, title=f"S{i}", url=f"https://s{i}.com")
+        self.checkpoint = os.path.join(tempfile.mkdtemp(), "checkpoint.json")
+
+    def run_batch(self, **options):
+        out = StringIO()
+        call_command(
+            "run_psi_batch",
+            checkpoint=self.checkpoint,
+            stdout=out,
+            stderr=out,
+            **options,
+        )
+        return out.getvalue()
+
+    def test_failed_links_are_retried_on_resume(self):
+        def flaky(url, user):
+            if url == "https://s1.com":
+                raise Exception("quota")
+
+        with mock.patch.object(
+            PSIService, "fetch_and_store_report_group", side_effect=flaky
+        ) as fetch:
+            output = self.run_batch(concurrency=2)
+            self.assertIn("Fetched 2/3", output)
+            self.assertTrue(os.path.exists(self.checkpoint))
+            fetch.side_effect = None
+            fetch.reset_mock()
+            output = self.run_batch(resume=True)
+        fetch.assert_called_once_with("https://s1.com", self.user)
+        self.assertIn("All links fetched.", output)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_ignored_without_resume(self):
+        with open(self.checkpoint, "w") as f:
+            json.dump({"done": list(Link.objects.values_list("id", flat=True))}, f)
+        self.assertIn("3 link(s) would be fetched.", self.run_batch(dry_run=True))
+        output = self.run_batch(dry_run=True, resume=True)
+        self.assertIn("0 link(s) would be fetched.", output)
+
+    def test_filters_by_url(self):
+        output = self.run_batch(url_contains="s2", dry_run=True)
+        self.assertIn("1 link(s) would be fetched.", output)
+
+
+class RunUptimeProbesCommandTest(TransactionTestCase):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == "/ok" else 503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        # A port nothing listens on
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            closed = sock.getsockname()[1]
+        self.user = get_user_model().objects.create_user(username="probe")
+        for name, url, status in [
+            ("ok", f"{base}/ok", "9"),
+            ("down", f"{base}/down", None),
+            ("refused", f"http://127.0.0.1:{closed}/", "9"),
+        ]:
+            Link.objects.create(
+                user=self.user,
+                title=name,
+                url=url,
+                probe_interval=30,
+                uptime_last_status=status,
+            )
+        Link.objects.create(user=self.user, title="remote", url=f"{base}/ok?remote")
+
+    def test_probes_are_stored(self):
+        out = StringIO()
+        call_command("run_uptime_probes", "--once", "--timeout", "2", stdout=out)
+        self.assertIn("3 check(s), 2 down", out.getvalue())
+        statuses = dict(Link.objects.values_list("title", "uptime_last_status"))
+        self.assertEqual(
+            statuses, {"ok": "2", "down": "9", "refused": "9", "remote": None}
+        )
+        # Only state changes become log events; "refused" was already down
+        events = UptimeLog.objects.values_list("link__title", "type", "reason_detail")
+        self.assertEqual(sorted(events), [("down", 1, "HTTP 503"), ("ok", 2, "")])
+        ok = Link.objects.get(title="ok")
+        self.assertEqual(len(UptimeLogService.response_times(ok)[1]), 1)
+        self.assertEqual(ok.snapshot.uptime_status, "2")
+
+    def test_unchanged_status_leaves_the_snapshot_alone(self):
+        link = Link.objects.get(title="ok")
+        received = []
+
+        def receiver(sender, user_ids, **kwargs):
+            received.append(user_ids)
+
+        signals.uptime_status_changed.connect(receiver)
+        self.addCleanup(signals.uptime_status_changed.disconnect, receiver)
+        now = int(time.time())
+        for moment in (now, now + 30):
+            UptimeProbeService.store_results(
+                [probe.ProbeResult(link.id, moment, True, 200, 50, None, False)]
+            )
+        self.assertEqual(received, [[self.user.id]])
+        link.refresh_from_db()
+        self.assertEqual(link.uptime_last_checked.timestamp(), now + 30)
+
+    def test_engine_respects_per_host_limit(self):
+        running = 0
+        peak = 0
+
+        async def fake_check(url, timeout, ssl_context=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return 200, 10, None
+
+        targets = [
+            probe.ProbeTarget(i, "http://same.example/", 30, None) for i in range(20)
+        ]
+        batches = []
+        engine = probe.ProbeEngine(targets, batches.append, per_host=3)
+        with mock.patch.object(probe, "check", side_effect=fake_check):
+            asyncio.run(engine.run(once=True))
+        self.assertEqual(peak, 3)
+        self.assertEqual(sum(len(batch) for batch in batches), 20)
+
+    def test_reload_keeps_the_schedule(self):
+        checked = []
+
+        async def fake_check(url, timeout, ssl_context=None):
+            checked.append(url)
+            return 200, 10, None
+
+        targets = [
+            probe.ProbeTarget(i, f"http://site{i}.example/", 30, None) for i in range(3)
+        ]
+        with mock.patch.object(probe, "check", side_effect=fake_check):
+            with mock.patch.object(probe.random, "uniform", return_value=0):
+                engine = probe.ProbeEngine(targets, lambda batch: None)
+                asyncio.run(engine.run(duration=0.1))
+                self.assertEqual(len(checked), 3)
+                engine.set_targets(
+                    targets[1:]
+                    + [probe.ProbeTarget(3, "http://new.example/", 30, None)]
+                )
+                asyncio.run(engine.run(duration=0.1))
+        # Existing links are not due again until their interval has passed
+        self.assertEqual(checked[3:], ["http://new.example/"])
+        self.assertEqual(sorted(engine._due), [1, 2, 3])
+        self.assertNotIn(0, engine.state)
+
+    def test_empty_reload_waits_for_the_duration(self):
+        engine = probe.ProbeEngine(
+            [probe.ProbeTarget(1, "http://site.example/", 30, None)],
+            lambda batch: None,
+        )
+        engine.set_targets([])
+        started = time.monotonic()
+        asyncio.run(engine.run(duration=0.2))
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        self.assertEqual(engine.checks, 0)
+
+
+def self_signed_certificate(hostname="localhost", days=30):
+    """A (cert PEM, key PEM) pair for local TLS servers in tests."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, hostname)])
+    now = timezone.now()
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=days))
+        .add_extension(
+            x509.SubjectAlternativeName([x509.DNSName(hostname)]), critical=False
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    return (
+        cert.public_bytes(serialization.Encoding.PEM),
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ),
+    )
+
+
+def certificate_chain(hostname="localhost", key_size=2048):
+    """
+    A (leaf + CA chain PEM, leaf key PEM, CA cert PEM) triple. The RSA leaf
+    carries SAN, OCSP and CRL URLs and is signed by a throwaway CA.
+    """
+    import ipaddress
+
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    from cryptography.x509.oid import AuthorityInformationAccessOID, NameOID
+
+    ca_key = ec.generate_private_key(ec.SECP256R1())
+    ca_name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Test CA")])
+    now = timezone.now()
+    ca = (
+        x509.CertificateBuilder()
+        .subject_name(ca_name)
+        .issuer_name(ca_name)
+        .public_key(ca_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=365))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(ca_key, hashes.SHA256())
+    )
+    key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    leaf = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, hostname)]))
+        .issuer_name(ca_name)
+        .public_key(key.public_key())
+        .serial_number(0xABCDEF)
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=90))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [
+                    x509.DNSName(hostname),
+                    x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+                ]
+            ),
+            critical=False,
+        )
+        .add_extension(
+            x509.AuthorityInformationAccess(
+                [
+                    x509.AccessDescription(
+                        AuthorityInformationAccessOID.OCSP,
+                        x509.UniformResourceIdentifier("http://ocsp.test"),
+                    )
+                ]
+            ),
+            critical=False,
+        )
+        .add_extension(
+            x509.CRLDistributionPoints(
+                [
+                    x509.DistributionPoint(
+                        [x509.UniformResourceIdentifier("http://crl.test/ca.crl")],
+                        None,
+                        None,
+                        None,
+                    )
+                ]
+            ),
+            critical=False,
+        )
+        .sign(ca_key, hashes.SHA256())
+    )
+    ca_pem = ca.public_bytes(serialization.Encoding.PEM)
+    return (
+        leaf.public_bytes(serialization.Encoding.PEM) + ca_pem,
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ),
+        ca_pem,
+    )
+
+
+class TLSServer:
+    """A local TLS endpoint that counts handshakes."""
+
+    def __init__(self, cert_pem, key_pem):
+        directory = tempfile.mkdtemp()
+        self.cert_file = os.path.join(directory, "cert.pem")
+        key_file = os.path.join(directory, "key.pem")
+        with open(self.cert_file, "wb") as f:
+            f.write(cert_pem)
+        with open(key_file, "wb") as f:
+            f.write(key_pem)
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(self.cert_file, key_file)
+        self.handshakes = 0
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        self.context = context
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            try:
+                with self.context.wrap_socket(conn, server_side=True):
+                    self.handshakes += 1
+            except (OSError, ssl.SSLError):
+                pass
+
+    def close(self):
+        self.sock.close()
+
+
+class SSLSweepTest(TransactionTestCase):
+    def setUp(self):
+        self.server = TLSServer(*self_signed_certificate())
+        self.addCleanup(self.server.close)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            closed = sock.getsockname()[1]
+        self.user = get_user_model().objects.create_user(username="sweeper")
+        for path in ("a", "b"):
+            Link.objects.create(
+                user=self.user,
+                title=path,
+                url=f"https://localhost:{self.server.port}/{path}",
+            )
+        Link.objects.create(
+            user=self.user, title="down", url=f"https://localhost:{closed}/"
+        )
+
+    def test_each_host_checked_once_and_failures_stored(self):
+        sweep = ssl_sweep.Sweep(
+            Link.objects.select_related("user"),
+            SSLService.store_checks,
+            timeout=2,
+            cafile=self.server.cert_file,
+        )
+        ssl_sweep.run(sweep)
+        self.assertEqual(self.server.handshakes, 1)
+        self.assertEqual(sweep.checks, 3)
+        self.assertEqual(len(sweep.failures), 1)
+        checks = {
+            c.link.title: c
+            for c in SSLCheck.objects.select_related("link", "certificate")
+        }
+        certificate = checks["a"].certificate
+        self.assertEqual(checks["a"].errors, "")
+        self.assertEqual(Certificate.objects.count(), 1)
+        self.assertEqual(checks["b"].certificate, certificate)
+        self.assertEqual(certificate.subject, "commonName=localhost")
+        self.assertEqual(certificate.san, "localhost")
+        self.assertTrue(certificate.is_self_signed)
+        self.assertEqual(
+            certificate.fingerprint,
+            hashlib.sha256(ssl.PEM_cert_to_DER_cert(certificate.pem)).hexdigest(),
+        )
+        self.assertGreater(certificate.not_after, timezone.now() + timedelta(days=29))
+        self.assertIsNone(checks["down"].certificate)
+        self.assertTrue(checks["down"].errors)
+        snapshot = Link.objects.get(title="down").snapshot
+        self.assertFalse(snapshot.ssl_valid)
+        self.assertEqual(
+            Link.objects.get(title="a").snapshot.ssl_expiry, certificate.not_after
+        )
+
+    def test_known_certificate_is_not_parsed_again(self):
+        cafile = self.server.cert_file
+        links = Link.objects.select_related("user").exclude(title="down")
+        ssl_sweep.run(
+            ssl_sweep.Sweep(links, SSLService.store_checks, timeout=2, cafile=cafile)
+        )
+        with mock.patch.object(
+            SSLService, "parse_certificate", wraps=SSLService.parse_certificate
+        ) as parse:
+            ssl_sweep.run(
+                ssl_sweep.Sweep(
+                    links, SSLService.store_checks, timeout=2, cafile=cafile
+                )
+            )
+        parse.assert_not_called()
+        self.assertEqual(SSLCheck.objects.count(), 4)
+        self.assertEqual(Certificate.objects.count(), 1)
+
+    def test_untrusted_certificates_are_stored_with_the_error(self):
+        expired = TLSServer(*self_signed_certificate(days=0))
+        self.addCleanup(expired.close)
+        Link.objects.create(
+            user=self.user,
+            title="expired",
+            url=f"https://localhost:{expired.port}/",
+        )
+        Link.objects.create(
+            user=self.user,
+            title="mismatch",
+            url=f"https://127.0.0.1:{self.server.port}/",
+        )
+        # The system trust store does not know the self-signed certificates
+        ssl_sweep.run(
+            ssl_sweep.Sweep(
+                Link.objects.select_related("user"), SSLService.store_checks, timeout=2
+            )
+        )
+        checks = {
+            c.link.title: c
+            for c in SSLCheck.objects.select_related("link", "certificate")
+        }
+        self.assertTrue(checks["a"].certificate.is_self_signed)
+        self.assertTrue(
+            checks["a"].errors.startswith("Certificate verification failed")
+        )
+        self.assertTrue(checks["expired"].is_expired)
+        self.assertEqual(checks["expired"].warnings, "Certificate is expired.")
+        self.assertIsNotNone(checks["expired"].certificate)
+        self.assertEqual(checks["mismatch"].certificate, checks["a"].certificate)
+        self.assertIn("subjectAltName", checks["mismatch"].errors)
+        snapshot = Link.objects.get(title="expired").snapshot
+        self.assertFalse(snapshot.ssl_valid)
+        self.assertEqual(snapshot.ssl_expiry, checks["expired"].certificate.not_after)
+
+    def test_command_logs_store_failures_and_continues(self):
+        err = StringIO()
+        with mock.patch.object(
+            SSLService, "store_checks", side_effect=Exception("database is locked")
+        ):
+            call_command(
+                "sweep_ssl",
+                "--timeout",
+                "2",
+                "--batch-size",
+                "1",
+                stdout=StringIO(),
+                stderr=err,
+            )
+        # One batch per host, and the sweep went on after the first failed
+        self.assertEqual(err.getvalue().count(": database is locked"), 2)
+
+    def test_presented_chain_is_parsed_from_memory(self):
+        chain_pem, key_pem, ca_pem = certificate_chain()
+        server = TLSServer(chain_pem, key_pem)
+        self.addCleanup(server.close)
+        link = Link.objects.create(
+            user=self.user, title="chain", url=f"https://localhost:{server.port}/"
+        )
+        from cryptography import x509
+
+        store = certificates.Store(x509.load_pem_x509_certificates(ca_pem))
+        with mock.patch.object(certificates, "trust_store", return_value=store):
+            check = SSLService.check_certificate(link, self.user)
+        self.assertEqual(check.errors, "")
+        self.assertEqual(check.chain_count, 2)
+        certificate = Certificate.objects.get(checks=check)
+        self.assertEqual(certificate.issuer, "commonName=Test CA")
+        self.assertEqual(certificate.serial_number, "ABCDEF")
+        self.assertEqual(certificate.version, "3")
+        self.assertEqual(certificate.san, "localhost,127.0.0.1")
+        self.assertEqual(certificate.signature_algorithm, "ecdsa-with-SHA256")
+        self.assertEqual(
+            (certificate.public_key_type, certificate.public_key_bits), ("RSA", 2048)
+        )
+        self.assertEqual(certificate.ocsp_url, "http://ocsp.test")
+        self.assertEqual(certificate.crl_url, "http://crl.test/ca.crl")
+        self.assertFalse(certificate.is_self_signed)
+        self.assertFalse(certificate.is_short_key or certificate.is_weak_signature)
+        self.assertEqual(Link.objects.get(id=link.id).snapshot.ssl_valid, True)
+
+
+class CertificateParseTest(TestCase):
+    def test_short_key_is_flagged(self):
+        chain_pem = certificate_chain(key_size=1024)[0].decode()
+        leaf = ssl.PEM_cert_to_DER_cert(chain_pem[: chain_pem.index("-----BEGIN", 1)])
+        fields = certificates.parse(leaf)
+        self.assertEqual(fields["public_key_bits"], 1024)
+        self.assertTrue(fields["is_short_key"])
+        self.assertFalse(fields["is_weak_signature"])
+        user = get_user_model().objects.create_user(username="weak")
+        link = Link.objects.create(user=user, title="w", url="https://w.test")
+        check = SSLService.store_checks([(link, user, {"chain": [leaf]})])[0]
+        self.assertEqual(check.warnings, "Short RSA key (1024 bits).")
+
+    def test_malformed_certificate_is_recorded_as_error(self):
+        user = get_user_model().objects.create_user(username="bad")
+        link = Link.objects.create(user=user, title="b", url="https://b.test")
+        check = SSLService.store_checks([(link, user, {"chain": [b"junk"]})])[0]
+        self.assertIsNone(check.certificate)
+        self.assertEqual(check.errors, "Certificate could not be parsed.")
+        self.assertFalse(Certificate.objects.exists())
+
+
+@override_settings(API_QUOTAS={"psi": {"per_second": 1, "per_day": 2}})
+class QuotaTest(TestCase):
+    def setUp(self):
+        caches[settings.API_QUOTA_CACHE].clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username="quota", password="testpass")
+        self.key = UserAPIKey.objects.create(user=self.user, service="psi", key="k")
+
+    @override_settings(API_QUOTAS={"uptimerobot": {"per_minute": 10}})
+    def test_per_minute_bucket_allows_a_burst(self):
+        key = UserAPIKey.objects.create(user=self.user, service="uptimerobot", key="u")
+        for _ in range(10):
+            quota.acquire(key, max_wait=0)
+        with self.assertRaises(quota.QuotaExceeded):
+            quota.acquire(key, max_wait=0)
+        self.assertEqual(quota.rate_limit({"per_minute": 10, "burst": 2}), (1 / 6, 2))
+
+    def test_per_second_bucket_blocks(self):
+        quota.acquire(self.key, max_wait=0)
+        with self.assertRaises(quota.QuotaExceeded):
+            quota.acquire(self.key, max_wait=0)
+
+    def test_daily_bucket_exhausted(self):
+        quota.acquire(self.key)
+        quota.acquire(self.key)
+        with self.assertRaisesMessage(quota.QuotaExceeded, "Daily"):
+            quota.acquire(self.key)
+
+    def test_throttled_key_backs_off(self):
+        quota.throttled(self.key)
+        with self.assertRaisesMessage(quota.QuotaExceeded, "rate limiting"):
+            quota.acquire(self.key, max_wait=0)
+
+    @override_settings(
+        API_QUOTAS={"psi": {"per_second": 1, "per_day": 10}}, API_QUOTA_MAX_WAIT=0
+    )
+    def test_unused_token_returned_when_a_group_cannot_start(self):
+        with mock.patch.object(PSIService, "fetch_report") as fetch:
+            with self.assertRaises(quota.QuotaExceeded):
+                PSIService.fetch_strategies("https://example.com", self.user)
+        fetch.assert_not_called()
+        quota.acquire(self.key, max_wait=0)
+
+    def test_usage_flushed_in_batches(self):
+        quota.record_usage(self.key)
+        quota.record_usage(self.key)
+        quota.flush_usage(force=True)
+        self.key.refresh_from_db()
+        self.assertEqual(self.key.usage, 2)
+        self.assertIsNotNone(self.key.last_checked)
+
+
+class StreamedBodyTest(TestCase):
+    def test_only_selected_fields_decoded(self):
+        document = fake_psi_payload("mobile")
+        document["lighthouseResult"]["fullPageScreenshot"] = {"data": "x" * 10000}
+        body = json.dumps(document).encode("utf-8")
+        chunks = [body[i : i + 100] for i in range(0, len(body), 100)]
+        streamed = StreamedBody.from_chunks(chunks, PSI_FIELDS)
+        self.assertNotIn("fullPageScreenshot", streamed.data["lighthouseResult"])
+        self.assertEqual(
+            streamed.data["lighthouseResult"]["audits"],
+            document["lighthouseResult"]["audits"],
+        )
+        self.assertEqual(streamed.size, len(body))
+        self.assertEqual(zlib.decompress(streamed.compressed), body)
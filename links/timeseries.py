@@ -0,0 +1,93 @@
+"""Packed storage for uptime response times.
+
+UptimeRobot reports a response time every few minutes per monitor, so one row
+per sample grows by millions of rows a month. Samples are instead kept in one
+``UptimeResponseChunk`` per link and UTC day. The chunk holds two
+little-endian int32 arrays: seconds since the day's midnight and the response
+time in milliseconds. That is 8 bytes a sample, with no per-row overhead or
+index entry. The helpers here pack and unpack chunks, and decode a window of
+chunks straight into NumPy arrays for statistics and charts.
+"""
+
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+
+import numpy as np
+
+DTYPE = np.dtype("<i4")
+DAY_SECONDS = 86400
+
+
+def pack(values):
+    return np.asarray(values, dtype=DTYPE).tobytes()
+
+
+def unpack(blob):
+    return np.frombuffer(bytes(blob or b""), dtype=DTYPE)
+
+
+def day_start(day):
+    """Unix seconds of midnight UTC starting ``day``."""
+    return int(datetime.combine(day, time.min, tzinfo=dt_timezone.utc).timestamp())
+
+
+def epoch(moment):
+    return int(moment.timestamp())
+
+
+def split_by_day(times, values):
+    """
+    Group samples (Unix seconds, milliseconds) by UTC day. Returns
+    ``{day: (offsets, values)}`` with the offsets in seconds since midnight.
+    """
+    times = np.asarray(times, dtype=np.int64)
+    values = np.asarray(values, dtype=np.int64)
+    days = times // DAY_SECONDS
+    groups = {}
+    for day_number in np.unique(days):
+        mask = days == day_number
+        day = datetime(1970, 1, 1).date() + timedelta(days=int(day_number))
+        groups[day] = (times[mask] - day_number * DAY_SECONDS, values[mask])
+    return groups
+
+
+def merge(chunk, offsets, values):
+    """
+    Add samples to ``chunk`` in place. Existing samples win over new ones at
+    the same second, and the result is kept sorted by time.
+    """
+    all_offsets = np.concatenate([unpack(chunk.offsets), offsets])
+    all_values = np.concatenate([unpack(chunk.values), values])
+    # np.unique keeps the first occurrence, i.e. the stored sample
+    all_offsets, first = np.unique(all_offsets, return_index=True)
+    all_values = all_values[first]
+    chunk.offsets = pack(all_offsets)
+    chunk.values = pack(all_values)
+    chunk.count = len(all_offsets)
+    chunk.min_value = int(all_values.min()) if len(all_values) else None
+    chunk.max_value = int(all_values.max()) if len(all_values) else None
+    chunk.total = int(all_values.sum(dtype=np.int64))
+    return chunk
+
+
+def decode(chunks, start=None, end=None):
+    """
+    Concatenate chunks into ``(times, values)`` arrays of Unix seconds (int64)
+    and milliseconds (int32), sorted by time. ``start``/``end`` are Unix
+    seconds; samples outside ``[start, end)`` are dropped.
+    """
+    times = []
+    values = []
+    for chunk in sorted(chunks, key=lambda chunk: chunk.day):
+        times.append(unpack(chunk.offsets).astype(np.int64) + day_start(chunk.day))
+        values.append(unpack(chunk.values))
+    if not times:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=DTYPE)
+    times = np.concatenate(times)
+    values = np.concatenate(values)
+    keep = np.ones(len(times), dtype=bool)
+    if start is not None:
+        keep &= times >= start
+    if end is not None:
+        keep &= times < end
+    return times[keep], values[keep]
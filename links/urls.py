@@ -14,6 +14,16 @@ urlpatterns = [
         "sites/<int:link_id>/reports/", views.psi_reports_list, name="psi_reports_list"
     ),
     path("reports/<int:report_id>/", views.psi_report_detail, name="psi_report_detail"),
+    path(
+        "reports/<int:report_id>/audits/<int:audit_id>/details/",
+        views.psi_audit_details,
+        name="psi_audit_details",
+    ),
+    path(
+        "reports/<int:report_id>/export/json/",
+        views.export_psi_report_json,
+        name="export_psi_report_json",
+    ),
     path(
         "reports/<int:report_id>/delete/",
         views.delete_psi_report,
@@ -77,5 +87,23 @@ urlpatterns = [
         views.ssl_labs_history,
         name="ssl_labs_history",
     ),
+    path("sites/<int:link_id>/series/psi/", views.psi_series, name="psi_series"),
+    path(
+        "sites/<int:link_id>/series/uptime/",
+        views.uptime_series,
+        name="uptime_series",
+    ),
+    path("sites/<int:link_id>/series/ssl/", views.ssl_series, name="ssl_series"),
+    path(
+        "sites/<int:link_id>/series/ssl-labs/",
+        views.ssl_labs_series,
+        name="ssl_labs_series",
+    ),
+    path("certificates/expiry/", views.certificate_expiry, name="certificate_expiry"),
+    path(
+        "certificates/expiry/json/",
+        views.certificate_expiry_json,
+        name="certificate_expiry_json",
+    ),
     path("settings/", views.settings_view, name="settings"),
 ]
@@ -1,23 +1,48 @@
 import csv
+import hashlib
 import json
 from datetime import datetime, timedelta
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import PasswordChangeForm
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import transaction
 from django.db.models import Avg, Max, Min
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django_filters import CharFilter, FilterSet
 
+from . import analytics, dashboard_cache, downsample, series
 from .forms import APIKeyForm
-from .models import Link, Page, PSIReport, PSIReportGroup, UserAPIKey
-from .services import PSIService, SSLLabsService, SSLService, UptimeRobotService
+from .models import (
+    Audit,
+    Link,
+    LinkSnapshot,
+    Page,
+    PSIReport,
+    PSIReportGroup,
+    SSLCheck,
+    UserAPIKey,
+)
+from .services import (
+    CertificateExpiryService,
+    LinkSnapshotService,
+    PSIRollupService,
+    PSIService,
+    SSLLabsService,
+    SSLService,
+    UptimeLogService,
+    UptimeRobotService,
+)
 
 
 class LinkFilter(FilterSet):
@@ -37,14 +62,23 @@ def home(request):
 @require_POST
 def fetch_psi_report(request, link_id):
     link = get_object_or_404(Link, id=link_id, user=request.user)
+    max_age = request.POST.get("max_age")
     try:
         group, mobile_report, desktop_report = PSIService.fetch_and_store_report_group(
-            link.url, user=request.user
+            link.url,
+            user=request.user,
+            max_age=int(max_age) if max_age not in (None, "") else None,
         )
         return JsonResponse(
             {
                 "status": "success",
-                "message": "PSI reports fetched and stored successfully",
+                "message": (
+                    "Recent PSI reports served from cache"
+                    if group.from_cache
+                    else "PSI reports fetched and stored successfully"
+                ),
+                "from_cache": group.from_cache,
+                "fetch_time": group.fetch_time.isoformat(),
                 "group_id": group.id,
                 "mobile_report_id": mobile_report.id,
                 "desktop_report_id": desktop_report.id,
@@ -54,11 +88,42 @@ def fetch_psi_report(request, link_id):
         return JsonResponse({"status": "error", "message": str(e)}, status=400)
 
 
+def _rebuild_snapshots(page):
+    if page is not None:
+        for link in Link.objects.filter(user=page.user, url=page.url):
+            LinkSnapshotService.rebuild(link)
+
+
+def _details_digests(audits):
+    """Digests of the details blobs ``audits`` use, to prune after deleting them."""
+    return set(
+        audits.filter(details_blob__isnull=False).values_list(
+            "details_blob_id", flat=True
+        )
+    )
+
+
+def _certificate_ids(checks):
+    """Certificates ``checks`` use, to prune after deleting them."""
+    return set(
+        checks.filter(certificate__isnull=False).values_list(
+            "certificate_id", flat=True
+        )
+    )
+
+
 @login_required
 @require_POST
 def delete_psi_report(request, report_id):
     report = get_object_or_404(PSIReport, id=report_id, user=request.user)
-    report.delete()
+    digests = _details_digests(report.audits.all())
+    # Commit the delete with the rebuilt rollups and snapshots, so the cached
+    # dashboard is only invalidated once they are current
+    with transaction.atomic():
+        report.delete()
+        PSIRollupService.rebuild(report.page, [report.fetch_time])
+        _rebuild_snapshots(report.page)
+    PSIService.prune_audit_details(digests)
     return JsonResponse({"status": "success"})
 
 
@@ -69,8 +134,9 @@ def psi_reports_list(request, link_id):
     reports = (
         page.psi_reports.filter(user=request.user) if page else PSIReport.objects.none()
     )
-    mobile_reports = reports.filter(strategy="mobile")
-    desktop_reports = reports.filter(strategy="desktop")
+    listed = reports.select_related("group", "category_scores")
+    mobile_reports = listed.filter(strategy="mobile")
+    desktop_reports = listed.filter(strategy="desktop")
     paginator = Paginator(reports, 10)  # 10 reports per page
     page_number = request.GET.get("page")
     try:
@@ -80,91 +146,33 @@ def psi_reports_list(request, link_id):
     except EmptyPage:
         page_obj = paginator.page(paginator.num_pages)
 
+    # Trend and compare analytics are read from the daily rollups
+    granularity = request.GET.get("granularity")
+    if granularity not in PSIRollupService.GRANULARITIES:
+        granularity = "day"
+    target = downsample.target_points(request.GET.get("points"))
+
+    def thin(stats):
+        for strategy in PSIService.STRATEGIES:
+            stats[strategy]["points"] = downsample.downsample_rows(
+                stats[strategy]["points"], "performance", target
+            )
+        return stats
+
     # Trend analytics
     trend_start = request.GET.get("trend_start")
     trend_end = request.GET.get("trend_end")
     trend_data = None
     if trend_start and trend_end:
-        trend_start_dt = datetime.strptime(trend_start, "%Y-%m-%d")
-        trend_end_dt = datetime.strptime(trend_end, "%Y-%m-%d") + timedelta(days=1)
-        trend_reports = reports.filter(
-            fetch_time__gte=trend_start_dt, fetch_time__lt=trend_end_dt
+        trend_data = thin(
+            PSIRollupService.window_stats(
+                page,
+                datetime.strptime(trend_start, "%Y-%m-%d").date(),
+                datetime.strptime(trend_end, "%Y-%m-%d").date(),
+                granularity,
+            )
         )
 
-        def get_stats(qs):
-            return {
-                "avg": qs.aggregate(
-                    performance=Avg("category_scores__performance"),
-                    accessibility=Avg("category_scores__accessibility"),
-                    best_practices=Avg("category_scores__best_practices"),
-                    seo=Avg("category_scores__seo"),
-                ),
-                "min": qs.aggregate(
-                    performance=Min("category_scores__performance"),
-                    accessibility=Min("category_scores__accessibility"),
-                    best_practices=Min("category_scores__best_practices"),
-                    seo=Min("category_scores__seo"),
-                ),
-                "max": qs.aggregate(
-                    performance=Max("category_scores__performance"),
-                    accessibility=Max("category_scores__accessibility"),
-                    best_practices=Max("category_scores__best_practices"),
-                    seo=Max("category_scores__seo"),
-                ),
-                "points": [
-                    {
-                        "date": r.fetch_time.strftime("%Y-%m-%d %H:%M"),
-                        "performance": (
-                            r.category_scores.performance
-                            if hasattr(r, "category_scores") and r.category_scores
-                            else None
-                        ),
-                        "accessibility": (
-                            r.category_scores.accessibility
-                            if hasattr(r, "category_scores") and r.category_scores
-                            else None
-                        ),
-                        "best_practices": (
-                            r.category_scores.best_practices
-                            if hasattr(r, "category_scores") and r.category_scores
-                            else None
-                        ),
-                        "seo": (
-                            r.category_scores.seo
-                            if hasattr(r, "category_scores") and r.category_scores
-                            else None
-                        ),
-                        "strategy": r.strategy,
-                        "fcp": (
-                            r.field_metrics.fcp_ms
-                            if hasattr(r, "field_metrics") and r.field_metrics
-                            else None
-                        ),
-                        "lcp": (
-                            r.field_metrics.lcp_ms
-                            if hasattr(r, "field_metrics") and r.field_metrics
-                            else None
-                        ),
-                        "cls": (
-                            r.field_metrics.cls
-                            if hasattr(r, "field_metrics") and r.field_metrics
-                            else None
-                        ),
-                        "ttfb": (
-                            r.field_metrics.ttfb_ms
-                            if hasattr(r, "field_metrics") and r.field_metrics
-                            else None
-                        ),
-                    }
-                    for r in qs.order_by("fetch_time")
-                ],
-            }
-
-        trend_data = {
-            "mobile": get_stats(trend_reports.filter(strategy="mobile")),
-            "desktop": get_stats(trend_reports.filter(strategy="desktop")),
-        }
-
     # Compare analytics
     compare_start1 = request.GET.get("compare_start1")
     compare_end1 = request.GET.get("compare_end1")
@@ -179,11 +187,18 @@ def psi_reports_list(request, link_id):
             period_reports = reports.filter(
                 fetch_time__gte=start_dt, fetch_time__lt=end_dt
             )
-            return {
-                "mobile": get_stats(period_reports.filter(strategy="mobile")),
-                "desktop": get_stats(period_reports.filter(strategy="desktop")),
-                "reports": period_reports.order_by("fetch_time"),
-            }
+            stats = thin(
+                PSIRollupService.window_stats(
+                    page,
+                    start_dt.date(),
+                    end_dt.date() - timedelta(days=1),
+                    granularity,
+                )
+            )
+            stats["reports"] = period_reports.select_related(
+                "category_scores", "field_metrics"
+            ).order_by("fetch_time")
+            return stats
 
         compare_data = {
             "period1": get_period_stats(compare_start1, compare_end1),
@@ -207,6 +222,9 @@ def psi_reports_list(request, link_id):
             "compare_end1": compare_end1,
             "compare_start2": compare_start2,
             "compare_end2": compare_end2,
+            "granularity": granularity,
+            "granularities": PSIRollupService.GRANULARITIES,
+            "points": target,
         },
     )
 
@@ -217,7 +235,7 @@ def psi_report_detail(request, report_id):
     field_metrics = getattr(report, "field_metrics", None)
     lab_metrics = getattr(report, "lab_metrics", None)
     category_scores = getattr(report, "category_scores", None)
-    audits = report.audits.all()
+    audits = report.audits.select_related("definition")
     return render(
         request,
         "links/psi_report_detail.html",
@@ -231,12 +249,42 @@ def psi_report_detail(request, report_id):
     )
 
 
+@login_required
+def psi_audit_details(request, report_id, audit_id):
+    audit = get_object_or_404(
+        Audit.objects.select_related("details_blob"),
+        id=audit_id,
+        psi_report_id=report_id,
+        psi_report__user=request.user,
+    )
+    return JsonResponse({"audit_key": audit.audit_key, "details": audit.details})
+
+
+@login_required
+def export_psi_report_json(request, report_id):
+    report = get_object_or_404(PSIReport, id=report_id, user=request.user)
+    raw_json = report.load_raw_json()
+    if raw_json is None:
+        return JsonResponse(
+            {"status": "error", "message": "No raw data stored for this report."},
+            status=404,
+        )
+    response = JsonResponse(raw_json)
+    response["Content-Disposition"] = (
+        f'attachment; filename="psi_report_{report_id}.json"'
+    )
+    return response
+
+
 @login_required
 @require_POST
 def bulk_delete_links(request):
     data = json.loads(request.body)
     ids = data.get("ids", [])
-    Link.objects.filter(id__in=ids, user=request.user).delete()
+    links = Link.objects.filter(id__in=ids, user=request.user)
+    certificates = _certificate_ids(SSLCheck.objects.filter(link__in=links))
+    links.delete()
+    SSLService.prune_certificates(certificates)
     return JsonResponse({"status": "success"})
 
 
@@ -310,7 +358,12 @@ def export_links_csv(request):
 @require_POST
 def delete_psi_report_group(request, group_id):
     group = get_object_or_404(PSIReportGroup, id=group_id, user=request.user)
-    group.delete()
+    digests = _details_digests(Audit.objects.filter(psi_report__group=group))
+    with transaction.atomic():
+        group.delete()
+        PSIRollupService.rebuild(group.page, [group.fetch_time])
+        _rebuild_snapshots(group.page)
+    PSIService.prune_audit_details(digests)
     return JsonResponse({"status": "success"})
 
 
@@ -357,82 +410,52 @@ def import_links_json(request):
         return JsonResponse({"status": "error", "message": str(e)}, status=400)
 
 
-@login_required
-def dashboard(request):
-    links = Link.objects.filter(user=request.user)
+def _dashboard_sites(user):
+    # Fetch live uptime status, for every link in one batched call
+    links = UptimeRobotService.refresh_statuses(
+        user, Link.objects.filter(user=user).select_related("snapshot")
+    )
     sites_data = []
     for link in links:
-        # Always fetch live uptime status
-        try:
-            UptimeRobotService.get_monitor_status(link, request.user)
-        except Exception:
-            link.uptime_last_status = "error"
-            link.save(update_fields=["uptime_last_status"])
-        last_psi = (
-            PSIReport.objects.filter(page__url=link.url, user=request.user)
-            .order_by("-fetch_time")
-            .first()
-        )
-        # SSL: get latest local and SSL Labs results
-        last_ssl = link.ssl_checks.order_by("-checked_at").first()
-        last_ssl_labs = link.ssllabs_scans.order_by("-scanned_at").first()
-        ssl_status = None
-        ssl_last_checked = None
-        ssl_expiry = None
-        ssl_warnings = None
-        ssl_errors = None
-        ssl_grade = None
-        ssl_labs_status = None
-        if last_ssl:
-            ssl_status = (
-                not last_ssl.is_expired
-                and not last_ssl.is_self_signed
-                and not last_ssl.errors
-            )
-            ssl_last_checked = last_ssl.checked_at
-            ssl_expiry = last_ssl.not_after
-            ssl_warnings = last_ssl.warnings
-            ssl_errors = last_ssl.errors
-        if last_ssl_labs:
-            ssl_grade = last_ssl_labs.grade
-            ssl_labs_status = last_ssl_labs.status
-        uptime_status = None
-        uptime_last_checked = None
-        sec_headers_status = None
-        sec_headers_last_checked = None
+        snapshot = getattr(link, "snapshot", None) or LinkSnapshot(link=link)
         sites_data.append(
             {
                 "link": link,
-                "psi_status": (
-                    last_psi.raw_json["lighthouseResult"]["categories"]["performance"][
-                        "score"
-                    ]
-                    if last_psi and last_psi.raw_json
-                    else None
-                ),
-                "psi_last_checked": last_psi.fetch_time if last_psi else None,
-                "ssl_status": ssl_status,
-                "ssl_last_checked": ssl_last_checked,
-                "ssl_expiry": ssl_expiry,
-                "ssl_warnings": ssl_warnings,
-                "ssl_errors": ssl_errors,
-                "ssl_grade": ssl_grade,
-                "ssl_labs_status": ssl_labs_status,
-                "uptime_status": uptime_status,
-                "uptime_last_checked": uptime_last_checked,
-                "sec_headers_status": sec_headers_status,
-                "sec_headers_last_checked": sec_headers_last_checked,
+                "psi_status": snapshot.psi_performance,
+                "psi_last_checked": snapshot.psi_fetched_at,
+                "ssl_status": snapshot.ssl_valid,
+                "ssl_last_checked": snapshot.ssl_checked_at,
+                "ssl_expiry": snapshot.ssl_expiry,
+                "ssl_warnings": snapshot.ssl_warnings or None,
+                "ssl_errors": snapshot.ssl_errors or None,
+                "ssl_grade": snapshot.ssl_labs_grade or None,
+                "ssl_labs_status": snapshot.ssl_labs_status or None,
+                "uptime_status": None,
+                "uptime_last_checked": None,
+                "sec_headers_status": None,
+                "sec_headers_last_checked": None,
             }
         )
+    return sites_data
+
+
+@login_required
+def dashboard(request):
+    sites_data = dashboard_cache.get_sites(request.user.id)
+    if sites_data is None:
+        sites_data = _dashboard_sites(request.user)
+        dashboard_cache.store_sites(request.user.id, sites_data)
     return render(request, "links/dashboard.html", {"sites_data": sites_data})
 
 
 @login_required
 def site_detail(request, link_id):
     link = get_object_or_404(Link, id=link_id, user=request.user)
-    psi_reports = PSIReport.objects.filter(
-        page__url=link.url, user=request.user
-    ).order_by("-fetch_time")
+    psi_reports = (
+        PSIReport.objects.filter(page__url=link.url, user=request.user)
+        .select_related("category_scores")
+        .order_by("-fetch_time")
+    )
     # Placeholders for future features
     ssl_results = None
     uptime_results = None
@@ -504,7 +527,11 @@ def profile(request):
                 password_updated = True
                 messages.success(request, "Password updated successfully.")
         elif "delete_account" in request.POST:
+            digests = _details_digests(Audit.objects.filter(psi_report__user=user))
+            certificates = _certificate_ids(SSLCheck.objects.filter(user=user))
             user.delete()
+            PSIService.prune_audit_details(digests)
+            SSLService.prune_certificates(certificates)
             messages.success(request, "Your account has been deleted.")
             return redirect("home")
     return render(
@@ -614,150 +641,74 @@ def uptime_feature_run(request, link_id):
     return render(request, "links/uptime_feature_run.html", context)
 
 
+def _sync_uptime(link, user):
+    """Pull new uptime logs before serving local data; returns an error or None."""
+    try:
+        UptimeRobotService.sync_history(link, user)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def _uptime_period_stats(link, start, end):
+    start, end = series.window_bounds(series.parse_date(start), series.parse_date(end))
+    times, statuses = UptimeLogService.log_events(link, start, end)
+    _, response_times = UptimeLogService.response_times(link, start, end)
+    # The last event lasts until the end of the window, or until now
+    close = min(end, timezone.now()) if end else timezone.now()
+    stats = analytics.summarize(times, statuses, response_times, close.timestamp())
+    stats["logs"] = link.uptime_logs.filter(
+        datetime__gte=start, datetime__lt=end
+    ).order_by("datetime")
+    return stats
+
+
 @login_required
 def uptime_history(request, link_id):
     link = get_object_or_404(Link, id=link_id, user=request.user)
+    error = _sync_uptime(link, request.user)
     try:
-        monitor = UptimeRobotService.get_monitor_status(link, request.user)
-        logs = monitor.get("logs", [])
+        logs = link.uptime_logs.all()
         # Filtering
         log_type = request.GET.get("type")
         if log_type:
-            logs = [log for log in logs if str(log.get("type")) == log_type]
+            logs = logs.filter(type=int(log_type))
         # Sorting
         sort = request.GET.get("sort", "-datetime")
-        reverse = sort.startswith("-")
-        sort_key = sort.lstrip("-")
-        logs = sorted(logs, key=lambda x: x.get(sort_key), reverse=reverse)
+        if sort not in ("datetime", "-datetime"):
+            sort = "-datetime"
+        logs = logs.order_by(sort)
         # Pagination
-        page = int(request.GET.get("page", 1))
-        per_page = int(request.GET.get("per_page", 20))
-        total = len(logs)
-        start = (page - 1) * per_page
-        end = start + per_page
-        logs_page = logs[start:end]
+        per_page = max(1, min(int(request.GET.get("per_page", 20)), 100))
+        paginator = Paginator(logs, per_page)
+        logs_page = paginator.get_page(request.GET.get("page"))
+        target = downsample.target_points(request.GET.get("points"))
         # Trend analytics
         trend_start = request.GET.get("trend_start")
         trend_end = request.GET.get("trend_end")
         trend_data = None
         if trend_start and trend_end:
-            trend_logs = [
-                log
-                for log in monitor.get("logs", [])
-                if log.get("datetime")
-                and trend_start <= log["datetime"][:10] <= trend_end
-            ]
-            # Uptime %: count Up vs. Down events
-            up_count = sum(1 for log in trend_logs if log.get("type") == 2)
-            down_count = sum(1 for log in trend_logs if log.get("type") == 1)
-            total_checks = len(trend_logs)
-            uptime_percent = (up_count / total_checks * 100) if total_checks else 0
-            # Longest downtime (consecutive Down events)
-            longest = 0
-            current = 0
-            for log in trend_logs:
-                if log.get("type") == 1:
-                    current += 1
-                    if current > longest:
-                        longest = current
-                else:
-                    current = 0
-            # Response time stats
-            response_times = [
-                rt.get("value")
-                for log in trend_logs
-                for rt in log.get("response_times", [])
-                if rt.get("value") is not None
-            ]
-            min_response = min(response_times) if response_times else None
-            max_response = max(response_times) if response_times else None
-            avg_response = (
-                sum(response_times) / len(response_times) if response_times else None
-            )
-            # Prepare time series for chart
-            points = [
-                {"date": log["datetime"][:16], "status": log.get("type")}
-                for log in trend_logs
-            ]
-            trend_data = {
-                "uptime_percent": uptime_percent,
-                "downtime_events": down_count,
-                "longest_downtime": longest,
-                "total_checks": total_checks,
-                "points": points,
-                "logs": trend_logs,
-                "min_response": min_response,
-                "max_response": max_response,
-                "avg_response": avg_response,
-            }
+            trend_data = _uptime_period_stats(link, trend_start, trend_end)
         compare_start1 = request.GET.get("compare_start1")
         compare_end1 = request.GET.get("compare_end1")
         compare_start2 = request.GET.get("compare_start2")
         compare_end2 = request.GET.get("compare_end2")
         compare_data = None
         if compare_start1 and compare_end1 and compare_start2 and compare_end2:
-
-            def get_period_stats(start, end):
-                period_logs = [
-                    log
-                    for log in monitor.get("logs", [])
-                    if log.get("datetime") and start <= log["datetime"][:10] <= end
-                ]
-                up_count = sum(1 for log in period_logs if log.get("type") == 2)
-                down_count = sum(1 for log in period_logs if log.get("type") == 1)
-                total_checks = len(period_logs)
-                uptime_percent = (up_count / total_checks * 100) if total_checks else 0
-                longest = 0
-                current = 0
-                for log in period_logs:
-                    if log.get("type") == 1:
-                        current += 1
-                        if current > longest:
-                            longest = current
-                    else:
-                        current = 0
-                points = [
-                    {"date": log["datetime"][:16], "status": log.get("type")}
-                    for log in period_logs
-                ]
-                response_times = [
-                    rt.get("value")
-                    for log in period_logs
-                    for rt in log.get("response_times", [])
-                    if rt.get("value") is not None
-                ]
-                min_response = min(response_times) if response_times else None
-                max_response = max(response_times) if response_times else None
-                avg_response = (
-                    sum(response_times) / len(response_times)
-                    if response_times
-                    else None
-                )
-                return {
-                    "uptime_percent": uptime_percent,
-                    "downtime_events": down_count,
-                    "longest_downtime": longest,
-                    "total_checks": total_checks,
-                    "points": points,
-                    "logs": period_logs,
-                    "min_response": min_response,
-                    "max_response": max_response,
-                    "avg_response": avg_response,
-                }
-
             compare_data = {
-                "period1": get_period_stats(compare_start1, compare_end1),
-                "period2": get_period_stats(compare_start2, compare_end2),
+                "period1": _uptime_period_stats(link, compare_start1, compare_end1),
+                "period2": _uptime_period_stats(link, compare_start2, compare_end2),
             }
         context = {
             "link": link,
             "logs": logs_page,
-            "total": total,
-            "page": page,
+            "total": paginator.count,
+            "page": logs_page.number,
+            "page_range": paginator.page_range,
             "per_page": per_page,
             "log_type": log_type,
             "sort": sort,
-            "error": None,
+            "error": error,
             "trend_data": trend_data,
             "trend_start": trend_start,
             "trend_end": trend_end,
@@ -766,39 +717,49 @@ def uptime_history(request, link_id):
             "compare_end1": compare_end1,
             "compare_start2": compare_start2,
             "compare_end2": compare_end2,
+            "points": target,
         }
-    except Exception as e:
+    except ValueError as e:
         context = {"link": link, "logs": [], "error": str(e)}
     return render(request, "links/uptime_history.html", context)
 
 
+def _uptime_log_rows(link):
+    return (
+        link.uptime_logs.order_by("-datetime")
+        .values_list("datetime", "type", "duration", "reason_code", "reason_detail")
+        .iterator()
+    )
+
+
 @login_required
 def export_uptime_logs_csv(request, link_id):
     link = get_object_or_404(Link, id=link_id, user=request.user)
-    monitor = UptimeRobotService.get_monitor_status(link, request.user)
-    logs = monitor.get("logs", [])
+    _sync_uptime(link, request.user)
     response = HttpResponse(content_type="text/csv")
     response["Content-Disposition"] = (
         f'attachment; filename="uptime_logs_{link_id}.csv"'
     )
     writer = csv.writer(response)
     writer.writerow(["datetime", "type", "reason"])
-    for log in logs:
-        writer.writerow(
-            [
-                log.get("datetime"),
-                log.get("type"),
-                log.get("reason", {}).get("detail", ""),
-            ]
-        )
+    for moment, log_type, duration, code, detail in _uptime_log_rows(link):
+        writer.writerow([int(moment.timestamp()), log_type, detail])
     return response
 
 
 @login_required
 def export_uptime_logs_json(request, link_id):
     link = get_object_or_404(Link, id=link_id, user=request.user)
-    monitor = UptimeRobotService.get_monitor_status(link, request.user)
-    logs = monitor.get("logs", [])
+    _sync_uptime(link, request.user)
+    logs = [
+        {
+            "datetime": int(moment.timestamp()),
+            "type": log_type,
+            "duration": duration,
+            "reason": {"code": code, "detail": detail},
+        }
+        for moment, log_type, duration, code, detail in _uptime_log_rows(link)
+    ]
     return JsonResponse(logs, safe=False)
 
 
@@ -810,14 +771,18 @@ def settings_view(request):
             "name": "Google PageSpeed Insights",
             "help_url": "https://developers.google.com/speed/docs/insights/v5/get-started",
             "instructions": "Create a project in Google Cloud, enable the PageSpeed Insights API, and generate an API key.",
-            "limitations": "Free tier: 25,000 requests/day. Quotas may change.",
+            "limitations": "Free tier: {per_day:,} requests/day, {per_second:g} requests/second. Quotas may change.".format(
+                **settings.API_QUOTAS["psi"]
+            ),
         },
         {
             "key": "uptimerobot",
             "name": "UptimeRobot",
             "help_url": "https://uptimerobot.com/dashboard#mySettings",
             "instructions": "Log in to UptimeRobot, go to My Settings, and copy your Main API Key.",
-            "limitations": "Free tier: 50 monitors, 5-minute checks. Quotas may change.",
+            "limitations": "Free tier: 50 monitors, 5-minute checks, {per_minute:g} API requests/minute. Quotas may change.".format(
+                **settings.API_QUOTAS["uptimerobot"]
+            ),
         },
     ]
     user = request.user
@@ -862,7 +827,13 @@ def settings_view(request):
             status = "set"
             current_key_value = key_obj.key
         display_services.append(
-            {**service, "status": status, "current_key_value": current_key_value}
+            {
+                **service,
+                "status": status,
+                "current_key_value": current_key_value,
+                "usage": key_obj.usage if key_obj else None,
+                "last_checked": key_obj.last_checked if key_obj else None,
+            }
         )
     return render(
         request,
@@ -903,7 +874,8 @@ def ssl_labs_feature_run(request, link_id):
 @login_required
 def ssl_history(request, link_id):
     link = get_object_or_404(Link, id=link_id, user=request.user)
-    checks = link.ssl_checks.order_by("-checked_at")
+    checks = link.ssl_checks.select_related("certificate").order_by("-checked_at")
+    target = downsample.target_points(request.GET.get("points"))
     # Trend analytics
     trend_start = request.GET.get("trend_start")
     trend_end = request.GET.get("trend_end")
@@ -915,18 +887,13 @@ def ssl_history(request, link_id):
             checked_at__gte=trend_start_dt, checked_at__lt=trend_end_dt
         )
         trend_data = {
-            "min_expiry": trend_checks.aggregate(Min("not_after"))["not_after__min"],
-            "max_expiry": trend_checks.aggregate(Max("not_after"))["not_after__max"],
-            "count": trend_checks.count(),
-            "points": [
-                {
-                    "date": c.checked_at.strftime("%Y-%m-%d %H:%M"),
-                    "expiry": c.not_after,
-                    "warnings": c.warnings,
-                    "errors": c.errors,
-                }
-                for c in trend_checks.order_by("checked_at")
+            "min_expiry": trend_checks.aggregate(expiry=Min("certificate__not_after"))[
+                "expiry"
             ],
+            "max_expiry": trend_checks.aggregate(expiry=Max("certificate__not_after"))[
+                "expiry"
+            ],
+            "count": trend_checks.count(),
         }
     # Compare analytics
     compare_start1 = request.GET.get("compare_start1")
@@ -943,22 +910,13 @@ def ssl_history(request, link_id):
                 checked_at__gte=start_dt, checked_at__lt=end_dt
             )
             return {
-                "min_expiry": period_checks.aggregate(Min("not_after"))[
-                    "not_after__min"
-                ],
-                "max_expiry": period_checks.aggregate(Max("not_after"))[
-                    "not_after__max"
-                ],
+                "min_expiry": period_checks.aggregate(
+                    expiry=Min("certificate__not_after")
+                )["expiry"],
+                "max_expiry": period_checks.aggregate(
+                    expiry=Max("certificate__not_after")
+                )["expiry"],
                 "count": period_checks.count(),
-                "points": [
-                    {
-                        "date": c.checked_at.strftime("%Y-%m-%d %H:%M"),
-                        "expiry": c.not_after,
-                        "warnings": c.warnings,
-                        "errors": c.errors,
-                    }
-                    for c in period_checks.order_by("checked_at")
-                ],
             }
 
         compare_data = {
@@ -979,14 +937,63 @@ def ssl_history(request, link_id):
             "compare_end1": compare_end1,
             "compare_start2": compare_start2,
             "compare_end2": compare_end2,
+            "points": target,
         },
     )
 
 
+def _expiry_report(request):
+    """
+    Parse ``days`` (default CERT_EXPIRY_DAYS; empty for every known expiry),
+    ``page`` and ``per_page`` and return the page of the user's upcoming
+    certificate expiries. Raises ValueError for malformed parameters.
+    """
+    days = request.GET.get("days", str(settings.CERT_EXPIRY_DAYS))
+    days = int(days) if days else None
+    number = max(1, int(request.GET.get("page", 1)))
+    per_page = max(1, min(int(request.GET.get("per_page", 50)), 500))
+    snapshots = CertificateExpiryService.expiring(request.user, days)
+    rows, has_next = CertificateExpiryService.page(snapshots, number, per_page)
+    now = timezone.now()
+    return {
+        "days": days,
+        "page": number,
+        "per_page": per_page,
+        "has_next": has_next,
+        "results": [CertificateExpiryService.as_dict(row, now) for row in rows],
+    }
+
+
+@login_required
+def certificate_expiry(request):
+    try:
+        report = _expiry_report(request)
+    except ValueError:
+        messages.error(request, "days, page and per_page must be whole numbers.")
+        return redirect("certificate_expiry")
+    return render(request, "links/certificate_expiry.html", report)
+
+
+@login_required
+def certificate_expiry_json(request):
+    try:
+        report = _expiry_report(request)
+    except ValueError:
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": "days, page and per_page must be whole numbers.",
+            },
+            status=400,
+        )
+    return JsonResponse(report)
+
+
 @login_required
 def ssl_labs_history(request, link_id):
     link = get_object_or_404(Link, id=link_id, user=request.user)
     scans = link.ssllabs_scans.order_by("-scanned_at")
+    target = downsample.target_points(request.GET.get("points"))
     # Trend analytics
     trend_start = request.GET.get("trend_start")
     trend_end = request.GET.get("trend_end")
@@ -1001,15 +1008,6 @@ def ssl_labs_history(request, link_id):
             "min_grade": min([s.grade for s in trend_scans if s.grade], default=None),
             "max_grade": max([s.grade for s in trend_scans if s.grade], default=None),
             "count": trend_scans.count(),
-            "points": [
-                {
-                    "date": s.scanned_at.strftime("%Y-%m-%d %H:%M"),
-                    "grade": s.grade,
-                    "status": s.status,
-                    "vulnerabilities": s.vulnerabilities,
-                }
-                for s in trend_scans.order_by("scanned_at")
-            ],
         }
     # Compare analytics
     compare_start1 = request.GET.get("compare_start1")
@@ -1031,15 +1029,6 @@ def ssl_labs_history(request, link_id):
                     [s.grade for s in period_scans if s.grade], default=None
                 ),
                 "count": period_scans.count(),
-                "points": [
-                    {
-                        "date": s.scanned_at.strftime("%Y-%m-%d %H:%M"),
-                        "grade": s.grade,
-                        "status": s.status,
-                        "vulnerabilities": s.vulnerabilities,
-                    }
-                    for s in period_scans.order_by("scanned_at")
-                ],
             }
 
         compare_data = {
@@ -1060,6 +1049,132 @@ def ssl_labs_history(request, link_id):
             "compare_end1": compare_end1,
             "compare_start2": compare_start2,
             "compare_end2": compare_end2,
+            "points": target,
+        },
+    )
+
+
+def _series_response(request, tag, last_modified, build):
+    """
+    Serve chart data as JSON with ETag and Last-Modified validators. ``tag``
+    identifies the data version; ``build`` is only called when the client's
+    cached copy is stale.
+    """
+    etag = quote_etag(
+        hashlib.sha1(
+            f"{request.path}?{request.GET.urlencode()}#{tag}".encode()
+        ).hexdigest()
+    )
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = JsonResponse(build())
+    response["ETag"] = etag
+    if timestamp:
+        response["Last-Modified"] = http_date(timestamp)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _series_window(request):
+    start = series.parse_date(request.GET.get("start"))
+    end = series.parse_date(request.GET.get("end"))
+    return start, end
+
+
+@login_required
+def psi_series(request, link_id):
+    link = get_object_or_404(Link, id=link_id, user=request.user)
+    try:
+        start, end = _series_window(request)
+    except ValueError:
+        return JsonResponse(
+            {"status": "error", "message": "Dates must be YYYY-MM-DD."}, status=400
+        )
+    granularity = request.GET.get("granularity") or "day"
+    if granularity not in PSIRollupService.GRANULARITIES:
+        return JsonResponse(
+            {"status": "error", "message": f"Unknown granularity: {granularity}"},
+            status=400,
+        )
+    page = Page.objects.filter(url=link.url, user=request.user).first()
+    target = downsample.target_points(request.GET.get("points"))
+    tag, last_modified = series.psi_version(page, start, end)
+    return _series_response(
+        request,
+        tag,
+        last_modified,
+        lambda: {
+            "link_id": link.id,
+            "granularity": granularity,
+            "series": series.psi_series(page, start, end, granularity, target),
+        },
+    )
+
+
+@login_required
+def uptime_series(request, link_id):
+    link = get_object_or_404(Link, id=link_id, user=request.user)
+    try:
+        start, end = _series_window(request)
+    except ValueError:
+        return JsonResponse(
+            {"status": "error", "message": "Dates must be YYYY-MM-DD."}, status=400
+        )
+    _sync_uptime(link, request.user)
+    target = downsample.target_points(request.GET.get("points"))
+    tag, last_modified = series.uptime_version(link, start, end)
+    return _series_response(
+        request,
+        tag,
+        last_modified,
+        lambda: {
+            "link_id": link.id,
+            "series": series.uptime_series(link, start, end, target),
+        },
+    )
+
+
+@login_required
+def ssl_series(request, link_id):
+    link = get_object_or_404(Link, id=link_id, user=request.user)
+    try:
+        start, end = _series_window(request)
+    except ValueError:
+        return JsonResponse(
+            {"status": "error", "message": "Dates must be YYYY-MM-DD."}, status=400
+        )
+    target = downsample.target_points(request.GET.get("points"))
+    tag, last_modified = series.ssl_version(link, start, end)
+    return _series_response(
+        request,
+        tag,
+        last_modified,
+        lambda: {
+            "link_id": link.id,
+            "series": series.ssl_series(link, start, end, target),
+        },
+    )
+
+
+@login_required
+def ssl_labs_series(request, link_id):
+    link = get_object_or_404(Link, id=link_id, user=request.user)
+    try:
+        start, end = _series_window(request)
+    except ValueError:
+        return JsonResponse(
+            {"status": "error", "message": "Dates must be YYYY-MM-DD."}, status=400
+        )
+    target = downsample.target_points(request.GET.get("points"))
+    tag, last_modified = series.ssl_labs_version(link, start, end)
+    return _series_response(
+        request,
+        tag,
+        last_modified,
+        lambda: {
+            "link_id": link.id,
+            "series": series.ssl_labs_series(link, start, end, target),
         },
     )
 
@@ -1075,7 +1190,9 @@ def ssl_feature_run(request, link_id):
         except Exception as e:
             error = str(e)
     # Always show the latest SSLCheck result
-    latest_check = link.ssl_checks.order_by("-checked_at").first()
+    latest_check = (
+        link.ssl_checks.select_related("certificate").order_by("-checked_at").first()
+    )
     return render(
         request,
         "links/ssl_feature_run.html",
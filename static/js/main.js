@@ -64,6 +64,25 @@ function showToast(message, type = 'success') {
     });
 }
 
+// Load columnar chart data ({t: [...], <metric>: [...]}) from a series endpoint.
+// 'no-cache' makes the browser revalidate its copy with If-None-Match, so an
+// unchanged series costs a 304 instead of a full response.
+function loadSeries(url, params = {}) {
+    const query = new URLSearchParams(params).toString();
+    return fetch(query ? `${url}?${query}` : url, { credentials: 'same-origin', cache: 'no-cache' })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`Chart data request failed (${response.status})`);
+            }
+            return response.json();
+        });
+}
+
+// Format an ISO timestamp from a series as a short chart label
+function seriesLabel(t) {
+    return t.length > 10 ? t.slice(0, 16).replace('T', ' ') : t;
+}
+
 // Handle AJAX errors
 function handleAjaxError(error) {
     console.error('AJAX Error:', error);
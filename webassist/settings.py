@@ -112,6 +112,76 @@ if not DEBUG:
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Upstream API settings
+# Shared HTTP client (links/http_client.py): keep-alive pools, timeouts, retries.
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+# Per-call timeout (seconds) for PageSpeed Insights; Lighthouse runs take 10-30 s.
+PSI_REQUEST_TIMEOUT = int(os.getenv("PSI_REQUEST_TIMEOUT", "90"))
+# Reuse a complete PSI report group fetched within this many seconds (0 disables).
+PSI_FRESHNESS_WINDOW = int(os.getenv("PSI_FRESHNESS_WINDOW", "600"))
+
+# Uptime history pages sync new UptimeRobot logs at most this often (seconds).
+UPTIME_SYNC_INTERVAL = int(os.getenv("UPTIME_SYNC_INTERVAL", "300"))
+
+# Certificate expiry reports cover this many days ahead unless asked otherwise.
+CERT_EXPIRY_DAYS = int(os.getenv("CERT_EXPIRY_DAYS", "14"))
+
+# Per-key token buckets (links/quota.py), kept in the API_QUOTA_CACHE alias.
+# Rates are "per_second" or "per_minute"; "burst" overrides how many calls may
+# go out back to back (one second's or one minute's worth by default).
+API_QUOTAS = {
+    "psi": {
+        "per_second": float(os.getenv("PSI_QUOTA_PER_SECOND", "4")),
+        "per_day": int(os.getenv("PSI_QUOTA_PER_DAY", "25000")),
+    },
+    "uptimerobot": {
+        "per_minute": float(os.getenv("UPTIMEROBOT_QUOTA_PER_MINUTE", "10")),
+    },
+}
+API_QUOTA_CACHE = os.getenv("API_QUOTA_CACHE", "quota")
+API_QUOTA_MAX_WAIT = float(os.getenv("API_QUOTA_MAX_WAIT", "60"))
+API_QUOTA_BASE_BACKOFF = 2.0
+API_QUOTA_MAX_BACKOFF = 300.0
+API_USAGE_FLUSH_EVERY = 20
+API_USAGE_FLUSH_SECONDS = 30
+
+# Cache backends. "quota" holds the API quota buckets and must be shared by
+# every worker process, so it uses the database (run
+# ``manage.py createcachetable`` once). "dashboard" holds each user's dashboard
+# rows (links/dashboard_cache.py). The file-based backend is shared by every
+# worker process on a host, so an invalidation made by one worker is seen by
+# all of them.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "webassist",
+    },
+    "quota": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "webassist_quota_cache",
+    },
+    "dashboard": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv(
+            "DASHBOARD_CACHE_DIR", str(BASE_DIR / "cache" / "dashboard")
+        ),
+    },
+}
+DASHBOARD_CACHE = os.getenv("DASHBOARD_CACHE", "dashboard")
+# Cached dashboards also expire after this many seconds, which refreshes the
+# live uptime status shown on them.
+DASHBOARD_CACHE_SECONDS = int(os.getenv("DASHBOARD_CACHE_SECONDS", "300"))
+
+# Chart series are downsampled (links/downsample.py) to a ``points`` query
+# parameter, defaulting to CHART_DEFAULT_POINTS and never above CHART_MAX_POINTS.
+CHART_DEFAULT_POINTS = int(os.getenv("CHART_DEFAULT_POINTS", "500"))
+CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", "2000"))
+
 # Logging configuration
 LOGGING = {
     "version": 1,